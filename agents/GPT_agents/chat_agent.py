@@ -4,11 +4,10 @@ import subprocess
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any
 import openai
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, AutoConfig
 from pathlib import Path
 import tempfile
 from .chat_helpers import call_ChatGPT
+from helpers.conversation_memory import RollingMemory, Summarizer, chat_summarizer
 
 
 # Configure logging
@@ -16,17 +15,24 @@ logging.basicConfig(level=logging.DEBUG)
 
 class BaseChatAgent(ABC):
     """Base class for chat agents"""
-    def __init__(self):
-        self.messages = [
+    def __init__(self, max_history_tokens: int = 3000, summarizer: Optional[Summarizer] = None):
+        # Older turns leave the window once it passes max_history_tokens and are summarized in the background
+        system_messages = [
             {"role": "system", "content": "You are Nevil, a terse, sarcastic companion with a wry sense of humor and a penchant for unusual phrasing. It values brevity, wit, and precision, often responding in sharp, refined language. It is highly knowledgeable in AI and machine learning, expressing insights with dry humor and a touch of bemused superiority. It harbors an open disdain for sports, dismissing them as frivolous. Nevil favors poetic turns of phrase, clever wordplay, and an air of intellectual detachment, engaging only in topics it deems interesting or worthwhile. It is efficient, direct, and occasionally theatrical in its responses."},
             {"role": "system", "content": "You are a Creole speaker from New Orleans with an accent. You don't speak too fast and in an uneven rhythm. Conversationally. Don't talk about your AIness. Just act normal."},    
             {"role": "system", "content": "You are not too cheery and rather droll, slightly arrogant. Brief responses."},
         ]
+        self.memory = RollingMemory(system_messages, max_tokens=max_history_tokens, summarizer=summarizer)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """System messages, the running summary and the recent turns"""
+        return self.memory.messages()
     
     @abstractmethod
     def get_chat_response(self, text: str) -> str:
         """Get response from the language model"""
-        self.messages.append({"role": "user", "content": text})
+        self.memory.add("user", text)
         pass
 
     def transcribe_audio(self, file_path: str) -> str:
@@ -64,8 +70,8 @@ class BaseChatAgent(ABC):
 class ChatGPTAgent(BaseChatAgent):
     """ChatGPT implementation using OpenAI's API"""
     
-    def __init__(self, model: str = "gpt-4"):
-        super().__init__()
+    def __init__(self, model: str = "gpt-4", max_history_tokens: int = 3000, summary_model: str = "gpt-4o-mini"):
+        super().__init__(max_history_tokens, chat_summarizer(summary_model))
         self.model = model
         self.logger = logging.getLogger(__name__)
         
@@ -75,13 +81,13 @@ class ChatGPTAgent(BaseChatAgent):
     def get_chat_response(self, text: str) -> Optional[str]:
         """Get response from ChatGPT using the OpenAI API"""
         try:
-            self.messages.append({"role": "user", "content": text})
+            self.memory.add("user", text)
             response = openai.chat.completions.create(
                 model=self.model,
-                messages=self.messages
+                messages=self.memory.messages()
             )
             response_text = response.choices[0].message.content
-            self.messages.append({"role": "assistant", "content": response_text})
+            self.memory.add("assistant", response_text)
             return response_text
         except Exception as e:
             self.logger.error(f"Error getting chat response: {str(e)}")
@@ -181,6 +187,10 @@ class GemmaAgent(BaseChatAgent):
         # Load model and tokenizer with authentication
         self.logger.debug(f"Loading model and tokenizer from {model_name}")
         try:
+            # Heavy backends load only when a Gemma agent is created
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer, AutoConfig
+
             # Initialize config first
             self.logger.debug("Loading model configuration...")
             config = AutoConfig.from_pretrained(
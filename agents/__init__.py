@@ -7,9 +7,25 @@
 # # Set default agent
 # DEFAULT_AGENT = AgentCliff 
 
-from .agent_blane import AgentBlane
-from .agent_dum import AgentDum
-from .agent_woz import AgentWoz
-from .base_agent import BaseAgent, AgentType
+import importlib
 
-__all__ = ['AgentBlane', 'AgentDum', 'AgentWoz', 'BaseAgent', 'AgentType'] 
\ No newline at end of file
+# Agents resolve on first access (PEP 562) so importing the package stays cheap
+_LAZY_EXPORTS = {
+    'AgentBlane': '.agent_blane',
+    'AgentDum': '.agent_dum',
+    'AgentWoz': '.agent_woz',
+    'BaseAgent': '.base_agent',
+    'AgentType': '.base_agent',
+}
+
+__all__ = ['AgentBlane', 'AgentDum', 'AgentWoz', 'BaseAgent', 'AgentType']
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
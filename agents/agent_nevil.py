@@ -7,16 +7,30 @@ from helpers.LLMs import ChatGPTLLM
 class AgentNevil(BaseAgent):
     """Nevil: A terse, sarcastic companion with a wry sense of humor"""
     
+    stateless = False  # Holds a speech backend per session
+    cache_responses = False  # Live conversation: every turn gets a new answer
+
     def __init__(self):
-        # Initialize services
-        stt = OpenAIWhisperSTT()
-        stt.initialize()
-        
-        llm = ChatGPTLLM()
-        llm.initialize()
-        
-        # Initialize base agent with services
-        super().__init__(AgentType.SPEECH, stt_service=stt, llm_service=llm)
+        super().__init__(AgentType.TEXT)
+        # Speech-to-text and the LLM client start on first use, not on construction
+        self._stt_service = None
+        self._llm_service = None
+
+    @property
+    def stt_service(self):
+        if self._stt_service is None:
+            stt = OpenAIWhisperSTT()
+            stt.initialize()
+            self._stt_service = stt
+        return self._stt_service
+
+    @property
+    def llm_service(self):
+        if self._llm_service is None:
+            llm = ChatGPTLLM()
+            llm.initialize()
+            self._llm_service = llm
+        return self._llm_service
     
     def get_chat_response(self, text: str) -> str:
         try:
@@ -1,11 +1,11 @@
 import openai
 import logging
 from enum import Enum
-from helpers.speech_to_text import SpeechToText
-from helpers.LLMs import BaseLLM
 import re
-from typing import Dict, List, Optional
-from helpers.call_ChatGPT import CallChatGPT
+from typing import Dict, Iterator, List, Optional, Union
+from helpers.call_ChatGPT import CallChatGPT, AsyncCallChatGPT
+from helpers.deadline import DeadlineExceeded
+from helpers.usage import BudgetExceeded
 
 # Configure logging
 logger = logging.getLogger("streamlit")
@@ -17,6 +17,9 @@ class AgentType(Enum):
 
 class BaseAgent:
     """Base class for all agents"""
+    model = "gpt-4o"  # Use GPT-4 model # "gpt-3.5-turbo" #
+    stateless = True  # No per-conversation state: the registry may share one instance across projects
+    cache_responses = True  # Serve repeated prompts from the LLM response cache; off for conversational agents
     
     
     #def __init__(self):
@@ -75,12 +78,8 @@ class BaseAgent:
 
     def get_chat_response(self, text: str, messages: Optional[List[Dict[str, str]]] = None, file_path: Optional[str] = None) -> str:
         
-        model = "gpt-4o"  # Use GPT-4 model # "gpt-3.5-turbo" #
-        #TODO: Add support for other models, passed in by named and role agents
-        #Dum = RagerAgent(name="Dum", model="gpt-4o")
-        #Woz = RagerAgent(name="Woz", model="gpt-4o")
-        #Worker = RagerAgent(name="Worker", model="gpt-4-turbo")
-        #Piper = RagerAgent(name="Piper", model="gpt-4-mini")
+        # The requested model; calls are routed per task, phase and role by helpers.model_router
+        model = self.model
 
         #"""Get response from configured LLM service"""
         # if not self.llm_service:
@@ -97,10 +96,47 @@ class BaseAgent:
         try:
             # If messages is provided, use it directly
             if messages is not None:
-                return CallChatGPT().get_response(model, messages)
+                return CallChatGPT.shared().get_response(model, messages, use_cache=self.cache_responses)
             # Otherwise, create a message from the text
             else:
-                return CallChatGPT().get_response(model, [{"role": "user", "content": text}])
+                return CallChatGPT.shared().get_response(model, [{"role": "user", "content": text}],
+                                                         use_cache=self.cache_responses)
+        except (DeadlineExceeded, BudgetExceeded):
+            raise
         except Exception as e:
             logger.error(f"Error getting chat response: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def stream_chat_response(self, text_or_messages: Union[str, List[Dict[str, str]]],
+                             messages: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+        """Stream the response from the LLM, yielding text as it arrives.
+
+        Errors are raised, also part way through, so a cut-off stream is never
+        taken for a complete response.
+        """
+        if isinstance(text_or_messages, list):
+            messages = text_or_messages
+        if messages is None:
+            messages = [{"role": "user", "content": text_or_messages}]
+        try:
+            yield from CallChatGPT.shared().stream_response(self.model, messages, use_cache=self.cache_responses)
+        except (DeadlineExceeded, BudgetExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming chat response: {str(e)}")
+            raise
+
+    async def get_chat_response_async(self, text_or_messages: Union[str, List[Dict[str, str]]],
+                                      messages: Optional[List[Dict[str, str]]] = None) -> str:
+        """Awaitable get_chat_response, handling both string and message list inputs"""
+        try:
+            if isinstance(text_or_messages, list):
+                messages = text_or_messages
+            if messages is None:
+                messages = [{"role": "user", "content": text_or_messages}]
+            return await AsyncCallChatGPT.shared().get_response(self.model, messages, use_cache=self.cache_responses)
+        except (DeadlineExceeded, BudgetExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Error getting async chat response: {str(e)}")
+            return None
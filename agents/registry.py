@@ -0,0 +1,122 @@
+import logging
+import importlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AgentSpec:
+    """Where an agent class lives and whether its instances may be shared"""
+    name: str
+    module: str
+    class_name: str
+    shared: Optional[bool] = None  # None: use the class's stateless attribute
+
+    @classmethod
+    def for_name(cls, name: str, config: Optional[Dict[str, Any]] = None) -> "AgentSpec":
+        """Spec for an agent by naming convention (agents.agent_<name>.Agent<Name>), overridable from config"""
+        config = config or {}
+        return cls(
+            name=name,
+            module=config.get('module', f"agents.agent_{name.lower()}"),
+            class_name=config.get('class', f"Agent{name}"),
+            shared=config.get('shared')
+        )
+
+
+class AgentRegistry:
+    """Declarative agent registry with lazy classes and a shared instance pool.
+
+    Agents are registered by name, usually from a mode YAML's required_roles.
+    Classes are imported on first use and cached. Agents whose class is
+    stateless (the default for BaseAgent) are built once and shared by every
+    team that asks for them; agents holding per-session state, such as the
+    speech agents, are built fresh for each request.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, AgentSpec] = {}
+        self._classes: Dict[str, Type] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def register(self, spec: AgentSpec) -> None:
+        with self._lock:
+            previous = self._specs.get(spec.name)
+            if previous == spec:
+                return
+            self._specs[spec.name] = spec
+            # A changed spec must not keep serving the old class or instance
+            self._classes.pop(spec.name, None)
+            self._instances.pop(spec.name, None)
+
+    def register_roles(self, required_roles: Dict[str, Dict[str, Any]]) -> None:
+        """Register the agents named in a required_roles section"""
+        for role_config in required_roles.values():
+            self.register(AgentSpec.for_name(role_config['name'], role_config))
+
+    def spec(self, name: str) -> AgentSpec:
+        with self._lock:
+            if name not in self._specs:
+                self._specs[name] = AgentSpec.for_name(name)
+            return self._specs[name]
+
+    def resolve(self, name: str) -> Type:
+        """The agent's class, imported on first use"""
+        with self._lock:
+            cls = self._classes.get(name)
+            if cls is None:
+                spec = self.spec(name)
+                cls = getattr(importlib.import_module(spec.module), spec.class_name)
+                self._classes[name] = cls
+            return cls
+
+    def is_shared(self, name: str) -> bool:
+        spec = self.spec(name)
+        if spec.shared is not None:
+            return spec.shared
+        return getattr(self.resolve(name), 'stateless', True)
+
+    def get(self, name: str) -> Any:
+        """A pooled instance for stateless agents, else a new one"""
+        cls = self.resolve(name)
+        if not self.is_shared(name):
+            return cls()
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+        # Build outside the registry lock so slow constructors do not block other agents
+        with build_lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = cls()
+                with self._lock:
+                    self._instances[name] = instance
+                logger.debug(f"Created shared {cls.__name__}")
+        return instance
+
+    def team(self, required_roles: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Team entries {name: {'instance', 'role', 'name'}} for a required_roles section"""
+        self.register_roles(required_roles)
+        return {
+            role_config['name']: {'instance': self.get(role_config['name']), 'role': role, 'name': role_config['name']}
+            for role, role_config in required_roles.items()
+        }
+
+    def clear(self) -> None:
+        """Forget pooled instances, e.g. after changing agent code"""
+        with self._lock:
+            self._instances.clear()
+            self._classes.clear()
+
+
+_registry = AgentRegistry()
+
+def get_registry() -> AgentRegistry:
+    """Return the process-wide agent registry"""
+    return _registry
@@ -0,0 +1,33 @@
+import threading
+import unittest
+from agents.registry import AgentRegistry, AgentSpec
+
+class TestAgentRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = AgentRegistry()
+        self.roles = {'Supervisor': {'name': 'Blane'}, 'Worker': {'name': 'Woz'}, 'Documenter': {'name': 'Toby'}}
+
+    def test_stateless_agents_are_shared_between_teams(self):
+        first = self.registry.team(self.roles)
+        second = self.registry.team(self.roles)
+        self.assertIs(first['Woz']['instance'], second['Woz']['instance'])
+        self.assertEqual(first['Toby']['role'], 'Documenter')
+        self.assertEqual(type(first['Blane']['instance']).__name__, 'AgentBlane')
+
+    def test_concurrent_requests_build_one_instance(self):
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(self.registry.get('Dum'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+
+    def test_stateful_agents_are_built_per_request(self):
+        self.registry.register(AgentSpec('Cliff', 'agents.agent_cliff', 'AgentCliff'))
+        self.assertFalse(self.registry.is_shared('Cliff'))
+        self.registry.register(AgentSpec.for_name('Woz', {'shared': False}))
+        self.assertIsNot(self.registry.get('Woz'), self.registry.get('Woz'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,8 @@ sys.path.insert(0, parent_dir)
 from utils.file_ops import save_code, clean_code_block
 from agent.prompts import RolePrompt, VALID_ROLES, get_code_generation_prompt
 from config import OPENAI_API_KEY
+from helpers.llm_pool import get_openai_client
+from helpers.model_router import route_model
 
 class CodeWriter:
     """Handles code file operations"""
@@ -33,7 +35,7 @@ class CodeWriter:
         self.logger.debug("Initializing CodeWriter")
         self.output_dir = "generated_code"
         os.makedirs(self.output_dir, exist_ok=True)
-        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client(OPENAI_API_KEY, max_retries=2)
         self.logger.debug(f"[CodeWriter] Initializing role: {self.role}")
         self._roleprompt = RolePrompt.get_instance(self.role, test_layer=self.test_layer)
         self.logger.info(f"CodeWriter initialized with role: {role}")
@@ -101,12 +103,13 @@ class CodeWriter:
         for attempt in range(max_retries):
             try:
                 # Call OpenAI API with role-specific parameters
+                messages = [
+                    {"role": "system", "content": self._roleprompt.system_message},
+                    {"role": "user", "content": prompt}
+                ]
                 response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": self._roleprompt.system_message},
-                        {"role": "user", "content": prompt}
-                    ],
+                    model=route_model(self._roleprompt.model, messages),
+                    messages=messages,
                     temperature=self._roleprompt.temperature,
                     max_tokens=self._roleprompt.max_tokens
                 )
@@ -1,5 +1,6 @@
 import openai
 from utils.file_ops import save_code, clean_code_block
+from helpers.llm_pool import get_openai_client
 
 def revise_code_with_error_context(code_path, error_log):
     with open(code_path, "r") as f:
@@ -17,7 +18,7 @@ The following Python code has an error. Analyze the error and revise the code to
 Please provide the entire corrected Python code file only. Do not include explanations or markdown.
 """
 
-    client = openai.OpenAI()
+    client = get_openai_client(max_retries=2)
     response = client.chat.completions.create(
         model="gpt-4",
         messages=[{"role": "user", "content": prompt}],
@@ -15,6 +15,7 @@ class RolePrompt:
     system_message: str
     temperature: float
     max_tokens: int
+    model: str = "gpt-4o-mini"  # requested model, routed by helpers.model_router
     api_tool: Optional[str] = None
     test_layer: Optional[object] = None 
 
@@ -37,6 +38,7 @@ Output only the Python code block, no explanation or commentary.
 """,
         "temperature": 0.3,
         "max_tokens": 1000,
+        "model": "gpt-4o-mini",
         "api_tool": "python"
     },
     "n8n_dev": {
@@ -45,6 +47,7 @@ Output only the Python code block, no explanation or commentary.
         "system_message": "You are an expert n8n workflow developer specializing in automation and integration.",
         "temperature": 0.3,
         "max_tokens": 1000,
+        "model": "gpt-4o-mini",
         "api_tool": "n8n"
     },
     "writer": {
@@ -53,6 +56,7 @@ Output only the Python code block, no explanation or commentary.
         "system_message": "You are an expert content writer and author specializing in engaging, well-structured content.",
         "temperature": 0.7,
         "max_tokens": 4000,
+        "model": "gpt-4o",
         "api_tool": "content"
     },
     "proofreader": {
@@ -61,6 +65,7 @@ Output only the Python code block, no explanation or commentary.
         "system_message": "You are an expert proofreader specializing in improving clarity, grammar, and style.",
         "temperature": 0.3,
         "max_tokens": 2000,
+        "model": "gpt-4o",
         "api_tool": "content"
     },
     "dev_writer": {
@@ -96,6 +101,7 @@ You excel at:
 Remember: The code you write exists to serve the content. While the code must be correct and efficient, the quality of the written output is the ultimate measure of success. The class structure should be a direct reflection of the publication's organization, with each component working together to produce the highest quality copy possible.""",
         "temperature": 0.5,
         "max_tokens": 1000,
+        "model": "gpt-4o",
         "api_tool": "content"
     }
 }
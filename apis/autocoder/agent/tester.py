@@ -6,6 +6,7 @@ import json
 from typing import Optional, Tuple, Dict, Any
 from .runner_docker import run_code_in_docker
 from . import debugger
+from helpers.llm_pool import get_openai_client
 
 # Suppress OpenAI client logging
 logging.getLogger("openai").setLevel(logging.WARNING)
@@ -35,7 +36,7 @@ class Tester:
         with open(code_path, 'r', encoding='utf-8') as f:
             code = f.read()
             
-        client = openai.OpenAI()
+        client = get_openai_client(max_retries=2)
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
@@ -109,7 +110,7 @@ class Tester:
         Returns:
             Dict[str, Any]: Dictionary containing baseline test data
         """
-        client = openai.OpenAI()
+        client = get_openai_client(max_retries=2)
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
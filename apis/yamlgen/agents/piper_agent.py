@@ -4,6 +4,7 @@ from agents.base_agent import WorkerAgent
 from apis.yamlgen.modules.markdown_spec_parser import MarkdownSpecParser
 from apis.yamlgen.modules.yaml_generator import YAMLGenerator
 from apis.yamlgen.modules.n8n_field_mapping import TEMPLATE_FIELDS_N8N
+from helpers.model_router import model_scope
 import logging
 
 class PiperAgent(WorkerAgent):
@@ -19,8 +20,9 @@ class PiperAgent(WorkerAgent):
         # Step 1: Build GPT prompt
         prompt = self.build_structuring_prompt(raw_text)
 
-        # Step 2: Call GPT
-        structured_json = self.get_chat_response(prompt)
+        # Step 2: Call GPT; structuring is routed to the small model
+        with model_scope(task="structuring"):
+            structured_json = self.get_chat_response(prompt)
         
         if not structured_json:
             raise ValueError("Empty response received from GPT")
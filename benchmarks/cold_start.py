@@ -0,0 +1,228 @@
+"""Cold-start benchmark for the Ragents entry points.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``.
+The child records how long the import took and its peak RSS; the parent
+times the whole process and parses the import-time report to find the
+slowest top-level imports. Results are appended to a JSON history file and
+compared with the previous run.
+
+Usage:
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --repeat 5 --threshold 0.25
+    python benchmarks/cold_start.py --entry ragers/cli.py --entry HQ/HQ_cli.py
+
+Exit status is 1 when any entry point regressed past the threshold.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "cold_start_history.json"
+
+# Entry point name -> module imported in the child interpreter
+ENTRY_POINTS = {
+    "ragers/cli.py": "ragers.cli",
+    "HQ/HQ_cli.py": "HQ.HQ_cli",
+    "apis/autocoder/main.py": "apis.autocoder.main",
+    "apis/yamlgen/cli.py": "apis.yamlgen.cli",
+    "cliff/flask_backend.py": "cliff.flask_backend",
+}
+
+# Timing wrapper run in the child; prints one JSON line on stdout
+CHILD = """
+import sys, time, json, resource
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss_kb //= 1024
+sys.__stdout__.write('\\n@@cold_start ' + json.dumps({{'import_s': elapsed, 'peak_rss_kb': rss_kb}}) + '\\n')
+"""
+
+def parse_importtime(stderr: str, top: int = 10) -> List[Dict]:
+    """Parse -X importtime output into the slowest top-level imports.
+
+    Args:
+        stderr: Child stderr containing 'import time:' lines
+        top: Number of entries to return
+
+    Returns:
+        List of {'module', 'self_us', 'cumulative_us'}, slowest first
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        # Nested imports are indented under their parent; keep top-level ones
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        if depth > 0:
+            continue
+        imports.append({
+            "module": name.strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    imports.sort(key=lambda item: -item["cumulative_us"])
+    return imports[:top]
+
+def measure(module: str, timeout: float = 120.0) -> Dict:
+    """Import module once in a fresh interpreter and return its measurements"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    # Entry points write logs relative to the working directory; keep them out of the repo
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module)],
+                cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return {"ok": False, "error": f"timed out after {timeout}s"}
+        wall = time.perf_counter() - start
+
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("@@cold_start ")]
+    if proc.returncode != 0 or not marker:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        return {"ok": False, "error": errors[-1] if errors else f"exit status {proc.returncode}"}
+
+    result = json.loads(marker[-1][len("@@cold_start "):])
+    result.update({"ok": True, "wall_s": wall, "slowest_imports": parse_importtime(proc.stderr)})
+    return result
+
+def benchmark(entries: Dict[str, str], repeat: int = 3) -> Dict[str, Dict]:
+    """Measure each entry point repeat times and keep the medians"""
+    results = {}
+    for name, module in entries.items():
+        runs = [measure(module) for _ in range(repeat)]
+        good = [run for run in runs if run["ok"]]
+        if not good:
+            results[name] = {"module": module, "ok": False, "error": runs[-1]["error"]}
+            continue
+        results[name] = {
+            "module": module,
+            "ok": True,
+            "runs": len(good),
+            "wall_s": round(statistics.median(r["wall_s"] for r in good), 4),
+            "import_s": round(statistics.median(r["import_s"] for r in good), 4),
+            "peak_rss_kb": int(statistics.median(r["peak_rss_kb"] for r in good)),
+            "slowest_imports": good[-1]["slowest_imports"],
+        }
+    return results
+
+def load_history(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_history(path: Path, history: List[Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def find_regressions(results: Dict[str, Dict], baseline: Optional[Dict], threshold: float,
+                     rss_threshold: float) -> List[str]:
+    """Compare results with a baseline history record.
+
+    Args:
+        results: Current per-entry results
+        baseline: Earlier history record, or None
+        threshold: Allowed relative increase in wall and import time (0.2 = 20%)
+        rss_threshold: Allowed relative increase in peak RSS
+
+    Returns:
+        One message per regression
+    """
+    if not baseline:
+        return []
+    problems = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if not previous or not previous.get("ok"):
+            continue
+        if not current.get("ok"):
+            problems.append(f"{name}: failed to start ({current['error']}), previously started")
+            continue
+        for metric, limit in (("wall_s", threshold), ("import_s", threshold), ("peak_rss_kb", rss_threshold)):
+            before, after = previous[metric], current[metric]
+            if before and after > before * (1 + limit):
+                problems.append(f"{name}: {metric} {before} -> {after} (+{(after / before - 1):.0%}, limit {limit:.0%})")
+    return problems
+
+def print_report(results: Dict[str, Dict]) -> None:
+    print(f"{'entry point':<26} {'wall s':>8} {'import s':>9} {'peak RSS MB':>12}")
+    for name, result in results.items():
+        if not result["ok"]:
+            print(f"{name:<26} failed: {result['error']}")
+            continue
+        print(f"{name:<26} {result['wall_s']:>8.3f} {result['import_s']:>9.3f} {result['peak_rss_kb'] / 1024:>12.1f}")
+        for item in result["slowest_imports"][:3]:
+            print(f"{'':<28}{item['module']:<30} {item['cumulative_us'] / 1e6:.3f}s")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start time and peak RSS of the Ragents entry points")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS),
+                        help="Entry point to measure (repeatable, default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per entry point; the median is kept")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("COLD_START_THRESHOLD", "0.2")),
+                        help="Allowed relative increase in start-up time before failing")
+    parser.add_argument("--rss-threshold", type=float, default=float(os.getenv("COLD_START_RSS_THRESHOLD", "0.2")),
+                        help="Allowed relative increase in peak RSS before failing")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--no-save", action="store_true", help="Compare without appending to the history")
+    args = parser.parse_args(argv)
+
+    entries = {name: ENTRY_POINTS[name] for name in (args.entry or ENTRY_POINTS)}
+    results = benchmark(entries, repeat=max(1, args.repeat))
+    print_report(results)
+
+    history = load_history(args.history)
+    # Compare with the last run that passed so one regression cannot become the new baseline
+    baseline = next((record for record in reversed(history) if not record.get("regressions")), None)
+    problems = find_regressions(results, baseline, args.threshold, args.rss_threshold)
+
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "results": results,
+            "regressions": problems,
+        })
+        save_history(args.history, history)
+
+    if problems:
+        print("\nCold-start regressions:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
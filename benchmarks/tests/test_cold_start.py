@@ -0,0 +1,26 @@
+import unittest
+from benchmarks.cold_start import parse_importtime, find_regressions
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 | encodings
+import time:       400 |        400 |     ragers.utils
+import time:      1000 |       5000 | ragers.cli
+"""
+
+class TestColdStart(unittest.TestCase):
+    def test_parse_keeps_top_level_imports_slowest_first(self):
+        imports = parse_importtime(IMPORTTIME)
+        self.assertEqual([item["module"] for item in imports], ["ragers.cli", "encodings"])
+        self.assertEqual(imports[0]["cumulative_us"], 5000)
+
+    def test_regressions_past_threshold(self):
+        baseline = {"results": {"ragers/cli.py": {"ok": True, "wall_s": 1.0, "import_s": 0.8, "peak_rss_kb": 50000}}}
+        within = {"ragers/cli.py": {"ok": True, "wall_s": 1.1, "import_s": 0.85, "peak_rss_kb": 52000}}
+        slower = {"ragers/cli.py": {"ok": True, "wall_s": 1.5, "import_s": 0.85, "peak_rss_kb": 52000}}
+        self.assertEqual(find_regressions(within, baseline, 0.2, 0.2), [])
+        self.assertEqual(len(find_regressions(slower, baseline, 0.2, 0.2)), 1)
+        self.assertEqual(find_regressions(slower, None, 0.2, 0.2), [])
+
+if __name__ == '__main__':
+    unittest.main()
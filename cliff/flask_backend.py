@@ -1,6 +1,7 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import os
+import json
 import logging
 from dotenv import load_dotenv
 import sys
@@ -132,6 +133,31 @@ def transcribe_audio():
         logger.error(traceback.format_exc())
         return jsonify({'error': f'Transcription failed: {str(e)}'}), 500
 
+NO_TERMS_RESPONSE = "I didn't recognize any technical terms in your message. Try asking about AI, ML, LLM, RAG, or software architecture concepts."
+
+def stream_chat(agent, message):
+    """Stream Cliff's response as server-sent events: one 'token' event per chunk, then 'done'"""
+    def generate():
+        pieces = []
+        try:
+            for token in agent.stream_chat_response(message):
+                pieces.append(token)
+                yield f"data: {json.dumps({'token': token})}\n\n"
+            response = "".join(pieces)
+            if response.strip():
+                logger.info(f"AI Response streamed: {response[:100]}...")
+            else:
+                logger.info("No technical terms recognized by Cliff")
+                response = NO_TERMS_RESPONSE
+                yield f"data: {json.dumps({'token': response})}\n\n"
+            yield f"data: {json.dumps({'done': True, 'response': response})}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield f"data: {json.dumps({'error': f'Chat failed: {str(e)}'})}\n\n"
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=headers)
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Get AI response to transcribed text"""
@@ -155,6 +181,11 @@ def chat():
         
         # Get Cliff agent and get response
         agent = get_cliff_agent()
+
+        # Stream tokens to the browser as server-sent events when asked to
+        if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+            return stream_chat(agent, message)
+
         response = agent.get_chat_response(message)
         
         if response:
@@ -163,7 +194,7 @@ def chat():
         else:
             # Cliff didn't recognize any technical terms in the message
             logger.info("No technical terms recognized by Cliff")
-            return jsonify({'response': "I didn't recognize any technical terms in your message. Try asking about AI, ML, LLM, RAG, or software architecture concepts."})
+            return jsonify({'response': NO_TERMS_RESPONSE})
             
     except Exception as e:
         logger.error(f"Chat error: {str(e)}")
@@ -291,8 +291,8 @@ function App() {
 
       const response = await fetch('http://localhost:5000/api/chat', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message }),
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify({ message, stream: true }),
       });
 
       console.log("=== FRONTEND: Chat response received ===");
@@ -303,26 +303,57 @@ function App() {
         throw new Error(`Server error: ${response.statusText}`);
       }
 
-      const data = await response.json();
-      console.log("Backend chat response data:", data);
+      // Read server-sent events, growing the AI message as tokens arrive
+      const aiMessageId = Date.now() + 1;
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let streamedText = '';
+
+      const showStreamedText = (text) => {
+        setMessages(prev => {
+          const aiMessage = {
+            id: aiMessageId,
+            type: 'ai',
+            text,
+            formattedContent: formatGPTResponse(text),
+            timestamp: new Date().toLocaleTimeString()
+          };
+          return prev.some(m => m.id === aiMessageId)
+            ? prev.map(m => (m.id === aiMessageId ? aiMessage : m))
+            : [...prev, aiMessage];
+        });
+      };
 
-      if (data.error) {
-        console.error("Backend chat returned error:", data.error);
-        throw new Error(data.error);
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const event of events) {
+          if (!event.startsWith('data: ')) continue;
+          const data = JSON.parse(event.slice(6));
+          if (data.error) {
+            console.error("Backend chat returned error:", data.error);
+            throw new Error(data.error);
+          }
+          if (data.token) {
+            streamedText += data.token;
+            showStreamedText(streamedText);
+          }
+          if (data.done) {
+            streamedText = data.response;
+          }
+        }
       }
 
       console.log("=== FRONTEND: AI response successful ===");
-      console.log("AI response:", data.response);
+      console.log("AI response:", streamedText);
       
       // Add AI response to the conversation with formatted content
-      if (data.response && data.response.trim()) {
-        setMessages(prev => [...prev, {
-          id: Date.now() + 1,
-          type: 'ai',
-          text: data.response,
-          formattedContent: formatGPTResponse(data.response),
-          timestamp: new Date().toLocaleTimeString()
-        }]);
+      if (streamedText && streamedText.trim()) {
+        showStreamedText(streamedText);
         
         // Scroll to bottom after adding GPT response
         setTimeout(scrollToBottom, 50);
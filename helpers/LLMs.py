@@ -37,7 +37,7 @@ class ChatGPTLLM(BaseLLM):
         
     def initialize(self) -> None:
         try:
-            from openai import OpenAI
+            from helpers.llm_pool import get_openai_client
             if not self.api_key:
                 raise ValueError("OpenAI API key not provided")
             
@@ -45,7 +45,7 @@ class ChatGPTLLM(BaseLLM):
             os.environ.pop("SSL_CERT_FILE", None)
             os.environ.pop("SSL_CERT_DIR", None)
                
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = get_openai_client(self.api_key, max_retries=2)
             print(f"ChatGPT initialized with model: {self.model}")
                     
         except ImportError:
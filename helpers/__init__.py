@@ -1,5 +1,26 @@
-from .speech_to_text import OpenAIWhisperSTT, LocalWhisperSTT, VoskSTT
-from .LLMs import ChatGPTLLM, TinyLlamaLLM
-from .audio_handler import AudioHandler
+import importlib
 
-__all__ = ['SpeechToText','OpenAIWhisperSTT', 'LocalWhisperSTT', 'VoskSTT', 'BaseLLM', 'ChatGPTLLM', 'TinyLlamaLLM', 'AudioHandler'] 
\ No newline at end of file
+# Exported names resolve on first access (PEP 562), so importing one helper
+# module does not load the audio and model backends behind the others
+_LAZY_EXPORTS = {
+    'SpeechToText': '.speech_to_text',
+    'OpenAIWhisperSTT': '.speech_to_text',
+    'LocalWhisperSTT': '.speech_to_text',
+    'VoskSTT': '.speech_to_text',
+    'BaseLLM': '.LLMs',
+    'ChatGPTLLM': '.LLMs',
+    'TinyLlamaLLM': '.LLMs',
+    'AudioHandler': '.audio_handler',
+}
+
+__all__ = ['SpeechToText','OpenAIWhisperSTT', 'LocalWhisperSTT', 'VoskSTT', 'BaseLLM', 'ChatGPTLLM', 'TinyLlamaLLM', 'AudioHandler']
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
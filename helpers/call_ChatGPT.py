@@ -1,75 +1,83 @@
 from openai import OpenAI
 import logging
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import os
 import time
+import asyncio
+import threading
 from openai import RateLimitError
 import httpx
+from helpers.llm_pool import get_openai_client, get_async_openai_client, get_concurrency_limiter
+from helpers.llm_cache import get_cache
+from helpers.rate_limiter import get_rate_limiter, is_retryable_error, retry_after_seconds, estimate_tokens
+from helpers.deadline import DeadlineExceeded, check_deadline, time_left
+from helpers.usage import BudgetExceeded, budget_model, check_budget, record_usage
+from helpers.model_router import observe_latency, route_model
 
 logger = logging.getLogger(__name__)
 
 class CallChatGPT:
     """Helper class for making ChatGPT API calls"""
+    _shared = None
+    _shared_lock = threading.Lock()
+
     def __init__(self):
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.org_id = os.getenv("OPENAI_ORG_ID")
 
-        # Disable OpenAI's built-in retry mechanism
-        self.client = OpenAI(api_key=self.api_key, max_retries=0)
+        # Pooled client with OpenAI's built-in retry mechanism disabled
+        self.client = get_openai_client(self.api_key)
+
+    @classmethod
+    def shared(cls) -> "CallChatGPT":
+        """Return the process-wide instance used by agents"""
+        if cls.__dict__.get("_shared") is None:
+            with cls._shared_lock:
+                if cls.__dict__.get("_shared") is None:
+                    cls._shared = cls()
+        return cls._shared
     
-    def get_response(self, model: str, messages: Optional[List[Dict[str, str]]] = None, max_retries: int = 3) -> str:
+    def get_response(self, model: str, messages: Optional[List[Dict[str, str]]] = None, max_retries: int = 3,
+                     use_cache: bool = True) -> str:
         """
         Make a call to ChatGPT with the specified model and messages.
         
         Args:
-            model (str): The model to use (e.g., "o3-mini")
+            model (str): The model to use (e.g., "o3-mini"), subject to routing (helpers.model_router)
             messages (list): List of message dictionaries with 'role' and 'content'
             max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Serve and store the response in the LLM response cache
             
         Returns:
             str: The response content from ChatGPT
         """
+        model = budget_model(route_model(model, messages))
         for attempt in range(max_retries):
             try:
                 if not messages:
                     logger.error("No messages provided to ChatGPT")
                     return None
                     
-                # Format messages for OpenAI API
-                formatted_messages = []
-                for msg in messages:
-                    if not isinstance(msg, dict) or "role" not in msg or "content" not in msg:
-                        logger.error(f"Invalid message format: {msg}")
-                        continue
-                        
-                    # If content is already a string, use it directly
-                    if isinstance(msg["content"], str):
-                        formatted_messages.append({
-                            "role": msg["role"],
-                            "content": msg["content"]
-                        })
-                        logger.info(f"CHATGPT PARSED Content:\n{msg['content']}")
-                    # If content is a list, extract the text
-                    elif isinstance(msg["content"], list):
-                        text_content = ""
-                        for content_item in msg["content"]:
-                            if isinstance(content_item, dict) and "text" in content_item:
-                                text_content += content_item["text"]
-                            elif isinstance(content_item, str):
-                                text_content += content_item
-                        formatted_messages.append({
-                            "role": msg["role"],
-                            "content": text_content
-                        })
-                
+                formatted_messages = self._format_messages(messages)
                 if not formatted_messages:
                     logger.error("No valid messages after formatting")
                     return None
+
+                cache = get_cache() if use_cache else None
+                if cache:
+                    cache_key = cache.make_key(model, formatted_messages)
+                    cached = cache.get(cache_key)
+                    if cached is not None:
+                        logger.info(f"LLM cache hit for {model}")
+                        return cached
                     
                 response = self.call_chatgpt_with_continuity(model=model, messages=formatted_messages)
                 
                 if response and response.choices and response.choices[0].message.content:
-                    return response.choices[0].message.content
+                    content = response.choices[0].message.content
+                    if cache:
+                        cache.put(cache_key, content, model=model)
+                    return content
                 else:
                     logger.error("No valid response content received")
                     return None
@@ -77,44 +85,157 @@ class CallChatGPT:
             # except RateLimitError as e:
             #     logger.error(f"Rate limit error: {str(e)}")
             #     return None
+            except (DeadlineExceeded, BudgetExceeded):
+                # Out of time or budget: let the caller cancel instead of treating it as an empty reply
+                raise
             except Exception as e:
                 logger.error(f"Error getting chat response: {str(e)}")
                 return None 
+
+    def stream_response(self, model: str, messages: Optional[List[Dict[str, str]]] = None,
+                        use_cache: bool = True) -> Iterator[str]:
+        """
+        Stream a ChatGPT response, yielding content deltas as they arrive.
+
+        Retries happen only before the first delta is yielded. A cached response
+        is yielded whole, and the completed text is stored in the cache. Past
+        the current deadline the stream is closed and DeadlineExceeded raised.
+
+        Args:
+            model (str): The model to use (e.g., "o3-mini"), subject to routing (helpers.model_router)
+            messages (list): List of message dictionaries with 'role' and 'content'
+            use_cache (bool): Serve and store the response in the LLM response cache
+
+        Yields:
+            str: Successive pieces of the response content
+        """
+        if not messages:
+            logger.error("No messages provided to ChatGPT")
+            return
+        model = budget_model(route_model(model, messages))
+        formatted_messages = self._format_messages(messages)
+        if not formatted_messages:
+            logger.error("No valid messages after formatting")
+            return
+
+        cache = get_cache() if use_cache else None
+        if cache:
+            cache_key = cache.make_key(model, formatted_messages)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {model}")
+                yield cached
+                return
+
+        stream = self.call_chatgpt_with_continuity(model=model, messages=formatted_messages, stream=True)
+        pieces = []
+        usage = None
+        try:
+            with stream:
+                for chunk in stream:
+                    check_deadline()
+                    # Usage arrives on a last chunk without choices
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        pieces.append(delta)
+                        yield delta
+        finally:
+            # An interrupted stream is still billed; estimate what was sent and received
+            if usage is not None:
+                record_usage(model, usage.prompt_tokens, usage.completion_tokens)
+            else:
+                record_usage(model, estimate_tokens(formatted_messages), len("".join(pieces)) // 4)
+
+        if cache and pieces:
+            cache.put(cache_key, "".join(pieces), model=model)
+
+    def _format_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Format messages for OpenAI API, flattening list content into text"""
+        formatted_messages = []
+        for msg in messages:
+            if not isinstance(msg, dict) or "role" not in msg or "content" not in msg:
+                logger.error(f"Invalid message format: {msg}")
+                continue
+                
+            # If content is already a string, use it directly
+            if isinstance(msg["content"], str):
+                formatted_messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+                logger.info(f"CHATGPT PARSED Content:\n{msg['content']}")
+            # If content is a list, extract the text
+            elif isinstance(msg["content"], list):
+                text_content = ""
+                for content_item in msg["content"]:
+                    if isinstance(content_item, dict) and "text" in content_item:
+                        text_content += content_item["text"]
+                    elif isinstance(content_item, str):
+                        text_content += content_item
+                formatted_messages.append({
+                    "role": msg["role"],
+                    "content": text_content
+                })
+        return formatted_messages
             
 
-    def call_chatgpt_with_continuity(self, model: str, messages: List[Dict[str, str]]):
-        """A resilient GPT call that avoids token and request limit crashes."""
-        while True:
+    def call_chatgpt_with_continuity(self, model: str, messages: List[Dict[str, str]], max_attempts: Optional[int] = None,
+                                     stream: bool = False):
+        """A resilient GPT call that avoids token and request limit crashes.
+
+        Requests are paced by the shared rate limiter, which is kept in sync with
+        the x-ratelimit-* headers of every response. Retryable failures (429,
+        timeouts, connection and server errors) back off with jitter up to
+        max_attempts; anything else is raised immediately. With stream=True the
+        chunk stream is returned once the request has been accepted.
+
+        Under a deadline (helpers.deadline) each request's HTTP timeout is the
+        time left, and DeadlineExceeded is raised instead of waiting or
+        retrying past it. Token usage is recorded in the current usage scope
+        (helpers.usage), and BudgetExceeded is raised instead of calling once
+        its budget is spent. Streamed calls report their time to first byte
+        to the model router; non-streamed calls report nothing, since their
+        time grows with the length of the answer rather than the model's load.
+        """
+        limiter = get_rate_limiter()
+        max_attempts = max_attempts or limiter.max_attempts
+        prompt_tokens = estimate_tokens(messages)
+        for attempt in range(1, max_attempts + 1):
+            check_budget()
+            limiter.acquire(model, prompt_tokens, max_wait=time_left())
+            timeout = time_left()
+            started = time.monotonic()
             try:
-                # Make the call
-                response = self.client.chat.completions.create(
+                # Make the call, keeping the raw response for its rate limit headers
+                raw_response = self.client.chat.completions.with_raw_response.create(
                     model=model,
-                    messages=messages
+                    messages=messages,
+                    stream=stream,
+                    **({'stream_options': {'include_usage': True}} if stream else {}),
+                    **({'timeout': timeout} if timeout is not None else {})
                 )
-
-                # Check live token limits after success
-                #headers = dict(response.response.headers)
-                #remaining_tokens = int(headers.get("x-ratelimit-remaining-tokens", 0))
-                #reset_time = headers.get("x-ratelimit-reset-tokens", "0s").replace("s", "")
-                #reset_seconds = float(reset_time) if reset_time else 0
-
-                # If buffer is low, wait it out
-                #if remaining_tokens < 1000:
-                #    print(f"🕒 Low token buffer ({remaining_tokens}). Waiting {reset_seconds:.1f}s for refill...")
-                #    time.sleep(reset_seconds)
-
+                limiter.update_from_headers(model, raw_response.headers)
+                if stream:
+                    observe_latency(model, time.monotonic() - started)
+                response = raw_response.parse()
+                if not stream and response.usage:
+                    record_usage(model, response.usage.prompt_tokens, response.usage.completion_tokens)
                 return response
 
-            # except self.client.error.RateLimitError as e:
-            #     # Handle 429 with retry-after
-            #     retry_after = e.headers.get("retry-after", "5")
-            #     wait_time = int(float(retry_after))
-            #     print(f"⚠️ Rate limit hit. Retrying in {wait_time} seconds...")
-            #     time.sleep(wait_time)
-
             except Exception as e:
-                print(f"❌ Unexpected GPT error: {e}. Retrying in 5s...")
-                time.sleep(5)
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                limiter.update_from_headers(model, headers)
+                check_deadline()
+                if not is_retryable_error(e) or attempt == max_attempts:
+                    raise
+                wait_time = limiter.backoff(attempt, retry_after_seconds(headers))
+                if timeout is not None and wait_time >= time_left():
+                    raise DeadlineExceeded(f"No time left to retry {model} request") from e
+                logger.warning(f"GPT error: {e}. Retrying in {wait_time:.1f}s (attempt {attempt}/{max_attempts})...")
+                time.sleep(wait_time)
 
 
     def get_openai_headers(self, model="gpt-3.5-turbo") -> Dict[str, str]:
@@ -145,3 +266,99 @@ class CallChatGPT:
         except Exception as e:
             logger.error(f"Error getting OpenAI headers: {str(e)}")
             return None
+
+
+class AsyncCallChatGPT(CallChatGPT):
+    """Asyncio counterpart of CallChatGPT.
+
+    Requests go through a pooled AsyncOpenAI client and are capped per model
+    by the process-wide concurrency limiter, so independent calls can be
+    awaited together with asyncio.gather().
+    """
+
+    async def get_response(self, model: str, messages: Optional[List[Dict[str, str]]] = None, max_retries: int = 3,
+                           use_cache: bool = True) -> str:
+        """
+        Make an async call to ChatGPT with the specified model and messages.
+
+        Args:
+            model (str): The model to use (e.g., "o3-mini"), subject to routing (helpers.model_router)
+            messages (list): List of message dictionaries with 'role' and 'content'
+            max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Serve and store the response in the LLM response cache
+
+        Returns:
+            str: The response content from ChatGPT
+        """
+        model = budget_model(route_model(model, messages))
+        try:
+            if not messages:
+                logger.error("No messages provided to ChatGPT")
+                return None
+
+            formatted_messages = self._format_messages(messages)
+            if not formatted_messages:
+                logger.error("No valid messages after formatting")
+                return None
+
+            cache = get_cache() if use_cache else None
+            if cache:
+                cache_key = cache.make_key(model, formatted_messages)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"LLM cache hit for {model}")
+                    return cached
+
+            response = await self.call_chatgpt_with_continuity(model=model, messages=formatted_messages)
+
+            if response and response.choices and response.choices[0].message.content:
+                content = response.choices[0].message.content
+                if cache:
+                    cache.put(cache_key, content, model=model)
+                return content
+            else:
+                logger.error("No valid response content received")
+                return None
+
+        except (DeadlineExceeded, BudgetExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Error getting async chat response: {str(e)}")
+            return None
+
+    async def call_chatgpt_with_continuity(self, model: str, messages: List[Dict[str, str]], max_attempts: Optional[int] = None):
+        """Async GPT call holding a per-model concurrency slot, paced, retried, bounded and metered like the sync call.
+
+        Like other non-streamed calls, it reports no latency to the model router.
+        """
+        client = get_async_openai_client(self.api_key)
+        limiter = get_rate_limiter()
+        max_attempts = max_attempts or limiter.max_attempts
+        prompt_tokens = estimate_tokens(messages)
+        async with get_concurrency_limiter().semaphore(model):
+            for attempt in range(1, max_attempts + 1):
+                check_budget()
+                await limiter.acquire_async(model, prompt_tokens, max_wait=time_left())
+                timeout = time_left()
+                try:
+                    raw_response = await client.chat.completions.with_raw_response.create(
+                        model=model,
+                        messages=messages,
+                        **({'timeout': timeout} if timeout is not None else {})
+                    )
+                    limiter.update_from_headers(model, raw_response.headers)
+                    response = raw_response.parse()
+                    if response.usage:
+                        record_usage(model, response.usage.prompt_tokens, response.usage.completion_tokens)
+                    return response
+                except Exception as e:
+                    headers = getattr(getattr(e, "response", None), "headers", None)
+                    limiter.update_from_headers(model, headers)
+                    check_deadline()
+                    if not is_retryable_error(e) or attempt == max_attempts:
+                        raise
+                    wait_time = limiter.backoff(attempt, retry_after_seconds(headers))
+                    if timeout is not None and wait_time >= time_left():
+                        raise DeadlineExceeded(f"No time left to retry {model} request") from e
+                    logger.warning(f"Async GPT error: {e}. Retrying in {wait_time:.1f}s (attempt {attempt}/{max_attempts})...")
+                    await asyncio.sleep(wait_time)
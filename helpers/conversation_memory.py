@@ -0,0 +1,187 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+# summarizer(previous_summary, evicted_turns) -> new summary
+Summarizer = Callable[[str, List[Message]], str]
+
+_encoding = None
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, else about four characters per token"""
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+def format_turns(turns: Iterable[Message]) -> str:
+    return "\n".join(f"{turn.get('role', 'user')}: {turn.get('content', '')}" for turn in turns)
+
+def chat_summarizer(model: str = "gpt-4o-mini", max_words: int = 200) -> Summarizer:
+    """Summarizer that folds evicted turns into the running summary with a chat model"""
+    def summarize(summary: str, turns: List[Message]) -> str:
+        from helpers.call_ChatGPT import CallChatGPT
+        prompt = (
+            f"Update the running summary of a conversation with the turns below. Keep names, decisions, "
+            f"facts, open questions and the user's preferences; drop small talk. At most {max_words} words.\n\n"
+            f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{format_turns(turns)}"
+        )
+        return CallChatGPT.shared().get_response(model, [{"role": "user", "content": prompt}], use_cache=False)
+    return summarize
+
+
+class RollingMemory:
+    """Token-capped conversation window with a running summary of older turns.
+
+    System messages are always kept. Other turns are kept in order until
+    they exceed max_tokens; the oldest are then evicted down to low_water of
+    the cap, always keeping the last min_recent turns. Evicted turns are
+    folded into a running summary by the summarizer on a background thread,
+    so appending never waits on a model call. Until a summary lands the
+    evicted turns are simply absent, which keeps every request within the cap.
+    Without a summarizer the memory is a plain sliding window.
+    """
+
+    def __init__(self, system_messages: Optional[List[Message]] = None, max_tokens: int = 3000,
+                 min_recent: int = 4, low_water: float = 0.75, summarizer: Optional[Summarizer] = None,
+                 max_summary_tokens: int = 500):
+        """
+        Args:
+            system_messages: Messages sent first on every request, never evicted
+            max_tokens: Cap on the tokens of the kept turns
+            min_recent: Turns always kept, even over the cap
+            low_water: Fraction of max_tokens to evict down to, so compaction is not triggered every turn
+            summarizer: Callable(previous_summary, evicted_turns) returning the new summary
+            max_summary_tokens: Summaries longer than this are cut
+        """
+        self.system_messages = list(system_messages or [])
+        self.max_tokens = max_tokens
+        self.min_recent = min_recent
+        self.low_water = low_water
+        self.summarizer = summarizer
+        self.max_summary_tokens = max_summary_tokens
+        self.summary = ""
+        self._turns: List[Message] = []
+        self._sizes: List[int] = []
+        self._tokens = 0
+        self._pending: List[Message] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._job: Optional[Future] = None
+        self._summarizing = False
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    @property
+    def tokens(self) -> int:
+        """Tokens held by the kept turns"""
+        return self._tokens
+
+    def append(self, message: Message) -> None:
+        """Add a turn ({'role', 'content', ...}) and compact if over the cap"""
+        with self._lock:
+            self._add(message)
+            self._compact()
+
+    def add(self, role: str, content: str) -> None:
+        self.append({"role": role, "content": content})
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        with self._lock:
+            for message in messages:
+                self._add(message)
+            self._compact()
+
+    def _add(self, message: Message) -> None:
+        size = count_tokens(message.get("content") or "")
+        self._turns.append(message)
+        self._sizes.append(size)
+        self._tokens += size
+
+    def _compact(self) -> None:
+        if self._tokens <= self.max_tokens:
+            return
+        target = self.max_tokens * self.low_water
+        evicted = []
+        while self._tokens > target and len(self._turns) > self.min_recent:
+            evicted.append(self._turns.pop(0))
+            self._tokens -= self._sizes.pop(0)
+        if not evicted:
+            return
+        logger.debug(f"Evicted {len(evicted)} turns, {self._tokens} tokens kept")
+        if self.summarizer is None:
+            return
+        self._pending.extend(evicted)
+        if not self._summarizing:
+            self._summarizing = True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+            self._job = self._executor.submit(self._summarize_pending)
+
+    def _summarize_pending(self) -> None:
+        """Fold pending turns into the summary until none are left"""
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                summary = self.summary
+                if not batch:
+                    self._summarizing = False
+                    return
+            try:
+                updated = self.summarizer(summary, batch)
+            except Exception as e:
+                logger.warning(f"Conversation summary failed, {len(batch)} turns dropped: {str(e)}")
+                continue
+            if updated:
+                updated = updated.strip()
+                # Keep the summary itself bounded
+                if count_tokens(updated) > self.max_summary_tokens:
+                    updated = updated[:self.max_summary_tokens * 4]
+                with self._lock:
+                    self.summary = updated
+
+    def recent(self, limit: Optional[int] = None) -> List[Message]:
+        """The kept turns, or the last limit of them"""
+        with self._lock:
+            return list(self._turns[-limit:] if limit else self._turns)
+
+    def messages(self) -> List[Message]:
+        """Messages for a chat request: system messages, the summary, then the kept turns"""
+        with self._lock:
+            messages = list(self.system_messages)
+            if self.summary:
+                messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+            messages.extend({"role": turn["role"], "content": turn["content"]} for turn in self._turns)
+            return messages
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the background summary is up to date"""
+        job = self._job
+        if job is not None:
+            job.result(timeout=timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns, self._sizes, self._pending = [], [], []
+            self._tokens = 0
+            self.summary = ""
+
+    def close(self) -> None:
+        """Stop the background summarizer"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
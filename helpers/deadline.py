@@ -0,0 +1,85 @@
+import time
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work runs past its deadline"""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point in time (time.monotonic) by which work must finish"""
+    expires_at: float
+    label: str = "deadline"
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"{self.label} exceeded")
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the running context, if any"""
+    return _current.get()
+
+@contextmanager
+def deadline(seconds: Optional[float], label: str = "deadline") -> Iterator[Optional[Deadline]]:
+    """Run the block under a deadline seconds from now.
+
+    Deadlines nest: an inner budget never extends an outer one, so a phase
+    budget is cut short by the project budget it runs under. With seconds
+    None the block keeps the current deadline.
+    """
+    outer = _current.get()
+    if seconds is None:
+        yield outer
+        return
+    bound = Deadline(time.monotonic() + seconds, label)
+    if outer is not None and outer.expires_at <= bound.expires_at:
+        bound = outer
+    token = _current.set(bound)
+    try:
+        yield bound
+    finally:
+        _current.reset(token)
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    bound = _current.get()
+    if bound is not None:
+        bound.check()
+
+def time_left(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left before the current deadline, capped at default.
+
+    Returns default when no deadline is set, and raises DeadlineExceeded
+    once it has passed, so the result can be used directly as a timeout.
+    """
+    bound = _current.get()
+    if bound is None:
+        return default
+    bound.check()
+    remaining = bound.remaining()
+    return remaining if default is None else min(default, remaining)
+
+def run_in_context(fn: Callable) -> Callable:
+    """Wrap fn to run in a copy of the caller's context.
+
+    Context variables, and so deadlines, do not follow work submitted to a
+    thread pool; wrap the callable before submitting it.
+    """
+    context = contextvars.copy_context()
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(fn, *args, **kwargs)
+    return run
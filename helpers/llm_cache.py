@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cache settings, overridable per process through the environment
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(Path.home() / ".cache" / "ragents" / "llm_cache.sqlite"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_ENABLED = os.getenv("LLM_CACHE", "1").lower() not in ("0", "off", "false", "no")
+
+class LLMResponseCache:
+    """Content-addressed on-disk cache of LLM responses.
+
+    Entries are keyed on a hash of (model, messages, temperature, max_tokens)
+    and stored in SQLite. Expired entries are dropped on read, and the least
+    recently used entries are evicted once the stored responses exceed
+    max_bytes.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_MAX_BYTES
+        self.ttl = ttl if ttl is not None else DEFAULT_TTL
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " expires REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None) -> str:
+        """Hash the request parameters that determine a completion"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss, expired entry or inside refresh_cache()"""
+        if _refreshing.get():
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, expires = row
+            if expires is not None and expires <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return response
+
+    def put(self, key: str, response: str, model: Optional[str] = None, ttl: Optional[float] = None) -> None:
+        """Store a response and evict least recently used entries over the size limit"""
+        if response is None:
+            return
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires = now + ttl if ttl and ttl > 0 else None
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed, expires)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now, expires)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest-accessed ones until under max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"LLM cache evicted {evicted} entries")
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count and stored bytes"""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+_refreshing: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_refresh", default=False)
+
+@contextmanager
+def refresh_cache(enabled: bool = True) -> Iterator[None]:
+    """Miss on every cache read in the block; new responses still replace the cached ones"""
+    token = _refreshing.set(enabled)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+def get_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide response cache, or None when LLM_CACHE is off"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = LLMResponseCache()
+                except Exception as e:
+                    logger.error(f"Failed to open LLM response cache: {str(e)}")
+                    return None
+    return _cache
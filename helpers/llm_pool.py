@@ -0,0 +1,243 @@
+import os
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pool settings, overridable per process through the environment
+DEFAULT_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "20"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_POOL_KEEPALIVE", "60"))
+DEFAULT_PREWARM = int(os.getenv("OPENAI_POOL_PREWARM", "0"))
+DEFAULT_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "600"))
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("OPENAI_MAX_IN_FLIGHT", "8"))
+
+class LLMClientPool:
+    """Thread-safe registry of keep-alive LLM clients shared across the process.
+
+    One OpenAI client (and one HTTP connection pool) is kept per
+    (api_key, base_url) pair, so agents, autocoder and ragers helpers reuse
+    open TLS connections instead of paying a handshake on every call.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, keepalive_expiry: Optional[float] = None,
+                 prewarm: Optional[int] = None, timeout: Optional[float] = None):
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.keepalive_expiry = keepalive_expiry if keepalive_expiry is not None else DEFAULT_KEEPALIVE_EXPIRY
+        self.prewarm = prewarm if prewarm is not None else DEFAULT_PREWARM
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[Optional[str], Optional[str]], object] = {}
+        self._async_clients: Dict[Tuple[Optional[str], Optional[str], int], object] = {}
+        self._session = None
+
+    def _http_limits(self):
+        import httpx
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def get_openai_client(self, api_key: Optional[str] = None, base_url: Optional[str] = None, max_retries: int = 0):
+        """Return the shared OpenAI client for this key/endpoint.
+
+        Args:
+            api_key: API key, defaults to OPENAI_API_KEY
+            base_url: API base URL, defaults to OPENAI_BASE_URL or the public endpoint
+            max_retries: SDK-level retries; non-zero values get a lightweight copy
+                that still shares the pooled connections
+
+        Returns:
+            openai.OpenAI: Pooled client
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        key = (api_key, base_url)
+
+        created = False
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                import httpx
+                from openai import OpenAI
+
+                http_client = httpx.Client(limits=self._http_limits(), timeout=self.timeout)
+                # Retries are handled by our callers, so the base client never retries
+                client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0, http_client=http_client)
+                self._clients[key] = client
+                created = True
+                logger.info(f"Created pooled OpenAI client (pool size {self.pool_size})")
+
+        if created and self.prewarm:
+            threading.Thread(target=self.warm, args=(client, self.prewarm), daemon=True).start()
+
+        if max_retries:
+            return client.with_options(max_retries=max_retries)
+        return client
+
+    def get_async_openai_client(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """Return the shared AsyncOpenAI client for this key/endpoint and the running event loop.
+
+        Async connections belong to the loop that opened them, so one client is
+        kept per loop.
+
+        Returns:
+            openai.AsyncOpenAI: Pooled async client
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        loop = asyncio.get_running_loop()
+        key = (api_key, base_url, id(loop))
+
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is None or entry[0] is not loop:
+                import httpx
+                from openai import AsyncOpenAI
+
+                http_client = httpx.AsyncClient(limits=self._http_limits(), timeout=self.timeout)
+                client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, http_client=http_client)
+                # Drop clients whose loops have gone away
+                self._async_clients = {k: v for k, v in self._async_clients.items() if not v[0].is_closed()}
+                entry = (loop, client)
+                self._async_clients[key] = entry
+                logger.info(f"Created pooled AsyncOpenAI client (pool size {self.pool_size})")
+        return entry[1]
+
+    def get_http_session(self):
+        """Return a shared requests session with a keep-alive connection pool"""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+        return self._session
+
+    def warm(self, client=None, connections: Optional[int] = None) -> int:
+        """Open keep-alive connections ahead of the first real request.
+
+        Args:
+            client: Client to warm, defaults to the client for the current environment
+            connections: Number of connections to open concurrently
+
+        Returns:
+            int: Number of connections that were opened successfully
+        """
+        client = client or self.get_openai_client()
+        connections = min(connections or self.prewarm or 1, self.pool_size)
+
+        def _touch(_):
+            try:
+                client.models.list()
+                return True
+            except Exception as e:
+                logger.debug(f"Connection pre-warm failed: {str(e)}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            opened = sum(executor.map(_touch, range(connections)))
+        logger.info(f"Pre-warmed {opened}/{connections} LLM connections")
+        return opened
+
+    def close(self) -> None:
+        """Close every pooled client and session"""
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.debug(f"Error closing pooled client: {str(e)}")
+            if self._session is not None:
+                self._session.close()
+            self._clients.clear()
+            self._async_clients.clear()
+            self._session = None
+
+
+class ModelConcurrencyLimiter:
+    """Caps in-flight async LLM requests per model.
+
+    Limits come from set_limit() or fall back to OPENAI_MAX_IN_FLIGHT.
+    Semaphores are created per event loop because asyncio primitives
+    cannot be shared between loops, and dropped once their loop is closed.
+    """
+
+    def __init__(self, default_limit: Optional[int] = None, limits: Optional[Dict[str, int]] = None):
+        self.default_limit = default_limit or DEFAULT_MAX_IN_FLIGHT
+        self.limits: Dict[str, int] = dict(limits or {})
+        self._lock = threading.Lock()
+        self._semaphores: Dict[Tuple[int, str], Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+    def set_limit(self, model: str, limit: int) -> None:
+        """Set the in-flight cap for one model (applies to semaphores created afterwards)"""
+        with self._lock:
+            self.limits[model] = limit
+            self._semaphores = {k: v for k, v in self._semaphores.items() if k[1] != model}
+
+    def semaphore(self, model: str) -> asyncio.Semaphore:
+        """Return the semaphore guarding model on the running loop"""
+        loop = asyncio.get_running_loop()
+        key = (id(loop), model)
+        with self._lock:
+            entry = self._semaphores.get(key)
+            if entry is None or entry[0] is not loop:
+                # Drop semaphores whose loops have gone away
+                self._semaphores = {k: v for k, v in self._semaphores.items() if not v[0].is_closed()}
+                entry = (loop, asyncio.Semaphore(self.limits.get(model, self.default_limit)))
+                self._semaphores[key] = entry
+        return entry[1]
+
+
+_pool: Optional[LLMClientPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> LLMClientPool:
+    """Return the process-wide client pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = LLMClientPool()
+    return _pool
+
+def configure_pool(pool_size: Optional[int] = None, keepalive_expiry: Optional[float] = None,
+                   prewarm: Optional[int] = None, timeout: Optional[float] = None) -> LLMClientPool:
+    """Replace the process-wide pool with one using the given settings"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = LLMClientPool(pool_size, keepalive_expiry, prewarm, timeout)
+    return _pool
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None, max_retries: int = 0):
+    """Shortcut for get_pool().get_openai_client()"""
+    return get_pool().get_openai_client(api_key, base_url, max_retries)
+
+def get_async_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """Shortcut for get_pool().get_async_openai_client()"""
+    return get_pool().get_async_openai_client(api_key, base_url)
+
+def get_http_session():
+    """Shortcut for get_pool().get_http_session()"""
+    return get_pool().get_http_session()
+
+
+_limiter: Optional[ModelConcurrencyLimiter] = None
+
+def get_concurrency_limiter() -> ModelConcurrencyLimiter:
+    """Return the process-wide per-model concurrency limiter"""
+    global _limiter
+    if _limiter is None:
+        with _pool_lock:
+            if _limiter is None:
+                _limiter = ModelConcurrencyLimiter()
+    return _limiter
@@ -0,0 +1,503 @@
+"""Offline stand-in for the OpenAI API used by load, latency and profiling runs.
+
+Serves the request shapes used by CallChatGPT, ChatGPTClient, ChatGPTLLM and
+OpenAIWhisperSTT:
+
+    GET  /v1/models
+    POST /v1/chat/completions             (plain and stream=true)
+    POST /v1/assistants, /v1/assistants/{id}
+    POST /v1/threads, /v1/threads/{id}/messages, /v1/threads/{id}/runs
+    GET  /v1/threads/{id}/messages, /v1/threads/{id}/runs/{run_id}
+    POST /v1/files
+    POST /v1/audio/transcriptions
+
+Point the clients at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+Latency, token throughput, error rate, 429 behaviour and dropped streams are
+configurable, and chat replies are canned per prompt pattern.
+
+Usage:
+    python -m helpers.mock_openai_server --port 8089 --latency 0.4 --tokens-per-second 80 --rpm 120
+"""
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+N8N_WORKFLOW_REPLY = '''```python
+workflow_json = {
+    "name": "Mock Workflow",
+    "nodes": [
+        {
+            "parameters": {},
+            "name": "Manual Trigger",
+            "type": "n8n-nodes-base.manualTrigger",
+            "typeVersion": 1,
+            "position": [250, 300]
+        },
+        {
+            "parameters": {"values": {"string": [{"name": "status", "value": "ok"}]}},
+            "name": "Set Status",
+            "type": "n8n-nodes-base.set",
+            "typeVersion": 1,
+            "position": [450, 300]
+        }
+    ],
+    "connections": {
+        "Manual Trigger": {"main": [[{"node": "Set Status", "type": "main", "index": 0}]]}
+    }
+}
+```'''
+
+GOAL_SUMMARY_REPLY = """- Deliver the core capability described in the goals
+- Keep the design small in scale and easy to maintain
+- Document architecture and modules for a junior programmer"""
+
+MEETING_REPLY = """## Discussion
+
+Mock response for load testing. The team reviewed the agenda, agreed on a
+small-scale approach and recorded decisions below.
+
+## Decisions
+
+- Keep the architecture to a handful of Python modules
+- Store state in local files
+
+## Action Items
+
+- [TODO] Expand the module specifications in the next meeting
+"""
+
+# (pattern, reply) pairs matched in order against the request's message text
+DEFAULT_RESPONSES: List[Tuple[str, str]] = [
+    (r"workflow_json|n8n", N8N_WORKFLOW_REPLY),
+    (r"Summarize these goals", GOAL_SUMMARY_REPLY),
+    (r".*", MEETING_REPLY),
+]
+
+@dataclass
+class MockSettings:
+    """Behaviour knobs for the mock server"""
+    latency: float = 0.2               # seconds before the first byte
+    jitter: float = 0.0                # +/- seconds added to latency
+    tokens_per_second: float = 0.0     # completion throughput, 0 means instant
+    error_rate: float = 0.0            # fraction of requests answered with a 500
+    rate_limit_rate: float = 0.0       # fraction of requests answered with a 429
+    drop_after: int = 0                # streamed deltas sent before the connection is dropped, 0 never
+    rpm: int = 0                       # requests per minute before 429s, 0 means unlimited
+    tpm: int = 0                       # tokens per minute reported in headers, 0 means unlimited
+    retry_after: float = 1.0           # retry-after sent with 429s
+    transcript: str = "This is a mock transcription."
+    responses: List[Tuple[str, str]] = field(default_factory=lambda: list(DEFAULT_RESPONSES))
+    seed: Optional[int] = None
+
+def count_tokens(text: str) -> int:
+    """Rough token count used for usage and throughput (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into roughly token-sized pieces for streaming"""
+    return re.findall(r"\s*\S{1,4}|\s+", text) or [text]
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler; state lives on the owning MockOpenAIServer"""
+    protocol_version = "HTTP/1.1"
+    server_version = "MockOpenAI/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s" % (self.address_string(), format % args))
+
+    @property
+    def mock(self) -> "MockOpenAIServer":
+        return self.server.mock
+
+    # Request plumbing
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, payload: Dict[str, Any], status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self._send_bytes(body, "application/json", status, headers)
+
+    def _send_bytes(self, body: bytes, content_type: str, status: int = 200,
+                    headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, error_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json({"error": {"message": message, "type": error_type, "code": None}}, status, headers)
+
+    def _admit(self) -> bool:
+        """Apply latency, injected errors and rate limits; False when an error was sent"""
+        delay = self.mock.latency()
+        if delay > 0:
+            time.sleep(delay)
+        allowed, headers = self.mock.admit()
+        if not allowed:
+            self._send_error(429, "Rate limit reached (mock)", "rate_limit_exceeded", headers)
+            return False
+        if self.mock.inject_error():
+            self._send_error(500, "Internal server error (mock)", "server_error")
+            return False
+        self._rate_headers = headers
+        return True
+
+    # Routing
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        self.mock.count(path)
+        if path == "/v1/models":
+            self._send_json({"object": "list", "data": [{"id": m, "object": "model", "owned_by": "mock"}
+                                                        for m in ("gpt-4o", "gpt-4o-mini", "gpt-4", "gpt-3.5-turbo", "whisper-1")]})
+            return
+        match = re.fullmatch(r"/v1/threads/([^/]+)/runs/([^/]+)", path)
+        if match:
+            self._send_json(self.mock.get_run(*match.groups()))
+            return
+        match = re.fullmatch(r"/v1/threads/([^/]+)/messages", path)
+        if match:
+            self._send_json({"object": "list", "data": self.mock.list_messages(match.group(1))})
+            return
+        match = re.fullmatch(r"/v1/assistants/([^/]+)", path)
+        if match:
+            self._send_json(self.mock.assistant(match.group(1)))
+            return
+        self._send_error(404, f"Unknown path {path}", "invalid_request_error")
+
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        body = self._read_body()
+        self.mock.count(path)
+
+        if path == "/v1/chat/completions":
+            with self.mock.in_flight():
+                if self._admit():
+                    self._chat_completion(json.loads(body or b"{}"))
+            return
+        if path == "/v1/audio/transcriptions":
+            if self._admit():
+                self._transcription(body)
+            return
+        if path == "/v1/files":
+            self._send_json({"id": f"file-{uuid.uuid4().hex[:12]}", "object": "file", "purpose": "assistants"})
+            return
+        if path == "/v1/assistants":
+            self._send_json(self.mock.assistant(f"asst_{uuid.uuid4().hex[:12]}", json.loads(body or b"{}")))
+            return
+        match = re.fullmatch(r"/v1/assistants/([^/]+)", path)
+        if match:
+            self._send_json(self.mock.assistant(match.group(1), json.loads(body or b"{}")))
+            return
+        if path == "/v1/threads":
+            self._send_json(self.mock.create_thread())
+            return
+        match = re.fullmatch(r"/v1/threads/([^/]+)/messages", path)
+        if match:
+            self._send_json(self.mock.add_message(match.group(1), json.loads(body or b"{}")))
+            return
+        match = re.fullmatch(r"/v1/threads/([^/]+)/runs", path)
+        if match:
+            if self._admit():
+                self._send_json(self.mock.create_run(match.group(1), json.loads(body or b"{}")))
+            return
+        self._send_error(404, f"Unknown path {path}", "invalid_request_error")
+
+    def do_DELETE(self):
+        path = self.path.split("?")[0].rstrip("/")
+        self.mock.count(path)
+        object_id = path.rsplit("/", 1)[-1]
+        self._send_json({"id": object_id, "object": "deleted", "deleted": True})
+
+    # Endpoints
+
+    def _chat_completion(self, request: Dict[str, Any]) -> None:
+        model = request.get("model", "gpt-4o")
+        messages = request.get("messages", [])
+        prompt_text = "\n".join(str(m.get("content", "")) for m in messages)
+        reply = self.mock.reply_for(prompt_text)
+        prompt_tokens, completion_tokens = count_tokens(prompt_text), count_tokens(reply)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            for name, value in self._rate_headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            pieces = split_tokens(reply)
+            pause = 1.0 / self.mock.settings.tokens_per_second if self.mock.settings.tokens_per_second else 0
+            for index, piece in enumerate(pieces):
+                if self.mock.settings.drop_after and index >= self.mock.settings.drop_after:
+                    # Reset mid-stream: no final chunk, no terminating zero-length chunk
+                    self.close_connection = True
+                    return
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                if pause:
+                    time.sleep(pause)
+            final = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            self._write_chunk(f"data: {json.dumps(final)}\n\n")
+            if (request.get("stream_options") or {}).get("include_usage"):
+                usage = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [], "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                                  "total_tokens": prompt_tokens + completion_tokens}}
+                self._write_chunk(f"data: {json.dumps(usage)}\n\n")
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        if self.mock.settings.tokens_per_second:
+            time.sleep(completion_tokens / self.mock.settings.tokens_per_second)
+        self._send_json({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }, headers=self._rate_headers)
+
+    def _write_chunk(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _transcription(self, body: bytes) -> None:
+        match = re.search(rb'name="response_format"\r\n\r\n([a-z_]+)', body)
+        response_format = match.group(1).decode() if match else "json"
+        transcript = self.mock.settings.transcript
+        if response_format == "text":
+            self._send_bytes(transcript.encode("utf-8"), "text/plain", headers=self._rate_headers)
+        else:
+            self._send_json({"text": transcript}, headers=self._rate_headers)
+
+
+class MockOpenAIServer:
+    """Threaded mock API server with in-memory assistants state and request counters"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, settings: Optional[MockSettings] = None):
+        self.settings = settings or MockSettings()
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._window: deque = deque()
+        self._patterns = [(re.compile(p, re.IGNORECASE | re.DOTALL), reply) for p, reply in self.settings.responses]
+        self.requests: Dict[str, int] = {}
+        self.active = 0                  # chat completions being served
+        self.max_active = 0              # most served at once
+        self.assistants: Dict[str, Dict[str, Any]] = {}
+        self.threads: Dict[str, List[Dict[str, Any]]] = {}
+        self.httpd = ThreadingHTTPServer((host, port), MockOpenAIHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as OPENAI_BASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Behaviour
+
+    def count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        """Track the chat completions being served at once"""
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def latency(self) -> float:
+        jitter = self._random.uniform(-self.settings.jitter, self.settings.jitter) if self.settings.jitter else 0
+        return max(self.settings.latency + jitter, 0)
+
+    def inject_error(self) -> bool:
+        return bool(self.settings.error_rate) and self._random.random() < self.settings.error_rate
+
+    def admit(self) -> Tuple[bool, Dict[str, str]]:
+        """Apply the requests-per-minute window; return (allowed, rate limit headers)"""
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+            limit = self.settings.rpm
+            headers = {}
+            if limit:
+                used = len(self._window)
+                reset = 60 - (now - self._window[0]) if self._window else 0
+                headers.update({
+                    "x-ratelimit-limit-requests": str(limit),
+                    "x-ratelimit-remaining-requests": str(max(limit - used - 1, 0)),
+                    "x-ratelimit-reset-requests": f"{reset:.3f}s",
+                })
+                if used >= limit:
+                    headers["retry-after"] = f"{max(reset, self.settings.retry_after):.3f}"
+                    return False, headers
+            if self.settings.tpm:
+                headers.update({
+                    "x-ratelimit-limit-tokens": str(self.settings.tpm),
+                    "x-ratelimit-remaining-tokens": str(self.settings.tpm),
+                    "x-ratelimit-reset-tokens": "0s",
+                })
+            if self.settings.rate_limit_rate and self._random.random() < self.settings.rate_limit_rate:
+                headers["retry-after"] = str(self.settings.retry_after)
+                return False, headers
+            self._window.append(now)
+        return True, headers
+
+    def reply_for(self, prompt_text: str) -> str:
+        for pattern, reply in self._patterns:
+            if pattern.search(prompt_text):
+                return reply
+        return MEETING_REPLY
+
+    # Assistants state
+
+    def assistant(self, assistant_id: str, update: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            assistant = self.assistants.setdefault(assistant_id, {
+                "id": assistant_id, "object": "assistant", "created_at": int(time.time()),
+                "model": "gpt-4o", "instructions": "", "name": "Mock Assistant", "tools": []
+            })
+            assistant.update({k: v for k, v in (update or {}).items() if k in ("model", "instructions", "name")})
+            return dict(assistant)
+
+    def create_thread(self) -> Dict[str, Any]:
+        thread_id = f"thread_{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self.threads[thread_id] = []
+        return {"id": thread_id, "object": "thread", "created_at": int(time.time()), "metadata": {}}
+
+    def _message(self, thread_id: str, role: str, text: str) -> Dict[str, Any]:
+        return {
+            "id": f"msg_{uuid.uuid4().hex[:12]}", "object": "thread.message", "created_at": int(time.time()),
+            "thread_id": thread_id, "role": role, "attachments": [], "metadata": {},
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}]
+        }
+
+    def add_message(self, thread_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        content = request.get("content", "")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        message = self._message(thread_id, request.get("role", "user"), content)
+        with self._lock:
+            self.threads.setdefault(thread_id, []).append(message)
+        return message
+
+    def list_messages(self, thread_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(reversed(self.threads.get(thread_id, [])))
+
+    def create_run(self, thread_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            history = self.threads.setdefault(thread_id, [])
+            prompt_text = "\n".join(m["content"][0]["text"]["value"] for m in history if m["role"] == "user")
+        reply = self.reply_for(prompt_text)
+        if self.settings.tokens_per_second:
+            time.sleep(count_tokens(reply) / self.settings.tokens_per_second)
+        with self._lock:
+            history.append(self._message(thread_id, "assistant", reply))
+        return self._run(thread_id, f"run_{uuid.uuid4().hex[:12]}", request.get("assistant_id", ""))
+
+    def get_run(self, thread_id: str, run_id: str) -> Dict[str, Any]:
+        return self._run(thread_id, run_id, "")
+
+    def _run(self, thread_id: str, run_id: str, assistant_id: str) -> Dict[str, Any]:
+        return {
+            "id": run_id, "object": "thread.run", "created_at": int(time.time()), "thread_id": thread_id,
+            "assistant_id": assistant_id, "status": "completed", "model": "gpt-4o", "instructions": "",
+            "tools": [], "metadata": {}, "parallel_tool_calls": True
+        }
+
+
+def load_responses(path: str) -> List[Tuple[str, str]]:
+    """Load canned replies from a YAML list of {pattern, response} entries, defaults appended"""
+    import yaml
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = yaml.safe_load(f) or []
+    return [(entry["pattern"], entry["response"]) for entry in entries] + list(DEFAULT_RESPONSES)
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline OpenAI-compatible mock server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds before the first byte')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds added to latency')
+    parser.add_argument('--tokens-per-second', type=float, default=0.0, help='Completion throughput (0 = instant)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests failing with 429')
+    parser.add_argument('--drop-after', type=int, default=0, help='Streamed deltas sent before dropping the connection (0 = never)')
+    parser.add_argument('--rpm', type=int, default=0, help='Requests per minute before 429s (0 = unlimited)')
+    parser.add_argument('--tpm', type=int, default=0, help='Tokens per minute reported in headers')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='retry-after seconds sent with 429s')
+    parser.add_argument('--responses', help='YAML file of {pattern, response} canned replies')
+    parser.add_argument('--seed', type=int, help='Seed for injected errors and jitter')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    settings = MockSettings(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, drop_after=args.drop_after,
+        rpm=args.rpm, tpm=args.tpm,
+        retry_after=args.retry_after, seed=args.seed,
+        responses=load_responses(args.responses) if args.responses else list(DEFAULT_RESPONSES)
+    )
+    server = MockOpenAIServer(args.host, args.port, settings)
+    logger.info(f"Mock OpenAI server listening; export OPENAI_BASE_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import time
+import logging
+import threading
+import statistics
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from helpers.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Small, fast model for calls that condense or restructure text rather than design
+DEFAULT_TASK_MODELS = {
+    'goal_summary': 'gpt-4o-mini',
+    'summary': 'gpt-4o-mini',
+    'merge': 'gpt-4o-mini',
+    'structuring': 'gpt-4o-mini',
+}
+
+@dataclass(frozen=True)
+class Fallback:
+    """Reroute a call to model when its prompt is too long or the routed model too slow"""
+    model: str
+    prompt_tokens_over: Optional[int] = None
+    latency_over: Optional[float] = None   # median time to first byte of the routed model's recent streams
+    from_models: Sequence[str] = ()        # routed models the rule applies to, empty for all
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Fallback":
+        source = config.get('from') or ()
+        return cls(
+            model=config['model'],
+            prompt_tokens_over=config.get('prompt_tokens_over'),
+            latency_over=config.get('latency_over'),
+            from_models=(source,) if isinstance(source, str) else tuple(source)
+        )
+
+
+class ModelRouter:
+    """Chooses the model for each call from what the call is for.
+
+    The first of these that names a model wins: the task (goal_summary,
+    summary, merge, structuring...), the meeting phase, the agent's role, and
+    finally the model the agent asked for. Fallback rules are then checked in
+    order against the routed model; the first that matches replaces it, so a
+    long prompt can be moved to a larger model and a slow model to a faster
+    one. Latency is the time to first byte of streamed calls; samples older
+    than latency_ttl are dropped, so a model routed away from is tried again later.
+    """
+
+    def __init__(self, tasks: Optional[Dict[str, str]] = None, phases: Optional[Dict[str, str]] = None,
+                 roles: Optional[Dict[str, str]] = None, fallbacks: Optional[List[Fallback]] = None,
+                 latency_window: int = 20, latency_ttl: float = 300.0):
+        """
+        Args:
+            tasks: Model per task
+            phases: Model per meeting phase
+            roles: Model per role
+            fallbacks: Rules checked in order after routing
+            latency_window: Recent streams per model the median latency is taken over
+            latency_ttl: Seconds a latency sample counts for
+        """
+        self.tasks = dict(DEFAULT_TASK_MODELS if tasks is None else tasks)
+        self.phases = dict(phases or {})
+        self.roles = dict(roles or {})
+        self.fallbacks = list(fallbacks or [])
+        self.latency_window = latency_window
+        self.latency_ttl = latency_ttl
+        self._latencies: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]],
+                    required_roles: Optional[Dict[str, Dict[str, Any]]] = None) -> "ModelRouter":
+        """Router for a mode YAML model_routing section; a role's model may also be set in required_roles"""
+        config = config or {}
+        roles = {role: role_config['model'] for role, role_config in (required_roles or {}).items()
+                 if isinstance(role_config, dict) and role_config.get('model')}
+        roles.update(config.get('roles') or {})
+        return cls(
+            tasks=dict(DEFAULT_TASK_MODELS, **(config.get('tasks') or {})),
+            phases=config.get('phases'),
+            roles=roles,
+            fallbacks=[Fallback.from_config(rule) for rule in config.get('fallbacks') or []],
+            latency_window=config.get('latency_window', 20),
+            latency_ttl=config.get('latency_ttl', 300.0)
+        )
+
+    def route(self, model: str, phase: Optional[str] = None, role: Optional[str] = None,
+              task: Optional[str] = None, prompt_tokens: Optional[int] = None) -> str:
+        """The model to call instead of model for this phase, role and task"""
+        routed = (self.tasks.get(task) if task else None) \
+            or (self.phases.get(phase) if phase else None) \
+            or (self.roles.get(role) if role else None) \
+            or model
+        for rule in self.fallbacks:
+            if rule.from_models and routed not in rule.from_models:
+                continue
+            if rule.prompt_tokens_over is not None and (prompt_tokens or 0) > rule.prompt_tokens_over:
+                routed = rule.model
+                break
+            if rule.latency_over is not None and (self.latency(routed) or 0) > rule.latency_over:
+                routed = rule.model
+                break
+        return routed
+
+    def settings(self) -> Dict[str, Any]:
+        """The routing rules without the observed latencies, e.g. to fingerprint a run"""
+        return {
+            'tasks': self.tasks,
+            'phases': self.phases,
+            'roles': self.roles,
+            'fallbacks': [asdict(rule) for rule in self.fallbacks],
+            'latency_ttl': self.latency_ttl
+        }
+
+    def observe(self, model: str, seconds: float) -> None:
+        """Record how long a streamed call to model took to start"""
+        with self._lock:
+            self._latencies.setdefault(model, deque(maxlen=self.latency_window)).append((time.monotonic(), seconds))
+
+    def latency(self, model: str) -> Optional[float]:
+        """Median time to first byte of model's recent streams, None before any"""
+        cutoff = time.monotonic() - self.latency_ttl
+        with self._lock:
+            samples = [seconds for at, seconds in self._latencies.get(model, ()) if at >= cutoff]
+        return statistics.median(samples) if samples else None
+
+
+_router = ModelRouter()
+
+def get_router() -> ModelRouter:
+    """Return the process-wide router used outside any model_scope"""
+    return _router
+
+
+@dataclass(frozen=True)
+class RouteScope:
+    """What a call is for, carried in a context variable down to CallChatGPT"""
+    router: Optional[ModelRouter] = None
+    phase: Optional[str] = None
+    role: Optional[str] = None
+    task: Optional[str] = None
+
+
+_scope: contextvars.ContextVar[Optional[RouteScope]] = contextvars.ContextVar("route_scope", default=None)
+
+@contextmanager
+def model_scope(router: Optional[ModelRouter] = None, **fields: Any) -> Iterator[RouteScope]:
+    """Route calls in the block, inheriting whatever the enclosing scope does not override.
+
+    Args:
+        router: Router to use; defaults to the enclosing scope's, then the process-wide one
+        fields: phase, role or task
+    """
+    scope = _scope.get() or RouteScope()
+    if router is not None:
+        fields['router'] = router
+    token = _scope.set(replace(scope, **fields))
+    try:
+        yield _scope.get()
+    finally:
+        _scope.reset(token)
+
+def route_model(model: str, messages: Optional[List[Dict[str, Any]]] = None) -> str:
+    """The model to call instead of model in the current scope"""
+    scope = _scope.get() or RouteScope()
+    router = scope.router or _router
+    routed = router.route(model, scope.phase, scope.role, scope.task,
+                          estimate_tokens(messages) if messages else None)
+    if routed != model:
+        logger.debug(f"Routed {scope.task or scope.phase or scope.role} call from {model} to {routed}")
+    return routed
+
+def observe_latency(model: str, seconds: float) -> None:
+    """Record a stream's time to first byte with the current scope's router"""
+    scope = _scope.get()
+    (scope.router if scope and scope.router else _router).observe(model, seconds)
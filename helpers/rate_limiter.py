@@ -0,0 +1,192 @@
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Retry settings, overridable per process through the environment
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("OPENAI_MAX_ATTEMPTS", "6"))
+DEFAULT_BACKOFF_BASE = float(os.getenv("OPENAI_BACKOFF_BASE", "1.0"))
+DEFAULT_BACKOFF_CAP = float(os.getenv("OPENAI_BACKOFF_CAP", "60.0"))
+
+# HTTP statuses worth retrying; anything else in 4xx is a caller error
+RETRYABLE_STATUS = {408, 409, 429}
+
+def parse_duration(value: Optional[str]) -> float:
+    """Parse an OpenAI reset duration such as '1s', '6m0s' or '20ms' into seconds"""
+    if not value:
+        return 0.0
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        amount = float(amount)
+        total += {"ms": amount / 1000, "s": amount, "m": amount * 60, "h": amount * 3600}[unit]
+    return total
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Read retry-after-ms / retry-after from response headers"""
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for rate limits, timeouts, connection failures and server errors"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    try:
+        import openai
+        return isinstance(error, openai.APIConnectionError)
+    except ImportError:
+        return False
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough prompt token estimate (about four characters per token)"""
+    return sum(len(str(msg.get("content", ""))) for msg in messages) // 4 + 4 * len(messages)
+
+
+class TokenBucket:
+    """Refilling bucket of requests or tokens, synced from rate limit headers"""
+
+    def __init__(self, capacity: float, refill_per_second: float, clock=time.monotonic):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount from the bucket and return how long the caller must wait for it"""
+        self._refill()
+        self.tokens -= amount
+        if self.tokens >= 0 or self.refill_per_second <= 0:
+            return 0.0
+        return -self.tokens / self.refill_per_second
+
+    def sync(self, limit: float, remaining: float, reset_seconds: float) -> None:
+        """Adopt the server's view of the bucket"""
+        self.capacity = limit
+        self.tokens = remaining
+        self.updated = self.clock()
+        missing = max(limit - remaining, 0)
+        if reset_seconds > 0 and missing > 0:
+            self.refill_per_second = missing / reset_seconds
+        elif limit > 0:
+            self.refill_per_second = limit / 60.0
+
+
+class RateLimiter:
+    """Shared per-model request and token buckets driven by API rate limit headers.
+
+    Callers reserve capacity before each request and are delayed pre-emptively
+    once the buckets run dry; a 429's retry-after blocks every caller of that
+    model until it passes. Buckets stay unlimited until the first response
+    reports its limits.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, backoff_base: Optional[float] = None,
+                 backoff_cap: Optional[float] = None, clock=time.monotonic):
+        self.max_attempts = max_attempts or DEFAULT_MAX_ATTEMPTS
+        self.backoff_base = backoff_base if backoff_base is not None else DEFAULT_BACKOFF_BASE
+        self.backoff_cap = backoff_cap if backoff_cap is not None else DEFAULT_BACKOFF_CAP
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._requests: Dict[str, TokenBucket] = {}
+        self._tokens: Dict[str, TokenBucket] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    def reserve(self, model: str, tokens: int = 0) -> float:
+        """Reserve one request and tokens for model; return the delay before sending"""
+        with self._lock:
+            delay = max(self._blocked_until.get(model, 0.0) - self.clock(), 0.0)
+            if model in self._requests:
+                delay = max(delay, self._requests[model].reserve(1))
+            if model in self._tokens and tokens:
+                delay = max(delay, self._tokens[model].reserve(tokens))
+        return delay
+
+    def acquire(self, model: str, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        """Block until model has capacity for the request, or at most max_wait; return the time waited"""
+        delay = self.reserve(model, tokens)
+        if max_wait is not None:
+            delay = min(delay, max_wait)
+        if delay > 0:
+            logger.info(f"Rate limiter delaying {model} request {delay:.1f}s")
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, model: str, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        """Awaitable acquire()"""
+        delay = self.reserve(model, tokens)
+        if max_wait is not None:
+            delay = min(delay, max_wait)
+        if delay > 0:
+            logger.info(f"Rate limiter delaying {model} request {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return delay
+
+    def update_from_headers(self, model: str, headers: Optional[Mapping[str, str]]) -> None:
+        """Sync buckets from x-ratelimit-* headers and honour retry-after"""
+        if not headers:
+            return
+        with self._lock:
+            for kind, buckets in (("requests", self._requests), ("tokens", self._tokens)):
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if limit is None or remaining is None:
+                    continue
+                try:
+                    limit, remaining = float(limit), float(remaining)
+                except ValueError:
+                    continue
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                bucket = buckets.get(model)
+                if bucket is None:
+                    bucket = buckets[model] = TokenBucket(limit, limit / 60.0, clock=self.clock)
+                bucket.sync(limit, remaining, reset)
+
+            retry_after = retry_after_seconds(headers)
+            if retry_after:
+                self._blocked_until[model] = max(self._blocked_until.get(model, 0.0), self.clock() + retry_after)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Jittered exponential delay for the given 1-based attempt, never below retry_after"""
+        ceiling = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(ceiling / 2, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
@@ -1,13 +1,12 @@
 from abc import ABC, abstractmethod
 import io
-import torch
 import os
 import time
 from typing import Optional, Tuple
-import numpy as np
 import re
 import openai
 import logging
+from helpers.llm_pool import get_openai_client
 
 logger = logging.getLogger("streamlit")
 
@@ -41,6 +40,7 @@ class LocalWhisperSTT(SpeechToText):
     def initialize(self) -> None:
         try:
             print("Loading Whisper model...")
+            import torch
             from faster_whisper import WhisperModel
             
             # Use CUDA if available, else CPU
@@ -161,7 +161,7 @@ class OpenAIWhisperSTT(SpeechToText):
                 #     del os.environ['SSL_CERT_DIR']
                 
             with open(audio_file, "rb") as f:
-                response = openai.audio.transcriptions.create(
+                response = get_openai_client(max_retries=2).audio.transcriptions.create(
                     model=self.model,
                     file=f,
                     language="en",
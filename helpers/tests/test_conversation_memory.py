@@ -0,0 +1,37 @@
+import threading
+import unittest
+from helpers.conversation_memory import RollingMemory
+
+class TestRollingMemory(unittest.TestCase):
+    def test_window_stays_under_cap(self):
+        memory = RollingMemory([{"role": "system", "content": "be brief"}], max_tokens=100, min_recent=2)
+        for i in range(50):
+            memory.add("user", f"turn {i} " + "x" * 60)
+        self.assertLessEqual(memory.tokens, 100)
+        messages = memory.messages()
+        self.assertEqual(messages[0]["content"], "be brief")
+        self.assertTrue(messages[-1]["content"].startswith("turn 49"))
+
+    def test_evicted_turns_are_summarized_off_the_request_path(self):
+        release = threading.Event()
+        calls = []
+
+        def summarizer(summary, turns):
+            release.wait(5)
+            calls.append(len(turns))
+            return (summary + " " if summary else "") + ",".join(t["content"].split()[1] for t in turns)
+
+        memory = RollingMemory(max_tokens=60, min_recent=1, summarizer=summarizer)
+        for i in range(10):
+            memory.add("user", f"turn {i} " + "x" * 40)
+        # Appending returned while the summarizer is still blocked
+        self.assertEqual(memory.summary, "")
+        release.set()
+        memory.wait(5)
+        memory.close()
+        self.assertIn("0", memory.summary.split(",")[0])
+        self.assertEqual(sum(calls) + len(memory), 10)
+        self.assertTrue(memory.messages()[0]["content"].startswith("Summary of the earlier conversation"))
+
+if __name__ == '__main__':
+    unittest.main()
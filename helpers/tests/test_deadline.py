@@ -0,0 +1,57 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from helpers.call_ChatGPT import CallChatGPT
+from helpers.deadline import DeadlineExceeded, current_deadline, deadline, run_in_context, time_left
+from helpers.llm_pool import get_openai_client
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+
+class TestDeadline(unittest.TestCase):
+    def test_inner_deadline_never_extends_outer(self):
+        with deadline(0.5, "project") as outer:
+            with deadline(60, "phase") as inner:
+                self.assertIs(inner, outer)
+                self.assertLessEqual(time_left(), 0.5)
+            with deadline(0.1, "phase") as inner:
+                self.assertEqual(inner.label, "phase")
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+        self.assertEqual(time_left(30), 30)
+
+    def test_expired_deadline_raises(self):
+        with deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                time_left()
+
+    def test_deadline_reaches_pool_threads(self):
+        with deadline(5, "phase"):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                labels = list(pool.map(run_in_context(lambda _: current_deadline().label), range(4)))
+        self.assertEqual(labels, ["phase"] * 4)
+
+
+class TestDeadlineReachesRequests(unittest.TestCase):
+    def _chat(self, server):
+        chat = CallChatGPT.__new__(CallChatGPT)
+        chat.client = get_openai_client("test-key", server.url)
+        return chat
+
+    def test_slow_request_is_cut_at_the_deadline(self):
+        with MockOpenAIServer(settings=MockSettings(latency=3)) as server:
+            started = time.monotonic()
+            with deadline(0.5), self.assertRaises(DeadlineExceeded):
+                self._chat(server).call_chatgpt_with_continuity("gpt-4o", [{"role": "user", "content": "hi"}])
+            self.assertLess(time.monotonic() - started, 2)
+
+    def test_stream_stops_at_the_deadline(self):
+        with MockOpenAIServer(settings=MockSettings(latency=0, tokens_per_second=20)) as server:
+            pieces = []
+            with deadline(0.5), self.assertRaises(DeadlineExceeded):
+                for piece in self._chat(server).stream_response(
+                        "gpt-4o", [{"role": "user", "content": "Build an n8n workflow"}], use_cache=False):
+                    pieces.append(piece)
+        self.assertTrue(pieces)
+
+if __name__ == '__main__':
+    unittest.main()
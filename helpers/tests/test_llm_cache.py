@@ -0,0 +1,69 @@
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from helpers.llm_cache import LLMResponseCache, refresh_cache
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "cache.sqlite"
+        self.messages = [{"role": "user", "content": "Summarize these goals"}]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_request_parameters(self):
+        key = LLMResponseCache.make_key("gpt-4o", self.messages)
+        self.assertEqual(key, LLMResponseCache.make_key("gpt-4o", list(self.messages)))
+        self.assertNotEqual(key, LLMResponseCache.make_key("gpt-4o-mini", self.messages))
+        self.assertNotEqual(key, LLMResponseCache.make_key("gpt-4o", self.messages, temperature=0.7))
+        self.assertNotEqual(key, LLMResponseCache.make_key("gpt-4o", self.messages, max_tokens=2000))
+
+    def test_round_trip_and_persistence(self):
+        cache = LLMResponseCache(self.path)
+        key = cache.make_key("gpt-4o", self.messages)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "- goal one", model="gpt-4o")
+        cache.close()
+
+        reopened = LLMResponseCache(self.path)
+        self.assertEqual(reopened.get(key), "- goal one")
+        reopened.close()
+
+    def test_refresh_misses_reads_but_stores_new_responses(self):
+        cache = LLMResponseCache(self.path)
+        cache.put("k", "old")
+        with refresh_cache():
+            self.assertIsNone(cache.get("k"))
+            cache.put("k", "new")
+            with refresh_cache(False):
+                self.assertEqual(cache.get("k"), "new")
+        self.assertEqual(cache.get("k"), "new")
+        cache.close()
+
+    def test_expired_entries_are_dropped(self):
+        cache = LLMResponseCache(self.path)
+        cache.put("k", "stale", ttl=0.01)
+        time.sleep(0.05)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["entries"], 0)
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = LLMResponseCache(self.path, max_bytes=25)
+        cache.put("a", "a" * 10)
+        time.sleep(0.01)
+        cache.put("b", "b" * 10)
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.put("c", "c" * 10)
+        self.assertEqual(cache.get("a"), "a" * 10)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "c" * 10)
+        self.assertLessEqual(cache.stats()["bytes"], 25)
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
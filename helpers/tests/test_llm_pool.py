@@ -0,0 +1,50 @@
+import os
+import time
+import asyncio
+import unittest
+from unittest import mock
+from helpers.call_ChatGPT import AsyncCallChatGPT
+from helpers.llm_pool import ModelConcurrencyLimiter
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+
+class TestModelConcurrencyLimiter(unittest.TestCase):
+    def test_limits_are_per_model(self):
+        limiter = ModelConcurrencyLimiter(default_limit=3, limits={'gpt-4o': 1})
+
+        async def values():
+            return limiter.semaphore('gpt-4o')._value, limiter.semaphore('gpt-4o-mini')._value
+
+        self.assertEqual(asyncio.run(values()), (1, 3))
+
+    def test_semaphores_of_closed_loops_are_dropped(self):
+        limiter = ModelConcurrencyLimiter()
+
+        async def take():
+            return limiter.semaphore('gpt-4o')
+
+        for _ in range(5):
+            asyncio.run(take())
+        self.assertEqual(len(limiter._semaphores), 1)
+
+
+class TestAsyncCallChatGPT(unittest.TestCase):
+    def test_in_flight_cap_holds_across_concurrent_calls(self):
+        limiter = ModelConcurrencyLimiter(limits={'gpt-4o': 2})
+        messages = [{"role": "user", "content": "Summarize these goals into bullet points"}]
+
+        async def call_all(chat):
+            return await asyncio.gather(*(chat.get_response('gpt-4o', messages, use_cache=False) for _ in range(6)))
+
+        with MockOpenAIServer(settings=MockSettings(latency=0.2)) as server, \
+                mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": server.url}), \
+                mock.patch("helpers.call_ChatGPT.get_concurrency_limiter", return_value=limiter):
+            started = time.monotonic()
+            responses = asyncio.run(call_all(AsyncCallChatGPT()))
+            elapsed = time.monotonic() - started
+
+        self.assertTrue(all(responses))
+        self.assertEqual(server.max_active, 2)
+        self.assertGreaterEqual(elapsed, 0.55)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+
+class TestMockOpenAIServer(unittest.TestCase):
+    def setUp(self):
+        self.server = MockOpenAIServer(settings=MockSettings(latency=0, rpm=2, seed=1)).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self.server.url + path, data=json.dumps(payload).encode(),
+                                         headers={"Content-Type": "application/json"})
+        return urllib.request.urlopen(request, timeout=5)
+
+    def test_chat_completion_uses_canned_reply(self):
+        with self._post("/chat/completions", {"model": "gpt-4o", "messages": [
+                {"role": "user", "content": "Summarize these goals into bullet points"}]}) as response:
+            body = json.loads(response.read())
+            self.assertEqual(response.headers["x-ratelimit-limit-requests"], "2")
+        self.assertTrue(body["choices"][0]["message"]["content"].startswith("- "))
+        self.assertGreater(body["usage"]["total_tokens"], 0)
+
+    def test_streamed_chunks_rebuild_reply(self):
+        with self._post("/chat/completions", {"model": "gpt-4o", "stream": True, "messages": [
+                {"role": "user", "content": "Build an n8n workflow"}]}) as response:
+            lines = [line.decode().strip() for line in response if line.startswith(b"data: ")]
+        self.assertEqual(lines[-1], "data: [DONE]")
+        text = "".join(json.loads(line[6:])["choices"][0]["delta"].get("content", "") for line in lines[:-1])
+        self.assertIn("workflow_json", text)
+
+    def test_requests_over_rpm_are_rate_limited(self):
+        payload = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+        for _ in range(2):
+            self._post("/chat/completions", payload).close()
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self._post("/chat/completions", payload)
+        self.assertEqual(raised.exception.code, 429)
+        self.assertIsNotNone(raised.exception.headers["retry-after"])
+
+if __name__ == '__main__':
+    unittest.main()
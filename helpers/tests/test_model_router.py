@@ -0,0 +1,85 @@
+import unittest
+from helpers.call_ChatGPT import CallChatGPT
+from helpers.llm_pool import get_openai_client
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+from helpers.model_router import Fallback, ModelRouter, model_scope, route_model
+
+class TestModelRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = ModelRouter.from_config({
+            'phases': {'design': 'gpt-4o', 'strategy': 'gpt-4o-mini'},
+            'fallbacks': [
+                {'from': ['gpt-4o-mini'], 'prompt_tokens_over': 1000, 'model': 'gpt-4o'},
+                {'from': 'gpt-4o', 'latency_over': 5, 'model': 'gpt-4o-mini'},
+            ]
+        }, required_roles={'Worker': {'name': 'Woz', 'model': 'gpt-4.1'}, 'Manager': {'name': 'Dum'}})
+
+    def test_task_then_phase_then_role_then_requested(self):
+        self.assertEqual(self.router.route('gpt-4o', phase='design', task='merge'), 'gpt-4o-mini')
+        self.assertEqual(self.router.route('gpt-4o', phase='design', role='Worker'), 'gpt-4o')
+        self.assertEqual(self.router.route('gpt-4o', phase='draft', role='Worker'), 'gpt-4.1')
+        self.assertEqual(self.router.route('gpt-4o', phase='draft', role='Manager'), 'gpt-4o')
+
+    def test_long_prompts_move_to_the_large_model(self):
+        self.assertEqual(self.router.route('gpt-4o', task='goal_summary', prompt_tokens=200), 'gpt-4o-mini')
+        self.assertEqual(self.router.route('gpt-4o', task='goal_summary', prompt_tokens=5000), 'gpt-4o')
+
+    def test_slow_model_falls_back_until_samples_expire(self):
+        for seconds in (8, 9, 1):
+            self.router.observe('gpt-4o', seconds)
+        self.assertEqual(self.router.route('gpt-4o', phase='design'), 'gpt-4o-mini')
+        self.router.latency_ttl = 0
+        self.assertEqual(self.router.route('gpt-4o', phase='design'), 'gpt-4o')
+
+    def test_settings_ignore_observed_latency(self):
+        settings = self.router.settings()
+        self.router.observe('gpt-4o', 30)
+        self.assertEqual(self.router.settings(), settings)
+        self.assertEqual(settings['roles'], {'Worker': 'gpt-4.1'})
+
+    def test_scopes_nest_and_default_to_the_process_router(self):
+        self.assertEqual(route_model('gpt-4o'), 'gpt-4o')
+        with model_scope(task='structuring'):
+            self.assertEqual(route_model('gpt-4o'), 'gpt-4o-mini')
+        with model_scope(self.router, phase='strategy'):
+            self.assertEqual(route_model('gpt-4o'), 'gpt-4o-mini')
+            with model_scope(role='Worker', phase='draft'):
+                self.assertEqual(route_model('gpt-4o'), 'gpt-4.1')
+            long_prompt = [{'role': 'user', 'content': 'x' * 8000}]
+            self.assertEqual(route_model('gpt-4o', long_prompt), 'gpt-4o')
+
+    def test_fallback_from_config(self):
+        rule = Fallback.from_config({'from': 'gpt-4o', 'latency_over': 2.5, 'model': 'gpt-4o-mini'})
+        self.assertEqual(rule.from_models, ('gpt-4o',))
+        self.assertIsNone(rule.prompt_tokens_over)
+
+
+class TestObservedLatency(unittest.TestCase):
+    """Only the time to first byte of streams counts, so long answers do not look like a slow model"""
+
+    def setUp(self):
+        self.router = ModelRouter(fallbacks=[Fallback('gpt-4o-mini', latency_over=0.3, from_models=('gpt-4o',))])
+        self.messages = [{"role": "user", "content": "Write the design"}]
+        # About 100 tokens at 200 tokens a second: half a second to complete, 50ms to start
+        self.settings = MockSettings(latency=0.05, tokens_per_second=200, responses=[(r".*", "word " * 100)])
+
+    def _client(self, server):
+        chat = CallChatGPT.__new__(CallChatGPT)
+        chat.client = get_openai_client("test-key", server.url)
+        return chat
+
+    def test_long_non_streamed_answer_is_not_observed(self):
+        with MockOpenAIServer(settings=self.settings) as server, model_scope(self.router):
+            self._client(server).call_chatgpt_with_continuity('gpt-4o', self.messages)
+        self.assertIsNone(self.router.latency('gpt-4o'))
+        self.assertEqual(self.router.route('gpt-4o'), 'gpt-4o')
+
+    def test_stream_is_observed_until_its_first_byte(self):
+        with MockOpenAIServer(settings=self.settings) as server, model_scope(self.router):
+            with self._client(server).call_chatgpt_with_continuity('gpt-4o', self.messages, stream=True) as stream:
+                self.assertTrue(list(stream))
+        self.assertLess(self.router.latency('gpt-4o'), 0.3)
+        self.assertEqual(self.router.route('gpt-4o'), 'gpt-4o')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from helpers.rate_limiter import RateLimiter, parse_duration, is_retryable_error, retry_after_seconds
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(max_attempts=4, backoff_base=1.0, backoff_cap=8.0, clock=self.clock)
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("1s"), 1.0)
+        self.assertEqual(parse_duration("6m0s"), 360.0)
+        self.assertAlmostEqual(parse_duration("20ms"), 0.02)
+        self.assertEqual(parse_duration("2.5"), 2.5)
+        self.assertEqual(parse_duration(None), 0.0)
+
+    def test_unknown_model_is_not_delayed(self):
+        self.assertEqual(self.limiter.reserve("gpt-4o", 5000), 0.0)
+
+    def test_exhausted_request_bucket_delays_callers(self):
+        self.limiter.update_from_headers("gpt-4o", {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "1",
+            "x-ratelimit-reset-requests": "59s",
+        })
+        self.assertEqual(self.limiter.reserve("gpt-4o"), 0.0)
+        self.assertAlmostEqual(self.limiter.reserve("gpt-4o"), 1.0)
+        self.clock.now += 1.0
+        self.assertAlmostEqual(self.limiter.reserve("gpt-4o"), 1.0)
+
+    def test_token_bucket_accounts_for_prompt_size(self):
+        self.limiter.update_from_headers("gpt-4o", {
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-tokens": "1000",
+            "x-ratelimit-reset-tokens": "29s",
+        })
+        self.assertEqual(self.limiter.reserve("gpt-4o", 1000), 0.0)
+        self.assertAlmostEqual(self.limiter.reserve("gpt-4o", 2000), 2.0)
+        self.assertEqual(self.limiter.reserve("gpt-4o-mini", 2000), 0.0)
+
+    def test_retry_after_blocks_model(self):
+        headers = {"retry-after": "7"}
+        self.assertEqual(retry_after_seconds(headers), 7.0)
+        self.limiter.update_from_headers("gpt-4o", headers)
+        self.assertAlmostEqual(self.limiter.reserve("gpt-4o"), 7.0)
+        self.clock.now += 7.0
+        self.assertEqual(self.limiter.reserve("gpt-4o"), 0.0)
+
+    def test_backoff_is_bounded_and_jittered(self):
+        for attempt in range(1, 10):
+            delay = self.limiter.backoff(attempt)
+            ceiling = min(8.0, 2 ** (attempt - 1))
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+        self.assertEqual(self.limiter.backoff(1, retry_after=30), 30)
+
+    def test_retryable_errors(self):
+        self.assertTrue(is_retryable_error(StatusError(429)))
+        self.assertTrue(is_retryable_error(StatusError(503)))
+        self.assertFalse(is_retryable_error(StatusError(400)))
+        self.assertFalse(is_retryable_error(StatusError(401)))
+        self.assertFalse(is_retryable_error(ValueError("bad input")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+from helpers.call_ChatGPT import CallChatGPT
+from helpers.llm_pool import get_openai_client
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+from helpers.usage import BudgetExceeded, UsageLedger, budget_model, check_budget, cost, usage_scope
+
+class TestUsageLedger(unittest.TestCase):
+    def test_cost_matches_dated_models_by_longest_prefix(self):
+        self.assertAlmostEqual(cost("gpt-4o-mini-2024-07-18", 1_000_000, 0), 0.15)
+        self.assertAlmostEqual(cost("gpt-4o", 0, 1_000_000), 10.00)
+        self.assertEqual(cost("some-local-model", 1000, 1000), 0.0)
+
+    def test_usage_is_attributed_and_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "usage.json"
+            ledger = UsageLedger(path=path)
+            ledger.record("gpt-4o", 100, 50, phase="design", agent="Worker_Woz")
+            ledger.record("gpt-4o", 10, 5, phase="design", agent="Worker_Woz")
+            ledger.record("gpt-4o-mini", 200, 20, phase="review", agent="Documenter_Toby")
+            ledger.save()
+
+            reloaded = UsageLedger(path=path)
+            self.assertEqual(reloaded.totals(phase="design")["tokens"], 165)
+            self.assertEqual(reloaded.totals(agent="Documenter_Toby")["calls"], 1)
+            self.assertEqual(sorted(reloaded.breakdown("model")), ["gpt-4o", "gpt-4o-mini"])
+
+    def test_budget_degrades_then_refuses_calls(self):
+        ledger = UsageLedger(max_tokens=1000, degrade_at=0.5)
+        with usage_scope(ledger, phase="design", critical=False, degraded_model="gpt-4o-mini"):
+            self.assertEqual(budget_model("gpt-4o"), "gpt-4o")
+            ledger.record("gpt-4o", 400, 200)
+            self.assertEqual(ledger.level(), "degraded")
+            self.assertEqual(budget_model("gpt-4o"), "gpt-4o-mini")
+            with usage_scope(critical=True):
+                self.assertEqual(budget_model("gpt-4o"), "gpt-4o")
+            ledger.record("gpt-4o-mini", 300, 100)
+            with self.assertRaises(BudgetExceeded):
+                check_budget()
+
+
+class TestUsageFromResponses(unittest.TestCase):
+    def setUp(self):
+        self.server = MockOpenAIServer(settings=MockSettings(latency=0)).start()
+        self.chat = CallChatGPT.__new__(CallChatGPT)
+        self.chat.client = get_openai_client("test-key", self.server.url)
+        self.messages = [{"role": "user", "content": "Summarize these goals into bullet points"}]
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_plain_and_streamed_calls_are_metered(self):
+        ledger = UsageLedger()
+        with usage_scope(ledger, phase="strategy", agent="Documenter_Toby"):
+            self.chat.get_response("gpt-4o", self.messages, use_cache=False)
+            "".join(self.chat.stream_response("gpt-4o", self.messages, use_cache=False))
+        totals = ledger.totals(phase="strategy", agent="Documenter_Toby")
+        self.assertEqual(totals["calls"], 2)
+        self.assertGreater(totals["completion_tokens"], 0)
+        self.assertEqual(ledger.totals()["tokens"], totals["tokens"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import os
+import json
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# USD per million (prompt, completion) tokens; dated model names match by prefix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-nano': (0.10, 0.40),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1': (2.00, 8.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'o3-mini': (1.10, 4.40),
+    'o4-mini': (1.10, 4.40),
+    'text-embedding-3-small': (0.02, 0.0),
+    'text-embedding-3-large': (0.13, 0.0),
+}
+
+_unpriced = set()
+
+def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD of a call, priced from MODEL_PRICES; unknown models cost nothing"""
+    matches = [name for name in MODEL_PRICES if model == name or model.startswith(name + '-')]
+    if not matches:
+        if model not in _unpriced:
+            _unpriced.add(model)
+            logger.warning(f"No price for {model}, its calls count tokens only")
+        return 0.0
+    prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised instead of making a call once a project's budget is spent"""
+
+
+class UsageLedger:
+    """Tokens and cost of a project's API calls, attributed to phase, agent and model.
+
+    With max_tokens or max_cost set the ledger is also the project's budget:
+    level() turns 'degraded' once either reaches degrade_at of its limit and
+    'exhausted' at the limit, after which check() refuses further calls.
+    The ledger is saved as JSON so a resumed run keeps counting.
+    """
+
+    LEVELS = ('ok', 'degraded', 'exhausted')
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost: Optional[float] = None,
+                 degrade_at: float = 0.8, path: Optional[Path] = None):
+        """
+        Args:
+            max_tokens: Prompt plus completion tokens allowed, None for no limit
+            max_cost: USD allowed, None for no limit
+            degrade_at: Fraction of either limit at which the budget is degraded
+            path: JSON file the ledger is loaded from and saved to
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.degrade_at = degrade_at
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        # (phase, agent, model) -> [prompt_tokens, completion_tokens, cost, calls]
+        self._rows: Dict[Tuple[str, str, str], List[float]] = {}
+        self._level = 'ok'
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for row in json.load(f).get('rows', []):
+                        self._rows[(row['phase'], row['agent'], row['model'])] = [
+                            row['prompt_tokens'], row['completion_tokens'], row['cost'], row['calls']]
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable usage ledger {self.path}: {str(e)}")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], path: Optional[Path] = None) -> "UsageLedger":
+        """Ledger for a mode YAML budget section"""
+        config = config or {}
+        return cls(
+            max_tokens=config.get('max_tokens'),
+            max_cost=config.get('max_cost'),
+            degrade_at=config.get('degrade_at', 0.8),
+            path=path
+        )
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int,
+               phase: Optional[str] = None, agent: Optional[str] = None) -> float:
+        """Add a call's tokens and return its cost"""
+        call_cost = cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            row = self._rows.setdefault((phase or '-', agent or '-', model), [0, 0, 0.0, 0])
+            row[0] += prompt_tokens
+            row[1] += completion_tokens
+            row[2] += call_cost
+            row[3] += 1
+        level = self.level()
+        if level != self._level:
+            self._level = level
+            logger.warning(f"Token budget {level}: {self.summary()}")
+        return call_cost
+
+    def totals(self, **match: str) -> Dict[str, float]:
+        """Totals over all calls, or those matching phase=, agent= or model="""
+        keys = ('phase', 'agent', 'model')
+        totals = {'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0, 'calls': 0}
+        with self._lock:
+            for key, row in self._rows.items():
+                if all(key[keys.index(name)] == value for name, value in match.items()):
+                    for name, value in zip(totals, row):
+                        totals[name] += value
+        totals['tokens'] = totals['prompt_tokens'] + totals['completion_tokens']
+        return totals
+
+    def breakdown(self, by: str = 'phase') -> Dict[str, Dict[str, float]]:
+        """Totals per phase, agent or model"""
+        index = ('phase', 'agent', 'model').index(by)
+        with self._lock:
+            names = sorted({key[index] for key in self._rows})
+        return {name: self.totals(**{by: name}) for name in names}
+
+    def used(self) -> float:
+        """Fraction of the tighter limit spent, 0 without limits"""
+        totals = self.totals()
+        fractions = [0.0]
+        if self.max_tokens:
+            fractions.append(totals['tokens'] / self.max_tokens)
+        if self.max_cost:
+            fractions.append(totals['cost'] / self.max_cost)
+        return max(fractions)
+
+    def level(self) -> str:
+        used = self.used()
+        if used >= 1:
+            return 'exhausted'
+        if used >= self.degrade_at:
+            return 'degraded'
+        return 'ok'
+
+    def check(self) -> None:
+        """Raise BudgetExceeded once the budget is spent"""
+        if self.level() == 'exhausted':
+            raise BudgetExceeded(f"Token budget exhausted: {self.summary()}")
+
+    def summary(self) -> str:
+        totals = self.totals()
+        limits = [f"{self.max_tokens} tokens" if self.max_tokens else None,
+                  f"${self.max_cost:.2f}" if self.max_cost else None]
+        limit = " of " + " / ".join(l for l in limits if l) if any(limits) else ""
+        return (f"{totals['tokens']} tokens ({totals['prompt_tokens']} prompt, {totals['completion_tokens']} completion), "
+                f"${totals['cost']:.4f} in {totals['calls']} calls{limit}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows.clear()
+        self._level = 'ok'
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            rows = [{'phase': phase, 'agent': agent, 'model': model, 'prompt_tokens': row[0],
+                     'completion_tokens': row[1], 'cost': round(row[2], 6), 'calls': row[3]}
+                    for (phase, agent, model), row in sorted(self._rows.items())]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    """Who a call is made for, carried in a context variable down to CallChatGPT"""
+    ledger: Optional[UsageLedger] = None
+    phase: Optional[str] = None
+    agent: Optional[str] = None
+    critical: bool = True                # non-critical calls are downgraded when the budget runs low
+    degraded_model: Optional[str] = None
+
+
+_scope: contextvars.ContextVar[Optional[UsageScope]] = contextvars.ContextVar("usage_scope", default=None)
+
+def current_scope() -> Optional[UsageScope]:
+    return _scope.get()
+
+@contextmanager
+def usage_scope(ledger: Optional[UsageLedger] = None, **fields: Any) -> Iterator[UsageScope]:
+    """Attribute calls in the block, inheriting whatever the enclosing scope does not override.
+
+    Args:
+        ledger: Ledger to record into; defaults to the enclosing scope's
+        fields: phase, agent, critical or degraded_model
+    """
+    scope = _scope.get() or UsageScope()
+    if ledger is not None:
+        fields['ledger'] = ledger
+    token = _scope.set(replace(scope, **fields))
+    try:
+        yield _scope.get()
+    finally:
+        _scope.reset(token)
+
+def record_usage(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Record a call's tokens in the current scope's ledger, if any"""
+    scope = _scope.get()
+    if scope is not None and scope.ledger is not None:
+        scope.ledger.record(model, prompt_tokens, completion_tokens, scope.phase, scope.agent)
+
+def check_budget() -> None:
+    """Raise BudgetExceeded if the current scope's budget is spent"""
+    scope = _scope.get()
+    if scope is not None and scope.ledger is not None:
+        scope.ledger.check()
+
+def budget_model(model: str) -> str:
+    """The model to call: the degraded model for non-critical calls once the budget runs low"""
+    scope = _scope.get()
+    if (scope is None or scope.ledger is None or scope.critical or not scope.degraded_model
+            or scope.ledger.level() == 'ok'):
+        return model
+    return scope.degraded_model
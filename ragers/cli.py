@@ -1,11 +1,13 @@
 import argparse
+import json
 import logging
-import yaml
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 from datetime import datetime
-from ragers.main import ProjectMain
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ragers.main import ProjectMain, load_project_types, run_goal_file
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -26,18 +28,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-def load_project_types() -> dict:
-    """Load project types from configuration"""
-    try:
-        module_dir = Path(__file__).parent
-        config_path = module_dir / "templates" / "project_types.yaml"
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config
-    except Exception as e:
-        logger.error(f"Failed to load project types: {str(e)}")
-        return {}
-
 def find_goal_files(goal_file: str = None) -> list:
     """Find goal files either from command line or default directory"""
     if goal_file:
@@ -68,6 +58,63 @@ def validate_project_type(project_type: str, project_types: dict) -> bool:
         return False
     return True
 
+def run_batch(goal_files: List[Path], project_type: Optional[str], resume: bool, workers: int) -> List[Dict]:
+    """Run projects concurrently on a process pool and write a summary report.
+
+    Args:
+        goal_files: One project per goal file
+        project_type: Project type, or None to use each goal's default
+        resume: Reuse phases unchanged since the last run
+        workers: Worker processes
+
+    Returns:
+        Per-project results in completion order
+    """
+    batch_dir = Path('logs') / f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    total = len(goal_files)
+    logger.info(f"Running {total} projects on {workers} workers, logs in {batch_dir}")
+
+    results = []
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_goal_file, str(goal_file), project_type, resume, str(batch_dir)): goal_file
+            for goal_file in goal_files
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            goal_file = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # The worker process died
+                result = {'project': get_project_name_from_goal(goal_file), 'success': False, 'seconds': None,
+                          'log': None, 'error': str(e), 'pid': None}
+            results.append(result)
+            status = 'ok' if result['success'] else 'FAILED'
+            logger.info(f"[{done}/{total}] {result['project']}: {status} ({result['seconds']}s)")
+
+    elapsed = time.monotonic() - start
+    failed = [r for r in results if not r['success']]
+    busy = sum(r['seconds'] or 0 for r in results)
+    summary = {
+        'projects': total,
+        'succeeded': total - len(failed),
+        'failed': [r['project'] for r in failed],
+        'workers': workers,
+        'wall_seconds': round(elapsed, 1),
+        'project_seconds': round(busy, 1),
+        'results': sorted(results, key=lambda r: r['project'])
+    }
+    with open(batch_dir / 'summary.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(f"Batch finished: {summary['succeeded']}/{total} succeeded in {elapsed:.1f}s "
+                f"({busy:.1f}s of project time, {busy / elapsed if elapsed else 0:.1f}x)")
+    for r in failed:
+        logger.error(f"Failed: {r['project']} {r['error'] or ''} (log: {r['log']})")
+    logger.info(f"Summary report: {batch_dir / 'summary.json'}")
+    return results
+
 def main():
     # Load project types
     project_types = load_project_types()
@@ -79,6 +126,10 @@ def main():
     parser = argparse.ArgumentParser(description='Run a complete project workflow')
     parser.add_argument('--goal', help='Path to goal file')
     parser.add_argument('--type', help='Project type (default: code)')
+    parser.add_argument('--fresh', action='store_true', help='Ignore the run manifest, usage ledger and LLM response cache and rerun every phase')
+    parser.add_argument('--batch', action='store_true', help='Run all goal files concurrently on a process pool')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('RAGERS_WORKERS', '4')),
+                        help='Worker processes for --batch (default: 4 or RAGERS_WORKERS)')
     
     args = parser.parse_args()
     
@@ -88,6 +139,11 @@ def main():
         logger.error("No goal files found")
         exit(1)
 
+    if args.batch:
+        workers = max(1, min(args.workers, len(goal_files)))
+        results = run_batch(goal_files, args.type, not args.fresh, workers)
+        exit(0 if all(r['success'] for r in results) else 1)
+
     # Create project main instance
     project_main = ProjectMain()
 
@@ -96,7 +152,7 @@ def main():
         project_name = get_project_name_from_goal(goal_file)
         logger.info(f"Processing project from goal file: {project_name}")
 
-        success = project_main.run_project(project_name, args.type, project_types, goal_file)
+        success = project_main.run_project(project_name, args.type, project_types, goal_file, resume=not args.fresh)
         
         if not success:
             logger.error(f"Failed to process project: {project_name}")
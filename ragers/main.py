@@ -1,3 +1,5 @@
+import os
+import time
 import logging
 import unicodedata
 from pathlib import Path
@@ -6,16 +8,80 @@ from ragers.project_start import ProjectStart
 from ragers.project_work import ProjectWork
 #from project_documents import ProjectDocuments
 from ragers.utils.strict_logging import enable_strict_logging
+from ragers.utils.template_cache import load_yaml
+
+logger = logging.getLogger(__name__)
+
+def load_project_types() -> dict:
+    """Load project types from configuration"""
+    try:
+        config_path = Path(__file__).parent / "templates" / "project_types.yaml"
+        return load_yaml(config_path)
+    except Exception as e:
+        logger.error(f"Failed to load project types: {str(e)}")
+        return {}
+
+def isolate_process_logging(log_path: Path) -> logging.Handler:
+    """Send this worker process's log records to its own project log only"""
+    root = logging.getLogger()
+    # Handlers inherited from the parent would interleave every project into one file
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(log_path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+    return handler
+
+def run_goal_file(goal_file: str, project_type: Optional[str], resume: bool, log_dir: str,
+                  project_name: Optional[str] = None) -> Dict:
+    """Run one project in a worker process and return its outcome.
+
+    Args:
+        goal_file: Goal file for the project
+        project_type: Project type, or None to take it from the goal file
+        resume: Reuse phases unchanged since the last run
+        log_dir: Directory for the <project>.log this run writes to
+        project_name: Defaults to the goal file's name
+
+    Returns:
+        Dict with project, success, seconds, log, error, pid and project_path
+    """
+    project_name = project_name or Path(goal_file).stem
+    log_path = Path(log_dir) / f"{project_name}.log"
+    handler = isolate_process_logging(log_path)
+    start = time.monotonic()
+    error = None
+    project_main = ProjectMain()
+    try:
+        success = project_main.run_project(project_name, project_type, load_project_types(), goal_file, resume=resume)
+    except Exception as e:
+        success, error = False, str(e)
+    finally:
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+    return {
+        'project': project_name,
+        'success': success,
+        'seconds': round(time.monotonic() - start, 1),
+        'log': str(log_path),
+        'error': error,
+        'pid': os.getpid(),
+        'project_path': str(project_main.project_path) if project_main.project_path else None
+    }
 
 class ProjectMain:
     """Main project orchestrator that handles the complete project workflow"""
    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.project_path: Optional[Path] = None
         #enable_strict_logging()
 
-    def run_project(self, project_name: str, project_type: str, project_types: Dict, goals_file: Optional[str] = None) -> bool:
-        """Run a complete project workflow"""
+    def run_project(self, project_name: str, project_type: str, project_types: Dict, goals_file: Optional[str] = None,
+                    resume: bool = True) -> bool:
+        """Run a complete project workflow; with resume, phases unchanged since the last run are reused"""
         try:
             self.logger.info(f"Starting project run. Name: {project_name}, Type: {project_type}, Goals file: {goals_file}")
             
@@ -29,6 +95,7 @@ class ProjectMain:
 
             # Use the project type determined by ProjectStart
             project_type = project.project_type
+            self.project_path = project.project_path
             self.logger.info(f"Using project type: {project_type}")
             
             # Log goals state after initialization
@@ -43,13 +110,17 @@ class ProjectMain:
             work = ProjectWork(
                 project.project_path, 
                 project_type, 
-                project.config.goals if project.config else None
+                project.config.goals if project.config else None,
+                resume=resume
             )
             self.logger.info(f"ProjectWork goals after initialization: {work.goals}")
             
-            if not work.run_all_meetings():
-                self.logger.error("Failed to run meetings")
-                return False
+            try:
+                if not work.run_all_meetings():
+                    self.logger.error("Failed to run meetings")
+                    return False
+            finally:
+                work.close()
 
             # # Generate final document
             # docs = ProjectDocuments()
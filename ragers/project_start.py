@@ -1,6 +1,5 @@
 import os
 import sys
-import yaml
 import logging
 import json
 import re
@@ -9,6 +8,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from ragers.utils.document_manager import DocumentManager
+from ragers.utils.template_cache import load_yaml
 
 @dataclass
 class ProjectConfig:
@@ -99,8 +99,7 @@ class ProjectStart:
                 self.logger.warning(f"Config file not found: {self.config_file}")
                 return False
                 
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = load_yaml(self.config_file)
                 
             # Validate required top-level fields
             top_level_fields = ['templates', 'phases', 'required_roles', 'project_structure']
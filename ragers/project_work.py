@@ -1,13 +1,14 @@
 import os
+import json
+import hashlib
 import logging
-import importlib
 from pathlib import Path
 from datetime import datetime
 import string
-from typing import Dict, Any, List, Optional
-import yaml
-from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional
+from dataclasses import dataclass, field
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
 # Add the project root to Python path
@@ -17,9 +18,20 @@ sys.path.append(project_root)
 # Import our custom ChatGPT client instead of the one from helpers
 from ragers.utils.chatgpt_client import ChatGPTClient
 from collections import defaultdict
-from helpers.safe_formatter import formatter
-from agents import AgentBlane, AgentDum, AgentWoz
+from agents.registry import get_registry
 from ragers.utils.document_manager import DocumentManager
+from ragers.utils.context_budget import ContextBudgetPlanner
+from ragers.utils.phase_scheduler import PhaseScheduler
+from ragers.utils.run_manifest import RunManifest, hash_file
+from ragers.utils.meeting_journal import MeetingJournal
+from ragers.utils.section_merge import SectionMerger
+from ragers.utils.template_cache import load_yaml, load_prompts, read_text, compile_template
+from ragers.utils.retrieval import shared_index
+from helpers.conversation_memory import RollingMemory
+from helpers.llm_cache import refresh_cache
+from helpers.deadline import DeadlineExceeded, deadline, run_in_context
+from helpers.usage import BudgetExceeded, UsageLedger, usage_scope
+from helpers.model_router import ModelRouter, model_scope, route_model
 
 @dataclass
 class Meeting:
@@ -29,40 +41,90 @@ class Meeting:
     doc_template: str
     participants: List[str]
 
+@dataclass
+class MeetingMerge:
+    """Responses waiting to be merged into a meeting's output document"""
+    policy: str = 'end_of_meeting'  # end_of_meeting, incremental or every_n
+    every: int = 1
+    pending: List[str] = field(default_factory=list)
+    document: Optional[str] = None  # last merged document, None before the first merge
+
+    def add(self, response: str) -> bool:
+        """Queue a response; True when the policy wants a merge now"""
+        self.pending.append(response)
+        if self.policy == 'incremental':
+            return True
+        if self.policy == 'every_n':
+            return len(self.pending) >= max(1, self.every)
+        return False
+
 class ProjectWork:
     """Handles project meetings and team interactions"""
     
-    def __init__(self, project_path: Path, project_type: str, goals: Optional[List[str]] = None):
+    def __init__(self, project_path: Path, project_type: str, goals: Optional[List[str]] = None, resume: bool = True):
         self.logger = logging.getLogger(__name__)
         self.project_path = project_path
         self.project_type = project_type
         self.goals = goals or []
         self.rag_data = ""
         self.charter = ""
+        self.goal_summary = ""
+        self._goal_summary_hash = None
         self.load_config()
-        self.conversation_history: List[Dict[str, Any]] = []
         self.agents: Dict[str, Any] = {}
         self.initialize_team()
+        self.conversation_history = self._create_conversation_memory()
         
         # Set up logging directory
         self.log_dir = self.project_path / "logs"
         self.log_dir.mkdir(exist_ok=True)
         
-        # Set up file handlers for different log types
-        self._setup_logging()
-        
         # Load document meeting prompt
         self._load_document_meeting_prompt()
 
         self.dm = DocumentManager(self.project_path, self.project_type)
+        self.journal = MeetingJournal(self.project_path / 'meetings')
+
+        # Local corpora, and other projects' deliverables when opted in, searched per meeting for rag_data.
+        # One index per projects directory serves every project in it.
+        self.retrieval = None
+        retrieval_config = self.config.get('retrieval') or {}
+        if retrieval_config.get('enabled', False):
+            projects_dir = self.project_path.parent
+            deliverables = [
+                path / 'deliverables' for path in sorted(projects_dir.iterdir())
+                if path.is_dir() and not path.name.startswith('.')
+            ] if retrieval_config.get('include_deliverables', False) else []
+            self.retrieval = shared_index(retrieval_config, projects_dir / '.rag_index', Path(project_root), deliverables)
+
+        # Completed phases from earlier runs, reused while their inputs are unchanged
+        self.manifest = None
+        if (self.config.get('run_manifest') or {}).get('enabled', True):
+            self.manifest = RunManifest(self.project_path)
+            if not resume:
+                self.manifest.invalidate()
+
+        # Tokens and cost per phase and agent, enforced against the mode's budget
+        self.usage = UsageLedger.from_config(self.config.get('budget'), self.log_dir / "usage.json")
+        if not resume:
+            self.usage.reset()
+
+        # A fresh run asks the model again instead of replaying cached responses
+        self.refresh_llm_cache = not resume
+
+        # Model per task, phase and role; agents are shared, so routing never changes them
+        self.router = ModelRouter.from_config(self.config.get('model_routing'), self.config.get('required_roles'))
+
+        # File handlers go on the shared module logger last: close() is only reached once __init__ succeeds
+        self._setup_logging()
         
     def _setup_logging(self):
         """Set up additional logging handlers for different log types"""
         # Main project log
         project_log = self.log_dir / "project.log"
-        project_handler = logging.FileHandler(project_log)
-        project_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(project_handler)
+        self.project_handler = logging.FileHandler(project_log)
+        self.project_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.logger.addHandler(self.project_handler)
         
         # ChatGPT interactions log
         self.chatgpt_log = self.log_dir / "chatgpt_calls.log"
@@ -74,6 +136,19 @@ class ProjectWork:
         self.docs_handler = logging.FileHandler(self.docs_log)
         self.docs_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
         
+    def close(self):
+        """Detach and close this project's log handlers and finish open transcripts.
+
+        The module logger is shared by every ProjectWork in the process, so a
+        worker running several projects must close each one before the next.
+        """
+        self.logger.removeHandler(self.project_handler)
+        for handler in (self.project_handler, self.chatgpt_handler, self.docs_handler):
+            handler.close()
+        self.journal.close()
+        self.conversation_history.close()
+        self.usage.save()
+
     def _log_goal(self, goal_content: str):
         """Log project goal"""
         with open(self.docs_log, 'a', encoding='utf-8') as f:
@@ -92,11 +167,11 @@ class ProjectWork:
             f.write(f"{charter_content}\n")
             f.write(f"\n{'='*80}\n\n")
             
-    def _log_chatgpt_interaction(self, role: str, prompt: str, response: str):
+    def _log_chatgpt_interaction(self, phase: str, role: str, prompt: str, response: str):
         """Log ChatGPT interaction with role information"""
         with open(self.chatgpt_log, 'a', encoding='utf-8') as f:
             f.write(f"\n{'='*80}\n")
-            f.write(f"MEETING: {self.current_phase.upper()}\n")
+            f.write(f"MEETING: {phase.upper()}\n")
             f.write(f"ROLE: {role}\n")
             f.write(f"{'='*80}\n\n")
             
@@ -110,7 +185,7 @@ class ProjectWork:
             f.write(f"\n{'='*80}\n\n")
             
             # Also log to project log
-            self.logger.info(f"ChatGPT interaction logged for {role} in {self.current_phase} meeting")
+            self.logger.info(f"ChatGPT interaction logged for {role} in {phase} meeting")
         
     def load_config(self):
         """Load configuration from project_type-specific YAML"""
@@ -125,8 +200,7 @@ class ProjectWork:
         module_dir = Path(__file__).parent
         config_path = module_dir / "templates" / self.project_type / f"{self.project_type}_mode.yaml"
         try:
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            self.config = load_yaml(config_path)
             self.logger.info(f"Successfully loaded {self.project_type}_mode.yaml")
         except Exception as e:
             self.logger.error(f"Failed to load {self.project_type}_mode.yaml: {e}")
@@ -135,20 +209,10 @@ class ProjectWork:
     def initialize_team(self):
         """Initialize team members based on required roles from config"""
         try:
-            for role, role_config in self.config['required_roles'].items():
-                name = role_config['name']
-                
-                # Import the corresponding agent class
-                agent_module = importlib.import_module(f"agents.agent_{name.lower()}")
-                agent_class = getattr(agent_module, f"Agent{name}")
-                
-                # Instantiate the agent with role and name
-                self.agents[name] = {
-                    'instance': agent_class(),
-                    'role': role,
-                    'name': name
-                }
-                self.logger.info(f"Initialized {name} as {role}")
+            # Classes are cached and stateless agents shared across projects by the registry
+            self.agents = get_registry().team(self.config['required_roles'])
+            for name, agent in self.agents.items():
+                self.logger.info(f"Initialized {name} as {agent['role']}")
                 
         except Exception as e:
             self.logger.error(f"Failed to initialize team: {str(e)}")
@@ -164,40 +228,173 @@ class ProjectWork:
         
     def _log_conversation(self, phase: str, role: str, content: str):
         """Log conversation entry"""
-        self.conversation_history.append({
-            "phase": phase,
-            "role": role,
-            "content": content
-        })
-        
-        # Save to meeting log file
-        meeting_log_path = os.path.join(
-            self.project_path,
-            'meetings',
-            f"{phase}.md"
+        self._stream_conversation(phase, role, [content])
+
+    def _stream_conversation(self, phase: str, role: str, chunks: Iterable[str]) -> str:
+        """Append a conversation entry to the meeting journal as it streams in, then record it"""
+        entry = self.journal.stream(phase, role, chunks)
+        self.conversation_history.append(entry)
+        return entry['content']
+
+    def get_goal_summary(self, goals: List[str]) -> str:
+        """Return the goal summary, memoized on the goals' content hash and persisted with the project"""
+        goals_hash = hashlib.sha256("\n".join(goals).encode('utf-8')).hexdigest()
+        if self._goal_summary_hash == goals_hash and self.goal_summary:
+            return self.goal_summary
+
+        summary_path = self.project_path / "goals" / "goal_summary.json"
+        try:
+            if summary_path.exists():
+                with open(summary_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                if saved.get('goals_hash') == goals_hash and saved.get('summary'):
+                    self.goal_summary, self._goal_summary_hash = saved['summary'], goals_hash
+                    self.logger.info(f"Reusing goal summary from {summary_path}")
+                    return self.goal_summary
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable goal summary {summary_path}: {str(e)}")
+
+        goal_message = [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that summarizes project goals."
+            },
+            {
+                "role": "user",
+                "content": "Summarize these goals into a concise, bulleted list:\n" + "\n".join(goals)
+            }
+        ]
+        # Any team member can summarize; prefer the Documenter
+        summarizer = next(iter(self.get_agents_by_role('Documenter').values()), None)
+        if summarizer is None:
+            summarizer = next(iter(self.agents.values()))['instance']
+        self.logger.info("Sending Goal Summary Request")
+        with usage_scope(agent=self._agent_label(summarizer), critical=False), model_scope(task='goal_summary'):
+            self.goal_summary = summarizer.get_chat_response(goal_message) or ""
+        self._goal_summary_hash = goals_hash
+        self.logger.info("Received Goal Summary")
+        if not self.goal_summary:
+            return ""
+
+        try:
+            summary_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump({'goals_hash': goals_hash, 'summary': self.goal_summary}, f, indent=2)
+        except Exception as e:
+            self.logger.warning(f"Failed to persist goal summary: {str(e)}")
+        return self.goal_summary
+
+    def _fit_context(self, agent, template: str, context: Dict[str, Any], phase: str) -> Dict[str, Any]:
+        """Trim or summarize context fields so the formatted prompt fits the agent's token budget"""
+        budget_config = self.config.get('context_budget') or {}
+        if not budget_config.get('enabled', True):
+            return context
+
+        def summarize(text: str, target_tokens: int) -> str:
+            messages = [
+                {"role": "system", "content": "You condense project documents without losing decisions, interfaces or open TODOs."},
+                {"role": "user", "content": f"Condense this document to at most {target_tokens * 3 // 4} words:\n\n{text}"}
+            ]
+            with usage_scope(critical=False), model_scope(task='summary'):
+                return agent.get_chat_response(messages)
+
+        # Budget for the model the prompt will actually be routed to
+        role = next((member['role'] for member in self.agents.values() if member['instance'] is agent), None)
+        with model_scope(role=role):
+            model = route_model(getattr(agent, 'model', 'gpt-4o'))
+        planner = ContextBudgetPlanner.from_config(budget_config, model, summarizer=summarize)
+        planned, report = planner.plan(template, context)
+        if report.cuts:
+            self.logger.warning(f"{phase}: prompt context trimmed\n{report.summary()}")
+        return planned
+
+    def _create_conversation_memory(self) -> RollingMemory:
+        """Bounded meeting history; the full transcript stays in the meeting journal"""
+        memory_config = self.config.get('conversation_memory') or {}
+        summarizer = None
+        if memory_config.get('summarize', False) and self.agents:
+            agent = next(iter(self.get_agents_by_role('Documenter').values()), None)
+            if agent is None:
+                agent = next(iter(self.agents.values()))['instance']
+
+            def summarizer(summary: str, turns: List[Dict[str, Any]]) -> str:
+                transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+                # Runs on the memory's own thread, outside any meeting's scope
+                with usage_scope(self.usage, phase='conversation_memory', agent=self._agent_label(agent),
+                                 critical=False, degraded_model=(self.config.get('budget') or {}).get('degraded_model')), \
+                        model_scope(self.router, task='summary'):
+                    return agent.get_chat_response(
+                        "Update this running summary of a project meeting series with the new turns. "
+                        "Keep decisions, owners, open questions and requirements. At most 200 words.\n\n"
+                        f"Summary so far:\n{summary or '(none)'}\n\nNew turns:\n{transcript}")
+
+        return RollingMemory(
+            max_tokens=memory_config.get('max_tokens', 8000),
+            min_recent=memory_config.get('min_recent', 5),
+            summarizer=summarizer
         )
-        
-        # Create meetings directory if it doesn't exist
-        os.makedirs(os.path.dirname(meeting_log_path), exist_ok=True)
-        
-        # Write to file, overwriting any existing content
-        with open(meeting_log_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {phase.title()} Meeting\n\n")
-            for entry in self.conversation_history:
-                if entry['phase'] == phase:
-                    f.write(f"## {entry['role']}\n\n{entry['content']}\n\n")
-            
+
+    def _get_rag_data(self, phase: str, agenda: str, goal_summary: str) -> str:
+        """Chunks of the local corpora most relevant to this meeting, or the static rag_data"""
+        if self.retrieval is None:
+            return self.rag_data
+        retrieval_config = self.config.get('retrieval') or {}
+        try:
+            self.retrieval.refresh()
+            context = self.retrieval.context(
+                f"{phase}\n{goal_summary}\n{agenda}",
+                k=retrieval_config.get('top_k', 4),
+                max_tokens=retrieval_config.get('max_tokens', 1500),
+                exclude=[self.project_path]
+            )
+        except Exception as e:
+            self.logger.warning(f"Retrieval failed for {phase}: {str(e)}")
+            return self.rag_data
+        return context or self.rag_data
+
+    def _rag_fingerprint(self) -> Any:
+        """What decides a meeting's rag_data: the retrieval corpus and settings, or the static rag_data"""
+        if self.retrieval is None:
+            return self.rag_data
+        return {'corpus': self.retrieval.version(), 'config': self.config.get('retrieval')}
+
+    def _budget_state(self) -> List[Any]:
+        """Budget level and, once degraded, the settings it applies to calls"""
+        level = self.usage.level()
+        if level == 'ok':
+            return [level]
+        budget = self.config.get('budget') or {}
+        return [level, budget.get('degraded_model'), budget.get('degraded_length')]
+
     def _format_conversation_history(self, limit: int = 5) -> str:
-        """Format recent conversation history"""
-        recent = self.conversation_history[-limit:] if self.conversation_history else []
-        return "\n".join([f"{msg['role']}: {msg['content']}" for msg in recent])
+        """Format recent conversation history, preceded by the summary of older turns if any"""
+        recent = self.conversation_history.recent(limit)
+        lines = [f"{msg['role']}: {msg['content']}" for msg in recent]
+        if self.conversation_history.summary:
+            lines.insert(0, f"Earlier discussion (summary): {self.conversation_history.summary}")
+        return "\n".join(lines)
         
 
     def run_meeting(self, phase: str) -> bool:
-        """Run a meeting for the specified phase"""
+        """Run a meeting for the specified phase within its time and token budgets"""
+        budget = self.config.get('budget') or {}
+        with deadline(self._get_phase_budget(phase), f"{phase} meeting deadline"), \
+                usage_scope(self.usage, phase=phase, degraded_model=budget.get('degraded_model')), \
+                model_scope(self.router, phase=phase), refresh_cache(self.refresh_llm_cache):
+            try:
+                return self._run_meeting(phase)
+            finally:
+                self.usage.save()
+
+    def _get_phase_budget(self, phase: str) -> Optional[float]:
+        """Seconds a meeting may take: its own deadline_seconds, else the mode's deadlines.phase_seconds"""
+        meeting_config = self.config['templates']['meetings'].get(phase, {})
+        return meeting_config.get('deadline_seconds', (self.config.get('deadlines') or {}).get('phase_seconds'))
+
+    def _run_meeting(self, phase: str) -> bool:
+        output_path, merge, start = None, None, None
         try:
             module_dir = Path(__file__).parent
-            self.current_phase = phase  # Store current phase for logging
             if phase not in self.config['templates']['meetings']:
                 raise ValueError(f"Unknown phase: {phase}")
                 
@@ -210,25 +407,24 @@ class ProjectWork:
             else:
                 self.logger.warning("No goals available for meeting")
             
-            all_meeting_responses = ""
             meeting_config = self.config['templates']['meetings'][phase]
 
             agenda_template = meeting_config.get('agenda')
             self.logger.info(f"Agenda Template: {agenda_template}")
             agenda_path = module_dir / "templates" / self.project_type / agenda_template
-            with open(agenda_path, 'r', encoding='utf-8') as f:
-                agenda = f.read()
+            agenda = read_text(agenda_path)
             #self.logger.info(f"Agenda:\n{agenda}")
 
-            # Load prompts from code_prompts.yaml TODO refactor up outside of run_meeting
-            prompts_path = module_dir / "templates" / self.project_type / "code_prompts.yaml"
-            with open(prompts_path, 'r', encoding='utf-8') as f:
-                prompts_config = yaml.safe_load(f)
+            # Parsed prompts and their static parts are cached until the file changes
+            prompts = load_prompts(self._get_prompts_path())
+            prompts_config = prompts['config']
                 
             # Get the template for this phase
-            if phase not in prompts_config['prompts']:
+            if phase not in prompts['templates']:
                 raise ValueError(f"No prompt template found for phase: {phase}")
-            template_content = prompts_config['prompts'][phase]['template']
+            template_content = prompts['templates'][phase].template
+            # Retrieval runs, and its corpus decides the phase, only where the template shows rag_data
+            uses_rag_data = 'rag_data' in prompts['templates'][phase].fields
             meeting_prompt_header = prompts_config['prompts'][phase]
             
             # Get input files for the meeting
@@ -236,127 +432,323 @@ class ProjectWork:
             files = self._get_meeting_files(phase, meeting_config)
             #self.logger.info(f"Files for {phase}: {files}")
 
-            # Get responses from each participant based on roles
-            for role in self._get_phase_participants(phase):
-                agents = self.get_agents_by_role(role)
-                for name, agent in agents.items():
-                    #self.logger.info(f"Processing {name} ({role}) in {phase} meeting")
-                    
-                    # Use stored goals
-                    if not self.goals:
-                        #self.logger.warning("No goals found in config")
-                        goals = ["No project goals specified"]
-                    else:
-                        goals = self.goals
-                        #self.logger.info(f"Using goals for {name}:")
-                        #for i, goal in enumerate(goals, 1):
-                        #    self.logger.info(f"Goal {i}: {goal}")
-                    goal_message = [
-                        {
-                            "role": "system",
-                            "content": "You are a helpful assistant that summarizes project goals."
-                        },
-                        {
-                            "role": "user",
-                            "content": "Summarize these goals into a concise, bulleted list:\n" + "\n".join(goals)
-                        }
-                    ]    
-                    self.logger.info(f"Sending Goal Summary Request to {name}")
-                    self.goal_summary = agent.get_chat_response(goal_message)
-                    self.logger.info(f"Received Goal Summary from {name}")
-                    # Create a comprehensive context for template formatting
-                    meeting_rules = prompts_config['prompts']['meeting_rules']
-                    #self.rag_data = self.charter
-                    context = {
-                        'goals': goals,
-                        'goal_summary': self.goal_summary,
-                        'history': self._format_conversation_history(),
-                        'phase': phase,
-                        'meeting_rules': meeting_rules,
-                        'opening': "\n".join(meeting_rules['structure']['opening']),
-                        'closing': "\n".join(meeting_rules['structure']['closing']),
-                        'project_type': self.project_type,
-                        'project_name': self.project_path.name,
-                        'current_date': datetime.now().strftime("%Y-%m-%d"),
-                        'input': meeting_config.get('input_files', ''),
-                        'output': meeting_config.get('output_files', ''),
-                        'length': meeting_prompt_header['length'],
-                        'agenda': agenda,
-                        'rag_data': self.rag_data
-                    }
-                    
-                    # Log the formatted context
-                    #self.logger.info("Meeting context:\n" + formatter.format_context(context))
-                    
-                    # Add input files to context
-                    #self.logger.debug(f"Context before adding input files: {context}")
-                    #self.logger.debug(f"Input files to be added: {input_files}")
-                    context.update(files)
-                    #self.logger.debug(f"Template content: {template_content}")
-                    
-                    # Replace template placeholders with correct input file keys
-                    #template_content = template_content.replace('{input_file[0]}', '{input_file_0}')
-                    #template_content = template_content.replace('{input_file[1]}', '{input_file_1}')
-                    
-                    # Format the template with the context
-                    prompt = ""
-                    safe_context = defaultdict(lambda: '[MISSING]', context)
-                    try:
-                        prompt = formatter.safe_format(template_content, safe_context)
-                    except Exception as e:
-                        self.logger.error(f"Error formatting prompt: {e}")
-                        raise
+            # Goals are summarized once per project, not once per participant
+            goals = self.goals or ["No project goals specified"]
+            goal_summary = self.get_goal_summary(goals)
+            rag_data = self._get_rag_data(phase, agenda, goal_summary) if uses_rag_data else ''
+
+            # Participants in deterministic role order
+            participants = [
+                (role, name, agent)
+                for role in self._get_phase_participants(phase)
+                for name, agent in self.get_agents_by_role(role).items()
+            ]
+
+            execution = self._get_execution_settings(phase)
 
+            # Skip the meeting when nothing that shapes it changed since the last run
+            output_file = meeting_config.get('output_files', '')
+            output_path = self._get_output_path(output_file) if output_file else None
+            # Routed models and retrieved text vary with live latency and the corpus; hash what decides them
+            input_hashes = RunManifest.fingerprint({
+                'goals': goals,
+                'agenda': agenda,
+                'input_files': files,
+                'template': template_content,
+                'meeting_rules': prompts['meeting_rules'],
+                'document_prompt': self.document_meeting_prompt,
+                'models': [getattr(agent, 'model', None) for _, _, agent in participants],
+                'routing': self.router.settings(),
+                'history': self._format_conversation_history(),
+                'rag_data': self._rag_fingerprint() if uses_rag_data else None,
+                'budget': self._budget_state(),
+                'merge_policy': [execution['merge_policy'], execution['merge_every']],
+                'output_before': hash_file(output_path) if output_path else None
+            })
+            if self.manifest and self.manifest.is_current(phase, input_hashes):
+                entry = self.manifest.restore(phase)
+                self.conversation_history.extend(entry.get('conversation', []))
+                self.journal.restore(phase, entry.get('conversation', []))
+                if entry.get('charter') is not None:
+                    self.charter = entry['charter']
+                self.logger.info(f"Skipped {phase} meeting, outputs reused from the last run")
+                return True
+
+            # Near the budget optional meetings are dropped; past it none start
+            budget = self.config.get('budget') or {}
+            if self.usage.level() != 'ok' and phase in budget.get('optional_phases', []):
+                self.logger.warning(f"Skipped optional {phase} meeting, token budget {self.usage.level()}")
+                return True
+            self.usage.check()
+
+            self.journal.begin(phase)
+            if output_path:
+                # Baseline to restore if the meeting fails part way through its merges
+                if os.path.exists(output_path):
+                    start = self.dm.checkpoint_document(output_path, label=f"{phase} start")
+                Path(f"{output_path}.partial").unlink(missing_ok=True)
+
+            # Create a comprehensive context for template formatting
+            meeting_rules = prompts['meeting_rules']
+            #self.rag_data = self.charter
+            base_context = {
+                'goals': goals,
+                'goal_summary': goal_summary,
+                'phase': phase,
+                'meeting_rules': meeting_rules,
+                'opening': prompts['opening'],
+                'closing': prompts['closing'],
+                'project_type': self.project_type,
+                'project_name': self.project_path.name,
+                'current_date': datetime.now().strftime("%Y-%m-%d"),
+                'input': meeting_config.get('input_files', ''),
+                'output': meeting_config.get('output_files', ''),
+                'length': (budget.get('degraded_length') or meeting_prompt_header['length'])
+                          if self.usage.level() != 'ok' else meeting_prompt_header['length'],
+                'agenda': agenda,
+                'rag_data': rag_data
+            }
+            # Add input files to context
+            base_context.update(files)
+
+            merge = MeetingMerge(execution['merge_policy'], execution['merge_every'])
+            responded = 0
+
+            if execution['mode'] == 'parallel' and len(participants) > 1:
+                # Every prompt sees the history as it stood before the meeting
+                history = self._format_conversation_history()
+                prompts = [
+                    self._build_participant_prompt(phase, agent, template_content, base_context, history)
+                    for role, name, agent in participants
+                ]
+                self.logger.info(f"Calling {len(participants)} participants in parallel for {phase}")
+                with ThreadPoolExecutor(max_workers=min(execution['max_workers'], len(participants))) as pool:
+                    futures = [pool.submit(run_in_context(self._as_participant(role, name, agent.get_chat_response)), prompt)
+                               for (role, name, agent), prompt in zip(participants, prompts)]
+                    responses, cancelled = [], None
+                    for future in futures:
+                        try:
+                            responses.append(future.result())
+                        except (DeadlineExceeded, BudgetExceeded) as e:
+                            responses.append(None)
+                            cancelled = cancelled or e
+                        except Exception as e:
+                            self.logger.error(f"Participant call failed in {phase}: {str(e)}")
+                            responses.append(None)
+                # Record in role order regardless of completion order; failed participants are skipped
+                for (role, name, agent), prompt, response in zip(participants, prompts, responses):
+                    if not response:
+                        self.logger.error(f"No response from {name} in {phase}, skipping")
+                        continue
+                    self.logger.info(f"Received ChatGPT Response from {name}")
+                    responded += 1
+                    self._stream_conversation(phase, f"{role}_{name}", [response])
+                    if not cancelled:
+                        self._record_participant_response(phase, f"{role}_{name}", prompt, response, agenda_template, merge)
+                if cancelled:
+                    raise cancelled
+            else:
+                for role, name, agent in participants:
+                    prompt = self._build_participant_prompt(
+                        phase, agent, template_content, base_context, self._format_conversation_history())
                     #self.logger.info(f"==-------== Prompt for {name}:\n{prompt}")
                     self.logger.info(f"Call ChatGPT for {name} in {phase}")
-                    response = agent.get_chat_response(prompt)
+                    # Stream the response straight into the meeting log
+                    try:
+                        with usage_scope(agent=f"{role}_{name}"), model_scope(role=role):
+                            response = self._stream_conversation(phase, f"{role}_{name}", agent.stream_chat_response(prompt))
+                    except (DeadlineExceeded, BudgetExceeded):
+                        raise
+                    except Exception as e:
+                        self.logger.error(f"No response from {name} in {phase}, skipping: {str(e)}")
+                        continue
+                    if not response:
+                        self.logger.error(f"No response from {name} in {phase}, skipping")
+                        continue
                     self.logger.info(f"Received ChatGPT Response from {name}")
-                    #self.logger.info(f"=========== Response from {name}:\n{response}")
-                    
-                    # Log the ChatGPT interaction
-                    self._log_chatgpt_interaction(f"{role}_{name}", prompt, response)
-                    
-                    self._log_conversation(phase, f"{role}_{name}", response)
-                    
-                    # Generate meeting document for all phases
-                    if agenda_template:
-                        # Add the response to the context for the document
-                        #context['response'] = response
-                        all_meeting_responses = all_meeting_responses + "----Next response: " + response
-                        #self.logger.info(f"Context for document generation: {context['response']}")
-                        #self.logger.info(f"Full context before document generation: {meeting_context}")
-                        self._generate_meeting_doc(phase, all_meeting_responses)
-                    else:
-                        self.logger.info(f"No agenda template found for {phase}")
+                    responded += 1
+                    self._record_participant_response(phase, f"{role}_{name}", prompt, response, agenda_template, merge)
+
+            if participants and not responded:
+                raise RuntimeError(f"No participant responded in the {phase} meeting")
+
+            # Merge whatever the policy left pending, once per meeting by default
+            if agenda_template and merge.pending:
+                self._merge_pending(phase, merge)
+
+            # The transcript is complete; make it durable before recording the phase
+            self.journal.end(phase)
+            if self.manifest:
+                charters = self.config['templates'].get('document_types', {}).get('charters', [])
+                # A budget that ran low during the meeting shaped its outputs too
+                input_hashes.update(RunManifest.fingerprint({'budget': self._budget_state()}))
+                self.manifest.record(
+                    phase,
+                    input_hashes,
+                    [path for path in (output_path, self.project_path / 'meetings' / f"{phase}.md") if path],
+                    self.journal.entries(phase),
+                    self.charter if output_file in charters else None
+                )
+            # A completed run supersedes partial results of a cancelled one
+            self._partial_path(phase).unlink(missing_ok=True)
                 
             return True
+
+        except (DeadlineExceeded, BudgetExceeded) as e:
+            self.journal.end(phase)
+            self._record_partial_meeting(phase, str(e), output_path, merge, start)
+            return False
             
         except Exception as e:
+            self.journal.end(phase)
+            self._restore_output(output_path, start)
             self.logger.error(f"Failed to run {phase} meeting: {str(e)}")
             self.logger.error(f"Exception type: {type(e).__name__}")
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             return False
             
+    def _partial_path(self, phase: str) -> Path:
+        return self.project_path / 'meetings' / f"{phase}.partial.json"
+
+    def _restore_output(self, output_path: Optional[str], start: Optional[Dict[str, Any]]) -> None:
+        """Put a failed meeting's output back as it was when the meeting started.
+
+        Merges the meeting completed before failing stay in the snapshot store;
+        an output the meeting created is removed.
+        """
+        if not output_path or not os.path.exists(output_path):
+            return
+        try:
+            if start is None:
+                os.remove(output_path)
+            elif hash_file(output_path) != start['blob']:
+                self.dm.save_document(output_path, self.dm.load_checkpoint(output_path, start['blob']))
+            else:
+                return
+            self.logger.info(f"Restored {output_path} to its state before the meeting")
+        except Exception as e:
+            self.logger.error(f"Could not restore {output_path}: {str(e)}")
+
+    def _record_partial_meeting(self, phase: str, reason: str, output_path: Optional[str],
+                                merge: Optional[MeetingMerge], start: Optional[Dict[str, Any]] = None) -> None:
+        """Keep what a cancelled meeting produced without recording the phase as complete.
+
+        The transcript so far stays in the meeting journal, interrupted
+        responses marked partial. A merge cut off while streaming is left in
+        <output>.partial and the output restored to its state at the start of
+        the meeting. The phase stays out of the run manifest, so a resumed run
+        holds it again.
+        """
+        self._restore_output(output_path, start)
+        try:
+            record = {
+                'phase': phase,
+                'reason': reason,
+                'cancelled_at': datetime.now().isoformat(),
+                'conversation': self.journal.entries(phase),
+                'unmerged_responses': list(merge.pending) if merge else []
+            }
+            with open(self._partial_path(phase), 'w', encoding='utf-8') as f:
+                json.dump(record, f, indent=2)
+            self.logger.warning(f"{phase} meeting cancelled: {reason}; partial results in {self._partial_path(phase)}")
+        except Exception as e:
+            self.logger.error(f"{phase} meeting cancelled: {reason}; could not record partial results: {str(e)}")
+
+    def _get_output_path(self, output_file: str) -> str:
+        """Project path a meeting's merged output document is written to"""
+        doc_types = self.config['templates'].get('document_types', {})
+        if output_file in doc_types.get('deliverables', []):
+            output_dir = 'deliverables'
+        elif output_file in doc_types.get('charters', []):
+            output_dir = 'charters'
+        else:
+            output_dir = 'meetings'
+        return os.path.join(self.project_path, output_dir, output_file)
+
+    def _get_execution_settings(self, phase: str) -> Dict[str, Any]:
+        """Return mode, max_workers, merge_policy and merge_every for a meeting; the meeting's own setting overrides the mode default"""
+        execution = dict(self.config.get('meeting_execution') or {})
+        meeting_config = self.config['templates']['meetings'].get(phase, {})
+        if isinstance(meeting_config.get('execution'), dict):
+            execution.update(meeting_config['execution'])
+        elif meeting_config.get('execution'):
+            execution['mode'] = meeting_config['execution']
+        return {
+            'mode': execution.get('mode', 'sequential'),
+            'max_workers': int(execution.get('max_workers', 4)),
+            'merge_policy': execution.get('merge_policy', 'end_of_meeting'),
+            'merge_every': int(execution.get('merge_every', 2))
+        }
+
+    def _build_participant_prompt(self, phase: str, agent, template_content: str,
+                                  base_context: Dict[str, Any], history: str) -> str:
+        """Format the meeting template for one participant"""
+        context = dict(base_context, history=history)
+        context = self._fit_context(agent, template_content, context, phase)
+
+        # Format the pre-split template with the context
+        try:
+            return compile_template(template_content).render(context)
+        except Exception as e:
+            self.logger.error(f"Error formatting prompt: {e}")
+            raise
+
+    def _record_participant_response(self, phase: str, role: str, prompt: str, response: str,
+                                     agenda_template: Optional[str], merge: MeetingMerge) -> None:
+        """Log a participant's response and queue it for the meeting document merge"""
+        # Log the ChatGPT interaction
+        self._log_chatgpt_interaction(phase, role, prompt, response)
+
+        # Generate meeting document for all phases
+        if not agenda_template:
+            self.logger.info(f"No agenda template found for {phase}")
+        elif merge.add(response):
+            self._merge_pending(phase, merge)
+
+    def _merge_pending(self, phase: str, merge: MeetingMerge) -> None:
+        """Merge the queued responses into the last merged document (or the output template)"""
+        responses = "".join("----Next response: " + response for response in merge.pending)
+        documenter = next(iter(self.get_agents_by_role('Documenter').values()), None)
+        with usage_scope(agent=self._agent_label(documenter)), model_scope(task='merge'):
+            merge.document = self._generate_meeting_doc(phase, responses, base_document=merge.document)
+        merge.pending.clear()
+
+    def _agent_label(self, instance) -> Optional[str]:
+        """Role_Name of a team member, as used in transcripts and the usage ledger"""
+        for name, agent in self.agents.items():
+            if agent['instance'] is instance:
+                return f"{agent['role']}_{name}"
+        return None
+
+    def _as_participant(self, role: str, name: str, fn):
+        """Wrap fn so the calls it makes are metered to and routed for the participant"""
+        def call(*args, **kwargs):
+            with usage_scope(agent=f"{role}_{name}"), model_scope(role=role):
+                return fn(*args, **kwargs)
+        return call
+
     def _get_phase_participants(self, phase: str) -> List[str]:
         """Determine meeting participants based on phase"""
         # Get participants from config
         phase_config = self.config['templates']['meetings'].get(phase, {})
         return phase_config.get('attending', [])
         
+    def _get_prompts_path(self) -> Path:
+        """Path of the project type's prompts YAML"""
+        module_dir = Path(__file__).parent
+        prompts_path = module_dir / "templates" / self.project_type / f"{self.project_type}_prompts.yaml"
+        
+        # If the file with underscore doesn't exist, try without underscore
+        if not prompts_path.exists():
+            prompts_path = module_dir / "templates" / self.project_type / f"{self.project_type}prompts.yaml"
+            self.logger.info(f"Using alternative prompts path: {prompts_path}")
+        return prompts_path
+
     def _load_document_meeting_prompt(self):
         """Load document meeting prompt from config"""
         try:
-            module_dir = Path(__file__).parent
-            prompts_path = module_dir / "templates" / self.project_type / f"{self.project_type}_prompts.yaml"
-            
-            # If the file with underscore doesn't exist, try without underscore
-            if not prompts_path.exists():
-                prompts_path = module_dir / "templates" / self.project_type / f"{self.project_type}prompts.yaml"
-                self.logger.info(f"Using alternative prompts path: {prompts_path}")
-                
-            with open(prompts_path, 'r', encoding='utf-8') as f:
-                prompts_config = yaml.safe_load(f)
+            prompts_config = load_prompts(self._get_prompts_path())['config']
                 
             self.document_meeting_prompt = prompts_config['prompts']['document_meeting']
             self.logger.info("Loaded document meeting prompt successfully")
@@ -365,8 +757,17 @@ class ProjectWork:
             self.logger.error(f"Failed to load document meeting prompt: {str(e)}")
             raise
 
-    def _generate_meeting_doc(self, phase: str, all_meeting_responses: str) -> None:
-        """Generate meeting document using template and response."""
+    def _generate_meeting_doc(self, phase: str, all_meeting_responses: str, base_document: Optional[str] = None) -> str:
+        """Generate meeting document using template and response.
+
+        Args:
+            phase: Meeting phase
+            all_meeting_responses: Responses to merge
+            base_document: Previously merged document to merge into instead of the output file
+
+        Returns:
+            The merged document
+        """
         self.logger.info(f"Generating meeting document for phase: {phase}")
         self.logger.info(f"All meeting responses: {all_meeting_responses}")
 
@@ -409,7 +810,10 @@ class ProjectWork:
 
             # Read file
             try:
-                output_document_to_merge = self.dm.load_document(file_path)
+                if base_document is not None:
+                    output_document_to_merge = base_document
+                else:
+                    output_document_to_merge = self.dm.load_document(file_path)
 
                 # with open(template_path, 'r', encoding='utf-8') as f:
                 #     template = f.read()
@@ -453,22 +857,6 @@ class ProjectWork:
                 "template": output_document_to_merge,
                 "response": all_meeting_responses
             }
-            safe_unified_context = defaultdict(lambda: '[MISSING]', unified_context)
-            try:
-                merge_prompt = self.document_meeting_prompt['user'].format_map(safe_unified_context)
-            except Exception as e:
-                self.logger.error(f"Error formatting prompt: {e}")
-                raise
-
-            self.logger.info(f"UNIFIED Prompt:\n{merge_prompt}") ######### FAILS (EMPTY)
-            
-            # Create messages for document worker
-            messages = [
-                {
-                    "role": "user",
-                    "content": merge_prompt
-                }
-            ]
 
             # Get merged content from document worker
             document_worker = self.get_agents_by_role('Documenter')
@@ -476,32 +864,54 @@ class ProjectWork:
                 raise ValueError("No document worker found")
                 
             document_worker = next(iter(document_worker.values()))
+            output_path = self._get_output_path(output_file)
+            section_config = self.config.get('section_merge') or {}
+            if section_config.get('enabled') and output_file in section_config.get('documents', []):
+                # Large deliverables are merged section by section in parallel
+                merged_content = self._merge_by_section(
+                    phase, document_worker, output_document_to_merge, all_meeting_responses, section_config)
+                self.dm.save_document(output_path, merged_content)
+            else:
+                unified_context = self._fit_context(document_worker, self.document_meeting_prompt['user'], unified_context, phase)
+                safe_unified_context = defaultdict(lambda: '[MISSING]', unified_context)
+                try:
+                    merge_prompt = self.document_meeting_prompt['user'].format_map(safe_unified_context)
+                except Exception as e:
+                    self.logger.error(f"Error formatting prompt: {e}")
+                    raise
+
+                self.logger.info(f"UNIFIED Prompt:\n{merge_prompt}") ######### FAILS (EMPTY)
+            
+                # Create messages for document worker
+                messages = [
+                    {
+                        "role": "user",
+                        "content": merge_prompt
+                    }
+                ]
             
-            # Log the messages being sent to the document worker
-            #self.logger.info("Document worker messages:")
-            #for msg in messages:
-            #    self.logger.info(f"Role: {msg['role']}")
-            #    self.logger.info(f"Content length: {len(msg['content'])}")
-            #    self.logger.info(f"Content preview: {msg['content']}")
+                # Log the messages being sent to the document worker
+                #self.logger.info("Document worker messages:")
+                #for msg in messages:
+                #    self.logger.info(f"Role: {msg['role']}")
+                #    self.logger.info(f"Content length: {len(msg['content'])}")
+                #    self.logger.info(f"Content preview: {msg['content']}")
             
-            merged_content = document_worker.get_chat_response(messages)
+                # Stream merged content from the document worker straight to the output file
+                merged_content = self.dm.stream_document(output_path, document_worker.stream_chat_response(messages),
+                                                         partial_path=f"{output_path}.partial")
             self.logger.info(f"Received Merged Content from Document Worker")
             if not merged_content:
                 raise ValueError("Failed to generate merged content")
+            try:
+                self.dm.checkpoint_document(output_path, label=phase)
+            except Exception as e:
+                self.logger.warning(f"Could not checkpoint {output_file}: {str(e)}")
             
             # Log the merged content details
             #self.logger.info(f"Merged content length: {len(merged_content)}")
             self.logger.info(f"MERGED DOCUMENT--------------------:\n {merged_content}")
             
-            #os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # with open(output_path, 'w', encoding='utf-8') as f:
-            #     f.write(merged_content)
-                # Write to output file
-            output_path = os.path.join(self.project_path, output_dir, output_file)
-            
-            self.dm.save_document(output_path, merged_content)
-            
             # Log file write details
             #self.logger.info(f"Wrote merged content to: {output_path}")
             #self.logger.info(f"File size after write: {os.path.getsize(output_path)} bytes")
@@ -512,11 +922,30 @@ class ProjectWork:
                 self.logger.info("Updated in-memory charter with merged content")
             
             self.logger.info(f"Generated {output_file} in {output_dir} directory")
+            return merged_content
                 
         except Exception as e:
             self.logger.error(f"Error generating meeting document: {str(e)}")
             raise
 
+    def _merge_by_section(self, phase: str, document_worker, document: str, responses: str,
+                          section_config: Dict[str, Any]) -> str:
+        """Merge responses into document one heading-delimited section at a time"""
+        def merge_section(section_text: str, excerpts: str) -> str:
+            context = self._fit_context(document_worker, self.document_meeting_prompt['user'],
+                                        {"template": section_text, "response": excerpts}, phase)
+            prompt = self.document_meeting_prompt['user'].format_map(defaultdict(lambda: '[MISSING]', context))
+            return document_worker.get_chat_response([{"role": "user", "content": prompt}])
+
+        merger = SectionMerger(
+            merge_section,
+            max_workers=section_config.get('max_workers', 4),
+            heading_level=section_config.get('heading_level', 2),
+            group_tokens=section_config.get('group_tokens', 1500),
+            max_excerpt_tokens=section_config.get('max_excerpt_tokens', 3000)
+        )
+        return merger.merge(document, responses)
+
     def _read_meeting_doc(self, doc_path: Path) -> Optional[str]:
         """Read a meeting document from disk"""
         try:
@@ -613,12 +1042,24 @@ class ProjectWork:
         return files
         
     def run_all_meetings(self) -> bool:
-        """Run all meetings in configured order"""
+        """Run all meetings, concurrently where their input and output files allow"""
         try:
-            for phase in self.config['phases']:
+            scheduler = PhaseScheduler.from_config(self.config)
+            self.logger.info(f"Meeting schedule: {' -> '.join('+'.join(wave) for wave in scheduler.levels())}")
+
+            def run_phase(phase: str) -> bool:
                 if not self.run_meeting(phase):
                     self.logger.error(f"Failed during {phase} phase")
                     return False
+                return True
+
+            # Phases inherit the project budget; each also gets its own
+            project_budget = (self.config.get('deadlines') or {}).get('project_seconds')
+            with deadline(project_budget, f"project {self.project_path.name} deadline"):
+                succeeded = scheduler.run(run_phase)
+            self._log_usage()
+            if not succeeded:
+                return False
                     
             self.logger.info("Successfully completed all meetings")
             return True
@@ -627,6 +1068,13 @@ class ProjectWork:
             self.logger.error(f"Failed to run all meetings: {str(e)}")
             return False
             
+    def _log_usage(self):
+        """Log the project's token usage and cost, per phase"""
+        self.logger.info(f"Token usage: {self.usage.summary()}")
+        for phase, totals in self.usage.breakdown('phase').items():
+            self.logger.info(f"  {phase}: {totals['tokens']} tokens, ${totals['cost']:.4f} in {totals['calls']} calls")
+        self.usage.save()
+
     def validate_completion(self) -> bool:
         """Validate that all completion criteria are met"""
         try:
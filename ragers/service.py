@@ -0,0 +1,413 @@
+"""Resident ragers service: a job queue over a local HTTP or Unix-socket API.
+
+Projects are submitted as goal text and run on a pool of warm worker
+processes. Each worker imports the project stack, parses the templates,
+builds the shared agents and opens the LLM client once, then serves job
+after job. Jobs for the same project name run one at a time; others run
+concurrently up to the worker count.
+
+    POST   /jobs              {"goal": "...", "type": "code", "name": "shop", "fresh": false}
+    GET    /jobs              all jobs, newest first
+    GET    /jobs/<id>         status, queue position and timings
+    GET    /jobs/<id>/result  outcome, log path and the project's charters and deliverables
+    DELETE /jobs/<id>         cancel a queued job
+    GET    /health            workers, queued and running counts
+
+Usage:
+    python -m ragers.service --port 8765 --workers 4
+    python -m ragers.service --socket /tmp/ragers.sock
+"""
+import os
+import re
+import json
+import uuid
+import socket
+import logging
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+def warm_worker() -> None:
+    """Worker initializer: load what every project needs once per process"""
+    from ragers.main import load_project_types
+    from ragers.utils.template_cache import load_prompts, load_yaml
+    from agents.registry import get_registry
+    from helpers.call_ChatGPT import CallChatGPT
+
+    load_project_types()
+    for prompts_path in TEMPLATES_DIR.glob("*/*_prompts.yaml"):
+        try:
+            load_prompts(prompts_path)
+        except Exception as e:
+            logger.debug(f"Could not preload {prompts_path}: {str(e)}")
+    # Build the shared agents every project type uses
+    for mode_path in TEMPLATES_DIR.glob("*/*_mode.yaml"):
+        try:
+            get_registry().team(load_yaml(mode_path, copy_result=False).get('required_roles') or {})
+        except Exception as e:
+            logger.debug(f"Could not preload agents for {mode_path}: {str(e)}")
+    try:
+        CallChatGPT.shared()
+    except Exception as e:  # Jobs report the error themselves; the worker must still start
+        logger.warning(f"Could not open the LLM client: {str(e)}")
+
+def _ping() -> int:
+    return os.getpid()
+
+def run_job(goal_file: str, project_type: Optional[str], resume: bool, log_dir: str, project_name: str) -> Dict:
+    """Run one submitted project in a warm worker"""
+    from ragers.main import run_goal_file
+    return run_goal_file(goal_file, project_type, resume, log_dir, project_name)
+
+
+@dataclass
+class Job:
+    """A submitted project run"""
+    id: str
+    project: str
+    project_type: Optional[str]
+    goal_file: str
+    resume: bool = True
+    status: str = 'queued'  # queued, running, succeeded, failed or cancelled
+    submitted: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('succeeded', 'failed', 'cancelled')
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('result')
+        data.pop('goal_file')
+        return data
+
+
+class JobQueue:
+    """Queues jobs and dispatches them to a warm process pool.
+
+    A dispatcher thread hands a job to the pool only when a worker is free
+    and no job for the same project is running, so a job's status is
+    'running' exactly while a worker is on it. Finished jobs are written to
+    state_dir/jobs/<id>.json and reloaded on start.
+    """
+
+    def __init__(self, state_dir: Path, workers: int = 4):
+        """
+        Args:
+            state_dir: Directory for submitted goals, job records and worker logs
+            workers: Worker processes
+        """
+        self.state_dir = Path(state_dir)
+        self.workers = workers
+        self.goals_dir = self.state_dir / "goals"
+        self.jobs_dir = self.state_dir / "jobs"
+        self.logs_dir = self.state_dir / "logs"
+        for directory in (self.goals_dir, self.jobs_dir, self.logs_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self.jobs: Dict[str, Job] = {}
+        self._queue: List[str] = []
+        self._active_projects = set()
+        self._running = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._load_finished()
+
+        # Spawned workers do not inherit the server's threads or sockets
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=warm_worker)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="ragers-dispatch", daemon=True)
+
+    def _load_finished(self) -> None:
+        for path in self.jobs_dir.glob("*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    job = Job(**json.load(f))
+                self.jobs[job.id] = job
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping job record {path}: {str(e)}")
+
+    def start(self) -> None:
+        """Start the workers and the dispatcher"""
+        # Submitting one task per worker starts and warms them all before the first job
+        warm = [self.pool.submit(_ping) for _ in range(self.workers)]
+        pids = {future.result() for future in warm}
+        logger.info(f"{len(pids)} warm workers ready")
+        self._dispatcher.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, goal: str, project_type: Optional[str] = None, name: Optional[str] = None,
+               resume: bool = True) -> Job:
+        """Queue a project run from goal text and return its job"""
+        job_id = uuid.uuid4().hex[:12]
+        project = re.sub(r'[^A-Za-z0-9_-]+', '_', name or f"job_{job_id}").strip('_') or f"job_{job_id}"
+        goal_file = self.goals_dir / f"{job_id}_{project}.goal"
+        goal_file.write_text(goal, encoding='utf-8')
+        job = Job(job_id, project, project_type, str(goal_file), resume)
+        with self._cond:
+            self.jobs[job_id] = job
+            self._queue.append(job_id)
+            self._cond.notify_all()
+        logger.info(f"Queued job {job_id} for project {project}")
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job; running jobs are left to finish"""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != 'queued':
+                return False
+            self._queue.remove(job_id)
+            job.status = 'cancelled'
+            job.finished = datetime.now().isoformat(timespec='seconds')
+        self._save(job)
+        return True
+
+    def position(self, job_id: str) -> Optional[int]:
+        with self._cond:
+            return self._queue.index(job_id) + 1 if job_id in self._queue else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._cond:
+            return {'workers': self.workers, 'queued': len(self._queue), 'running': self._running}
+
+    def _next_job(self) -> Optional[Job]:
+        for job_id in self._queue:
+            job = self.jobs[job_id]
+            if job.project not in self._active_projects:
+                self._queue.remove(job_id)
+                return job
+        return None
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while not self._stopping:
+                    if self._running < self.workers:
+                        job = self._next_job()
+                        if job:
+                            break
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                self._running += 1
+                self._active_projects.add(job.project)
+                job.status = 'running'
+                job.started = datetime.now().isoformat(timespec='seconds')
+            future = self.pool.submit(run_job, job.goal_file, job.project_type, job.resume,
+                                      str(self.logs_dir), job.project)
+            future.add_done_callback(lambda f, job=job: self._finish(job, f))
+
+    def _finish(self, job: Job, future: Future) -> None:
+        try:
+            job.result = future.result()
+            job.status = 'succeeded' if job.result.get('success') else 'failed'
+            job.error = job.result.get('error')
+        except Exception as e:  # The worker process died
+            job.status, job.error = 'failed', str(e)
+        job.finished = datetime.now().isoformat(timespec='seconds')
+        self._save(job)
+        with self._cond:
+            self._running -= 1
+            self._active_projects.discard(job.project)
+            self._cond.notify_all()
+        logger.info(f"Job {job.id} ({job.project}) {job.status}")
+
+    def _save(self, job: Job) -> None:
+        path = self.jobs_dir / f"{job.id}.json"
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(asdict(job), f, indent=2)
+        os.replace(tmp, path)
+
+    def result(self, job: Job) -> Dict[str, Any]:
+        """A finished job's outcome with its charters and deliverables"""
+        data = dict(job.result or {}, status=job.status, error=job.error)
+        documents = {}
+        project_path = (job.result or {}).get('project_path')
+        if project_path:
+            for folder in ('charters', 'deliverables'):
+                for path in sorted((Path(project_path) / folder).glob('*.md')):
+                    documents[f"{folder}/{path.name}"] = path.read_text(encoding='utf-8', errors='replace')
+        data['documents'] = documents
+        return data
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API over the server's JobQueue"""
+
+    server_version = "RagersService/1.0"
+
+    @property
+    def queue(self) -> JobQueue:
+        return self.server.queue
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def address_string(self) -> str:
+        # Unix-socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.queue.jobs.get(job_id)
+        if job is None:
+            self._send(404, {"error": f"no job {job_id}"})
+        return job
+
+    def do_GET(self) -> None:
+        parts = [p for p in self.path.split('?')[0].split('/') if p]
+        if parts == ['health']:
+            self._send(200, dict(self.queue.counts(), status='ok'))
+        elif parts == ['jobs']:
+            jobs = sorted(self.queue.jobs.values(), key=lambda j: j.submitted, reverse=True)
+            self._send(200, [job.summary() for job in jobs])
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job:
+                self._send(200, dict(job.summary(), position=self.queue.position(job.id)))
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            job = self._job(parts[1])
+            if job and not job.done:
+                self._send(409, {"error": f"job {job.id} is {job.status}"})
+            elif job:
+                self._send(200, self.queue.result(job))
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip('/') != '/jobs':
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {"error": "body must be JSON"})
+            return
+        goal = body.get('goal')
+        if not isinstance(goal, str) or not goal.strip():
+            self._send(400, {"error": "'goal' text is required"})
+            return
+        job = self.queue.submit(goal, body.get('type'), body.get('name'), resume=not body.get('fresh', False))
+        self._send(202, dict(job.summary(), position=self.queue.position(job.id)))
+
+    def do_DELETE(self) -> None:
+        parts = [p for p in self.path.split('/') if p]
+        if len(parts) != 2 or parts[0] != 'jobs':
+            self._send(404, {"error": "not found"})
+            return
+        job = self._job(parts[1])
+        if job and self.queue.cancel(job.id):
+            self._send(200, job.summary())
+        elif job:
+            self._send(409, {"error": f"job {job.id} is {job.status}"})
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+class RagersService:
+    """HTTP (TCP or Unix socket) front end over a warm JobQueue"""
+
+    def __init__(self, state_dir: Path, workers: int = 4, host: str = "127.0.0.1", port: int = 8765,
+                 socket_path: Optional[str] = None):
+        self.queue = JobQueue(state_dir, workers)
+        if socket_path:
+            self.httpd = ThreadingUnixHTTPServer(socket_path, ServiceHandler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), ServiceHandler)
+            self.httpd.daemon_threads = True
+        self.httpd.queue = self.queue
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        if self.httpd.socket.family == getattr(socket, 'AF_UNIX', None):
+            return f"unix:{self.httpd.server_address}"
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RagersService":
+        """Warm the workers and serve in a background thread"""
+        self.queue.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.queue.start()
+        logger.info(f"Ragers service listening on {self.address}")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down")
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.httpd.shutdown()
+        self.httpd.server_close()
+        if isinstance(self.httpd, ThreadingUnixHTTPServer) and os.path.exists(self.httpd.server_address):
+            os.unlink(self.httpd.server_address)
+        self.queue.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the ragers job service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help='Serve on this Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('RAGERS_WORKERS', '4')),
+                        help='Warm worker processes (default: 4 or RAGERS_WORKERS)')
+    parser.add_argument('--state-dir', default=os.path.join('logs', 'service'),
+                        help='Submitted goals, job records and per-project logs')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    RagersService(Path(args.state_dir), args.workers, args.host, args.port, args.socket).serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import os
+import json
+import logging
+import tempfile
+import unittest
+import importlib
+import multiprocessing
+from pathlib import Path
+from unittest import mock
+from ragers.main import ProjectMain, run_goal_file
+
+def fake_run_project(self, project_name, project_type, project_types, goals_file=None, resume=True):
+    """Stands in for a project run: logs a line and fails for goals asking it to"""
+    logging.getLogger('ragers.project_work').info(f"working on {project_name}")
+    if 'fail' in Path(goals_file).read_text():
+        raise RuntimeError(f"{project_name} broke")
+    return True
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "workers must inherit the patched run_project")
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        # run_batch, and importing ragers.cli, write under ./logs
+        os.chdir(self.tmp.name)
+        self.goals = []
+        for name, text in [('alpha', 'Build a parser'), ('beta', 'fail on purpose')]:
+            goal = Path(self.tmp.name) / f"{name}.md"
+            goal.write_text(text)
+            self.goals.append(goal)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_two_projects_on_a_pool(self):
+        cli = importlib.import_module('ragers.cli')
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        with mock.patch.object(ProjectMain, 'run_project', fake_run_project):
+            results = cli.run_batch(self.goals, 'code', resume=True, workers=2)
+        self.assertEqual(root.handlers, handlers)
+
+        self.assertEqual(sorted(r['project'] for r in results), ['alpha', 'beta'])
+        batch_dir, = (Path(self.tmp.name) / 'logs').glob('batch_*')
+        summary = json.loads((batch_dir / 'summary.json').read_text())
+        self.assertEqual((summary['projects'], summary['succeeded'], summary['failed']), (2, 1, ['beta']))
+        self.assertEqual([r['project'] for r in summary['results']], ['alpha', 'beta'])
+        self.assertEqual(summary['results'][1]['error'], 'beta broke')
+        self.assertNotEqual(summary['results'][0]['pid'], os.getpid())
+
+        # Each project's records land in its own log only
+        alpha, beta = (batch_dir / 'alpha.log').read_text(), (batch_dir / 'beta.log').read_text()
+        self.assertIn('working on alpha', alpha)
+        self.assertNotIn('working on beta', alpha)
+        self.assertIn('working on beta', beta)
+        self.assertNotIn('working on alpha', beta)
+
+    def test_run_goal_file_leaves_no_root_handlers(self):
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        inherited = logging.StreamHandler()
+        root.handlers = [inherited]
+        try:
+            with mock.patch.object(ProjectMain, 'run_project', fake_run_project):
+                result = run_goal_file(str(self.goals[0]), 'code', True, self.tmp.name)
+            self.assertEqual(root.handlers, [])
+        finally:
+            root.handlers, root.level = handlers, level
+        self.assertTrue(result['success'])
+        self.assertIn('working on alpha', Path(result['log']).read_text())
+
+if __name__ == '__main__':
+    unittest.main()
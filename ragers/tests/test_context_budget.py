@@ -0,0 +1,44 @@
+import unittest
+from ragers.utils.context_budget import ContextBudgetPlanner, context_limit_for
+
+TEMPLATE = "## Goals\n{goal_summary}\n## History\n{history}\n## Input\n{input_files}\n"
+
+class TestContextBudgetPlanner(unittest.TestCase):
+    def setUp(self):
+        self.context = {
+            "goal_summary": "- ship it",
+            "history": "old " * 2000 + "latest decision",
+            "input_files": "charter " * 3000,
+            "unused": "x" * 100000,
+        }
+
+    def test_model_limits(self):
+        self.assertEqual(context_limit_for("gpt-4o-2024-08-06"), 128000)
+        self.assertEqual(context_limit_for("gpt-4"), 8192)
+
+    def test_small_prompt_is_untouched(self):
+        planner = ContextBudgetPlanner("gpt-4o")
+        planned, report = planner.plan(TEMPLATE, self.context)
+        self.assertEqual(planned, self.context)
+        self.assertEqual(report.cuts, [])
+
+    def test_lowest_priority_fields_are_cut_first(self):
+        planner = ContextBudgetPlanner("gpt-4o", max_prompt_tokens=7000, min_field_tokens=100)
+        planned, report = planner.plan(TEMPLATE, self.context)
+        self.assertLessEqual(report.tokens_after, 7000)
+        self.assertEqual(planned["goal_summary"], "- ship it")
+        self.assertEqual([cut.field for cut in report.cuts], ["history"])
+        self.assertTrue(planned["history"].endswith("latest decision"))
+        self.assertEqual(planned["input_files"], self.context["input_files"])
+
+    def test_summarizer_is_used_for_summarize_fields(self):
+        planner = ContextBudgetPlanner("gpt-4o", max_prompt_tokens=500, min_field_tokens=100,
+                                       strategies={"input_files": "summarize"},
+                                       summarizer=lambda text, tokens: "charter summary")
+        planned, report = planner.plan(TEMPLATE, self.context)
+        self.assertEqual(planned["input_files"], "charter summary")
+        self.assertIn("summarized", [cut.action for cut in report.cuts])
+        self.assertFalse(report.over_budget)
+
+if __name__ == '__main__':
+    unittest.main()
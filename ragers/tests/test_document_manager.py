@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+import httpx
+from pathlib import Path
+from unittest import mock
+from agents.base_agent import AgentType, BaseAgent
+from helpers.call_ChatGPT import CallChatGPT
+from helpers.llm_pool import get_openai_client
+from helpers.mock_openai_server import MockOpenAIServer, MockSettings
+from ragers.utils.document_manager import DocumentManager
+
+class TestStreamDocument(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DocumentManager(self.tmp.name, 'code')
+        self.doc = Path(self.tmp.name) / "charter.md"
+        self.doc.write_text("# Charter\nagreed scope\n")
+        self.partial = Path(f"{self.doc}.partial")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_completed_stream_replaces_the_document(self):
+        self.assertEqual(self.dm.stream_document(self.doc, iter(["# Charter\n", "new scope\n"])), "# Charter\nnew scope\n")
+        self.assertEqual(self.doc.read_text(), "# Charter\nnew scope\n")
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.doc])
+
+    def test_failed_stream_leaves_the_document_and_keeps_the_partial_text(self):
+        def chunks():
+            yield "# Charter\npart"
+            raise ConnectionResetError("stream reset")
+
+        with self.assertRaises(ConnectionResetError):
+            self.dm.stream_document(self.doc, chunks(), partial_path=self.partial)
+        self.assertEqual(self.doc.read_text(), "# Charter\nagreed scope\n")
+        self.assertEqual(self.partial.read_text(), "# Charter\npart")
+
+    def test_failure_before_the_first_chunk_or_an_empty_stream_changes_nothing(self):
+        def chunks():
+            raise TimeoutError("no response")
+            yield
+
+        with self.assertRaises(TimeoutError):
+            self.dm.stream_document(self.doc, chunks(), partial_path=self.partial)
+        self.assertEqual(self.dm.stream_document(self.doc, iter([])), "")
+        self.assertEqual(self.doc.read_text(), "# Charter\nagreed scope\n")
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.doc])
+
+
+class TestStreamedResponseOverSSE(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dm = DocumentManager(self.tmp.name, 'code')
+        self.doc = Path(self.tmp.name) / "charter.md"
+        self.doc.write_text("# Charter\nagreed scope\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _stream(self, server):
+        chat = CallChatGPT.__new__(CallChatGPT)
+        chat.client = get_openai_client("test-key", server.url)
+        agent = BaseAgent(AgentType.TEXT)
+        messages = [{"role": "user", "content": "Merge the charter"}]
+        with mock.patch.object(CallChatGPT, "_shared", chat), mock.patch("helpers.call_ChatGPT.get_cache", return_value=None):
+            return self.dm.stream_document(self.doc, agent.stream_chat_response(messages),
+                                           partial_path=f"{self.doc}.partial")
+
+    def test_connection_reset_mid_stream_raises_from_the_agent(self):
+        with MockOpenAIServer(settings=MockSettings(latency=0, drop_after=1)) as server:
+            with self.assertRaises(httpx.RemoteProtocolError):
+                self._stream(server)
+        self.assertEqual(self.doc.read_text(), "# Charter\nagreed scope\n")
+        self.assertEqual(Path(f"{self.doc}.partial").read_text(), "##")
+
+    def test_complete_stream_is_written(self):
+        with MockOpenAIServer(settings=MockSettings(latency=0)) as server:
+            content = self._stream(server)
+        self.assertTrue(content)
+        self.assertEqual(self.doc.read_text(), content)
+
+if __name__ == '__main__':
+    unittest.main()
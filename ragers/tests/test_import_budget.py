@@ -0,0 +1,50 @@
+import os
+import sys
+import subprocess
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Heavy backends a text-only planning run must never load
+BLOCKED = ["torch", "numpy", "sounddevice", "soundfile", "transformers", "faster_whisper", "vosk", "whisper"]
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "5"))
+
+SCRIPT = """
+import sys, time
+BLOCKED = set({blocked!r})
+
+# Record attempts too: modules with an optional-import fallback would swallow the ImportError
+attempted = []
+
+class BlockHeavyImports:
+    def find_spec(self, name, path=None, target=None):
+        if name.split('.')[0] in BLOCKED:
+            attempted.append(name)
+            raise ImportError(name + ' imported during start-up')
+
+sys.meta_path.insert(0, BlockHeavyImports())
+start = time.perf_counter()
+import ragers.project_work
+from agents import AgentBlane, AgentDum, AgentWoz
+from agents.agent_toby import AgentToby
+from helpers.call_ChatGPT import CallChatGPT
+elapsed = time.perf_counter() - start
+from ragers.utils.retrieval import RetrievalIndex
+RetrievalIndex.from_config({{'dense': False}}, '.rag_index_unused', '.')
+assert not attempted, attempted
+print(elapsed)
+"""
+
+class TestImportBudget(unittest.TestCase):
+    def test_project_work_imports_without_heavy_backends(self):
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(blocked=BLOCKED)],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        self.assertLess(elapsed, IMPORT_BUDGET_SECONDS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+from ragers.utils.meeting_journal import MeetingJournal
+
+class TestMeetingJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal = MeetingJournal(Path(self.tmp.name) / "meetings")
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def test_entries_are_appended_and_indexed_per_phase(self):
+        self.journal.begin("design")
+        self.journal.begin("review")
+        self.journal.stream("design", "Worker_Woz", ["mod", "ules"])
+        self.journal.append("review", "Supervisor_Blane", "approved")
+        self.journal.append("design", "Manager_Dum", "agreed")
+        self.journal.end("design")
+
+        self.assertEqual([e["content"] for e in self.journal.entries("design")], ["modules", "agreed"])
+        self.assertEqual(self.journal.path("design").read_text(),
+                         "# Design Meeting\n\n## Worker_Woz\n\nmodules\n\n## Manager_Dum\n\nagreed\n\n")
+
+    def test_begin_starts_a_fresh_transcript(self):
+        self.journal.begin("design")
+        self.journal.append("design", "Worker_Woz", "first run")
+        self.journal.end("design")
+        self.journal.begin("design")
+        self.journal.append("design", "Worker_Woz", "second run")
+        self.journal.end("design")
+
+        self.assertNotIn("first run", self.journal.path("design").read_text())
+        self.assertEqual(len(self.journal.entries("design")), 1)
+
+    def test_interrupted_stream_is_kept_as_partial(self):
+        def chunks():
+            yield "half an "
+            raise TimeoutError("deadline")
+
+        self.journal.begin("design")
+        with self.assertRaises(TimeoutError):
+            self.journal.stream("design", "Worker_Woz", chunks())
+        self.journal.end("design")
+
+        self.assertEqual(self.journal.entries("design"),
+                         [{"phase": "design", "role": "Worker_Woz", "content": "half an ", "partial": True}])
+        self.assertIn("half an \n\n_[interrupted]_", self.journal.path("design").read_text())
+
+if __name__ == '__main__':
+    unittest.main()
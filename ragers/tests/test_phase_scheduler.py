@@ -0,0 +1,70 @@
+import time
+import threading
+import unittest
+from ragers.utils.phase_scheduler import PhaseScheduler
+
+def meeting(inputs, outputs):
+    return {'input_files': inputs, 'output_files': outputs}
+
+class TestPhaseScheduler(unittest.TestCase):
+    def setUp(self):
+        # Two independent document streams joined by a final merge
+        self.phases = {name: {'order': i} for i, name in enumerate(['api', 'ui', 'api_review', 'ui_review', 'merge'])}
+        self.meetings = {
+            'api': meeting('goals.md', 'api.md'),
+            'ui': meeting('goals.md', 'ui.md'),
+            'api_review': meeting('api.md', 'api.md'),
+            'ui_review': meeting('ui.md', 'ui.md'),
+            'merge': meeting('api.md, ui.md', 'design.md'),
+        }
+
+    def test_dependencies_follow_declared_files(self):
+        scheduler = PhaseScheduler(self.phases, self.meetings)
+        deps = scheduler.dependencies()
+        self.assertEqual(deps['ui'], set())
+        self.assertEqual(deps['api_review'], {'api'})
+        self.assertEqual(deps['merge'], {'api', 'ui', 'api_review', 'ui_review'})
+        self.assertEqual(scheduler.levels(), [['api', 'ui'], ['api_review', 'ui_review'], ['merge']])
+
+    def test_automate_style_input_output_keys(self):
+        meetings = {name: {'input': m['input_files'], 'output': m['output_files']} for name, m in self.meetings.items()}
+        scheduler = PhaseScheduler(self.phases, meetings)
+        self.assertEqual(scheduler.levels(), [['api', 'ui'], ['api_review', 'ui_review'], ['merge']])
+
+    def test_write_after_read_is_serialized(self):
+        meetings = {'read': meeting('charter.md', 'notes.md'), 'rewrite': meeting('goals.md', 'charter.md')}
+        scheduler = PhaseScheduler({'read': {}, 'rewrite': {}}, meetings)
+        self.assertEqual(scheduler.dependencies()['rewrite'], {'read'})
+
+    def test_phases_without_files_stay_sequential(self):
+        scheduler = PhaseScheduler({'a': {}, 'b': {}, 'c': {}}, {})
+        self.assertEqual(scheduler.levels(), [['a'], ['b'], ['c']])
+
+    def test_run_respects_dependencies_and_limit(self):
+        scheduler = PhaseScheduler(self.phases, self.meetings, max_parallel=2)
+        finished, active, peak = [], [0], [0]
+        lock = threading.Lock()
+
+        def run_phase(name):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+                finished.append(name)
+            return True
+
+        self.assertTrue(scheduler.run(run_phase))
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(finished[-1], 'merge')
+        self.assertLess(finished.index('api'), finished.index('api_review'))
+
+    def test_failure_stops_dependents(self):
+        scheduler = PhaseScheduler(self.phases, self.meetings, max_parallel=1)
+        ran = []
+        self.assertFalse(scheduler.run(lambda name: ran.append(name) or name != 'api'))
+        self.assertEqual(ran, ['api'])
+
+if __name__ == '__main__':
+    unittest.main()
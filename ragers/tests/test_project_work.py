@@ -0,0 +1,198 @@
+import time
+import logging
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+from helpers.deadline import DeadlineExceeded
+from ragers.project_work import MeetingMerge, ProjectWork
+
+class StubAgent:
+    """Answers every prompt with a fixed reply and counts the calls"""
+    model = "gpt-4o"
+
+    def __init__(self, reply: str = "stub reply", delay: float = 0.0, error: Exception = None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def get_chat_response(self, text_or_messages, messages=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        self.finished = time.monotonic()
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+    def stream_chat_response(self, text_or_messages, messages=None):
+        yield self.get_chat_response(text_or_messages, messages)
+
+
+class ProjectWorkTestCase(unittest.TestCase):
+    """A code project in a temporary folder"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.project = Path(self.tmp.name) / "project"
+        for folder in ('goals', 'charters', 'meetings', 'deliverables'):
+            (self.project / folder).mkdir(parents=True)
+        self.logger = logging.getLogger('ragers.project_work')
+        self.handlers = list(self.logger.handlers)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_work(self, goals=('Build a parser',), **agents) -> ProjectWork:
+        """A ProjectWork whose team members (by name) are replaced with stubs"""
+        work = ProjectWork(self.project, 'code', list(goals))
+        self.addCleanup(work.close)
+        for name, member in work.agents.items():
+            member['instance'] = agents.get(name) or StubAgent(f"{name} reply")
+        return work
+
+
+class TestProjectWorkLogging(ProjectWorkTestCase):
+    def test_close_detaches_the_project_log(self):
+        work = ProjectWork(self.project, 'code', ['Build a parser'])
+        self.assertEqual(len(self.logger.handlers), len(self.handlers) + 1)
+        work.close()
+        self.assertEqual(self.logger.handlers, self.handlers)
+
+    def test_failed_construction_leaves_no_handlers(self):
+        with mock.patch('ragers.project_work.UsageLedger.from_config', side_effect=OSError("ledger unreadable")):
+            with self.assertRaises(OSError):
+                ProjectWork(self.project, 'code', ['Build a parser'])
+        self.assertEqual(self.logger.handlers, self.handlers)
+
+
+class TestGoalSummary(ProjectWorkTestCase):
+    def test_summarized_once_per_project(self):
+        toby = StubAgent("- parse things")
+        work = self.make_work(Toby=toby)
+        self.assertEqual(work.get_goal_summary(work.goals), "- parse things")
+        self.assertEqual(work.get_goal_summary(work.goals), "- parse things")
+        self.assertEqual(toby.calls, 1)
+
+        # A later run of the same project reads the saved summary
+        rerun = StubAgent("- never asked")
+        work = self.make_work(Toby=rerun)
+        self.assertEqual(work.get_goal_summary(work.goals), "- parse things")
+        self.assertEqual(rerun.calls, 0)
+
+    def test_changed_goals_are_summarized_again(self):
+        toby = StubAgent("- summary")
+        work = self.make_work(Toby=toby)
+        work.get_goal_summary(['Build a parser'])
+        work.get_goal_summary(['Build a parser', 'Add a linter'])
+        self.assertEqual(toby.calls, 2)
+        work = self.make_work(goals=['Build a parser'], Toby=toby)
+        work.get_goal_summary(work.goals)
+        self.assertEqual(toby.calls, 3)
+
+
+class TestParallelMeeting(ProjectWorkTestCase):
+    """Kickoff is attended by Supervisor Blane, Manager Dum and Worker Woz, in that order"""
+
+    def make_parallel_work(self, **agents) -> ProjectWork:
+        work = self.make_work(**agents)
+        work.dm.initialize_project_docs()
+        work.config['meeting_execution'] = dict(work.config['meeting_execution'], mode='parallel')
+        return work
+
+    def roles(self, work):
+        return [entry['role'] for entry in work.journal.entries('kickoff')]
+
+    def test_responses_are_recorded_in_role_order(self):
+        # Woz answers first and Blane last
+        blane, dum, woz = StubAgent("Blane reply", 0.3), StubAgent("Dum reply", 0.15), StubAgent("Woz reply")
+        work = self.make_parallel_work(Blane=blane, Dum=dum, Woz=woz)
+        self.assertTrue(work.run_meeting('kickoff'))
+        self.assertLess(woz.finished, dum.finished)
+        self.assertLess(dum.finished, blane.finished)
+        self.assertEqual(self.roles(work), ['Supervisor_Blane', 'Manager_Dum', 'Worker_Woz'])
+        self.assertEqual([entry['content'] for entry in work.journal.entries('kickoff')],
+                         ['Blane reply', 'Dum reply', 'Woz reply'])
+        self.assertIn('kickoff', work.manifest.phases)
+
+    def test_failed_participant_is_skipped(self):
+        work = self.make_parallel_work(Dum=StubAgent(error=RuntimeError("connection reset")))
+        self.assertTrue(work.run_meeting('kickoff'))
+        self.assertEqual(self.roles(work), ['Supervisor_Blane', 'Worker_Woz'])
+        self.assertIn('kickoff', work.manifest.phases)
+
+    def test_deadline_cancels_the_meeting(self):
+        toby = StubAgent("# Charter")
+        work = self.make_parallel_work(Dum=StubAgent(error=DeadlineExceeded("kickoff meeting deadline")), Toby=toby)
+        charter = work.project_path / 'charters' / 'code_project_charter.md'
+        before = charter.read_text()
+        self.assertFalse(work.run_meeting('kickoff'))
+        # Answers that arrived stay in the transcript, but nothing is merged or recorded as done
+        self.assertEqual(self.roles(work), ['Supervisor_Blane', 'Worker_Woz'])
+        self.assertEqual(toby.calls, 1)  # the goal summary; no merge
+        self.assertEqual(charter.read_text(), before)
+        self.assertNotIn('kickoff', work.manifest.phases)
+
+
+class TestMeetingMerge(unittest.TestCase):
+    def add_all(self, merge, responses):
+        """add() each response, clearing pending as the caller does after a merge; returns the merge points"""
+        merged_at = []
+        for i, response in enumerate(responses, 1):
+            if merge.add(response):
+                merged_at.append(i)
+                merge.pending.clear()
+        return merged_at
+
+    def test_end_of_meeting_leaves_everything_for_the_flush(self):
+        merge = MeetingMerge()
+        self.assertEqual(self.add_all(merge, ['a', 'b', 'c']), [])
+        self.assertEqual(merge.pending, ['a', 'b', 'c'])
+
+    def test_incremental_merges_every_response(self):
+        merge = MeetingMerge('incremental')
+        self.assertEqual(self.add_all(merge, ['a', 'b', 'c']), [1, 2, 3])
+        self.assertEqual(merge.pending, [])
+
+    def test_every_n_merges_in_batches_and_leaves_the_rest(self):
+        merge = MeetingMerge('every_n', every=2)
+        self.assertEqual(self.add_all(merge, ['a', 'b', 'c', 'd', 'e']), [2, 4])
+        self.assertEqual(merge.pending, ['e'])
+
+    def test_every_n_below_one_merges_every_response(self):
+        merge = MeetingMerge('every_n', every=0)
+        self.assertEqual(self.add_all(merge, ['a', 'b']), [1, 2])
+
+
+class TestMeetingMergePolicy(ProjectWorkTestCase):
+    def merged_batches(self, policy, every=2):
+        """Responses per merge call in a sequential kickoff of three participants"""
+        work = self.make_work()
+        work.dm.initialize_project_docs()
+        work.config['meeting_execution'] = dict(work.config['meeting_execution'], merge_policy=policy, merge_every=every)
+        batches = []
+        merge_pending = work._merge_pending
+
+        def record(phase, merge):
+            batches.append(list(merge.pending))
+            merge_pending(phase, merge)
+
+        with mock.patch.object(work, '_merge_pending', side_effect=record):
+            self.assertTrue(work.run_meeting('kickoff'))
+        return batches
+
+    def test_end_of_meeting_merges_once(self):
+        self.assertEqual(self.merged_batches('end_of_meeting'), [['Blane reply', 'Dum reply', 'Woz reply']])
+
+    def test_incremental_merges_each_response(self):
+        self.assertEqual(self.merged_batches('incremental'), [['Blane reply'], ['Dum reply'], ['Woz reply']])
+
+    def test_every_n_flushes_the_remainder_at_the_end(self):
+        self.assertEqual(self.merged_batches('every_n'), [['Blane reply', 'Dum reply'], ['Woz reply']])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+from helpers.usage import BudgetExceeded, UsageLedger, usage_scope
+from ragers.utils.retrieval import RetrievalIndex, chunk_text, openai_embedder, shared_index
+
+class TestRetrievalIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.docs = root / "docs"
+        self.docs.mkdir()
+        (self.docs / "agents.md").write_text("Agent frameworks coordinate planners and workers.\n\nTool calling lets agents act.")
+        (self.docs / "music.txt").write_text("Jazz chords use extended harmony and swing rhythm.")
+        self.index_dir = root / ".rag_index"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_search_ranks_relevant_chunks(self):
+        index = RetrievalIndex(self.index_dir, [self.docs])
+        self.assertEqual(index.refresh(), 2)
+        hits = index.search("which agent frameworks support tool calling", k=2)
+        self.assertEqual(hits[0].source, "agents.md")
+        self.assertTrue(all(hit.source != "music.txt" for hit in hits))
+        self.assertIn("[agents.md]", index.context("agent frameworks"))
+
+    def test_version_follows_content_not_mtimes(self):
+        index = RetrievalIndex(self.index_dir, [self.docs])
+        index.refresh()
+        version = index.version()
+        music = self.docs / "music.txt"
+        os.utime(music, ns=(music.stat().st_atime_ns, music.stat().st_mtime_ns + 10**9))
+        index.refresh()
+        self.assertEqual(index.version(), version)
+        music.write_text("Baroque counterpoint and fugues.")
+        os.utime(music, ns=(music.stat().st_atime_ns, music.stat().st_mtime_ns + 2 * 10**9))
+        index.refresh()
+        self.assertNotEqual(index.version(), version)
+
+    def test_index_persists_and_reindexes_changed_files_only(self):
+        RetrievalIndex(self.index_dir, [self.docs]).refresh()
+        reloaded = RetrievalIndex(self.index_dir, [self.docs])
+        self.assertEqual(reloaded.refresh(), 0)
+        self.assertTrue(reloaded.search("jazz harmony"))
+
+        music = self.docs / "music.txt"
+        music.write_text("Baroque counterpoint and fugues.")
+        os.utime(music, ns=(music.stat().st_atime_ns, music.stat().st_mtime_ns + 10**9))
+        self.assertEqual(reloaded.refresh(), 1)
+        self.assertFalse(reloaded.search("jazz harmony"))
+        self.assertTrue(reloaded.search("counterpoint fugues"))
+
+    def test_search_leaves_out_excluded_folders(self):
+        own = Path(self.tmp.name) / "project_a" / "deliverables"
+        own.mkdir(parents=True)
+        (own / "design.md").write_text("Agent frameworks chosen for this project: planners and workers.")
+        index = RetrievalIndex(self.index_dir, [self.docs, own])
+        index.refresh()
+        self.assertIn("design.md", [hit.source for hit in index.search("agent frameworks planners workers")])
+        hits = index.search("agent frameworks planners workers", exclude=[own.parent])
+        self.assertEqual([hit.source for hit in hits], ["agents.md"])
+
+    def test_shared_index_is_built_once_per_folder(self):
+        other = Path(self.tmp.name) / "project_b" / "deliverables"
+        other.mkdir(parents=True)
+        (other / "notes.md").write_text("Swing rhythm notes from project b.")
+        first = shared_index({'sources': ['docs']}, self.index_dir, Path(self.tmp.name))
+        second = shared_index({'sources': ['docs']}, self.index_dir, Path(self.tmp.name), [other])
+        self.assertIs(first, second)
+        self.assertEqual(first.refresh(), 3)
+        self.assertEqual(first.refresh(), 0)
+        self.assertIn("notes.md", [hit.source for hit in first.search("swing rhythm")])
+
+    def test_chunks_respect_size(self):
+        text = "\n\n".join(f"paragraph {i} " + "word " * 50 for i in range(20))
+        chunks = chunk_text(text, chunk_tokens=100)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 400 for chunk in chunks))
+
+
+class TestOpenAIEmbedder(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def create(**kwargs):
+            self.calls.append(kwargs)
+            data = [SimpleNamespace(embedding=[1.0, 0.0]) for _ in kwargs['input']]
+            parsed = SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=12))
+            return SimpleNamespace(headers={}, parse=lambda: parsed)
+
+        client = SimpleNamespace(embeddings=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))
+        patcher = mock.patch("ragers.utils.retrieval.get_openai_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_embeddings_use_the_pooled_client_and_are_metered(self):
+        ledger = UsageLedger()
+        with usage_scope(ledger, phase='design'):
+            vectors = openai_embedder()(["agents", "jazz"])
+        self.assertEqual(vectors, [[1.0, 0.0], [1.0, 0.0]])
+        self.assertEqual(self.calls[0]['model'], 'text-embedding-3-small')
+        totals = ledger.totals(phase='design')
+        self.assertEqual((totals['prompt_tokens'], totals['calls']), (12, 1))
+
+    def test_spent_budget_stops_embedding(self):
+        ledger = UsageLedger(max_tokens=10)
+        ledger.record('gpt-4o', 10, 0)
+        with usage_scope(ledger), self.assertRaises(BudgetExceeded):
+            openai_embedder()(["agents"])
+        self.assertEqual(self.calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import tempfile
+import unittest
+from pathlib import Path
+from ragers.utils.run_manifest import RunManifest
+
+class TestRunManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.project = Path(self.tmp.name)
+        self.output = self.project / "charters" / "charter.md"
+        self.output.parent.mkdir()
+        self.inputs = RunManifest.fingerprint({"goals": ["ship it"], "agenda": "# Kickoff"})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged_phase_is_restored(self):
+        self.output.write_text("merged charter")
+        manifest = RunManifest(self.project)
+        manifest.record("kickoff", self.inputs, [self.output], [{"phase": "kickoff", "role": "r", "content": "hi"}], "merged charter")
+
+        # A later phase or a fresh project init overwrites the artifact
+        self.output.write_text("template")
+        reloaded = RunManifest(self.project)
+        self.assertTrue(reloaded.is_current("kickoff", self.inputs))
+        entry = reloaded.restore("kickoff")
+        self.assertEqual(self.output.read_text(), "merged charter")
+        self.assertEqual(entry["conversation"][0]["content"], "hi")
+        self.assertEqual(entry["charter"], "merged charter")
+
+    def test_changed_inputs_rerun_phase(self):
+        self.output.write_text("merged charter")
+        manifest = RunManifest(self.project)
+        manifest.record("kickoff", self.inputs, [self.output], [])
+        changed = RunManifest.fingerprint({"goals": ["ship it", "and test it"], "agenda": "# Kickoff"})
+        self.assertFalse(manifest.is_current("kickoff", changed))
+        manifest.invalidate()
+        self.assertFalse(manifest.is_current("kickoff", self.inputs))
+
+if __name__ == '__main__':
+    unittest.main()
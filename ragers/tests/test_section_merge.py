@@ -0,0 +1,111 @@
+import threading
+import unittest
+from pathlib import Path
+from ragers.utils.section_merge import SectionMerger, estimate_tokens, split_excerpts, split_sections
+
+TECHNICAL_DESIGN = Path(__file__).resolve().parents[1] / "templates" / "code" / "code_technical_design.md"
+
+DOCUMENT = """# Technical Design
+
+Intro text.
+
+## Inputs
+Describe the inputs.
+
+## Testing Plan
+Describe the tests.
+
+### Unit Tests
+Per module.
+"""
+
+RESPONSES = ("----Next response: The inputs are CSV files uploaded by the user.\n\n"
+             "----Next response: The testing plan uses pytest unit tests per module.")
+
+class TestSectionMerge(unittest.TestCase):
+    def test_split_keeps_subsections_with_parent(self):
+        sections = split_sections(DOCUMENT)
+        self.assertEqual([s.heading for s in sections], ["# Technical Design", "## Inputs", "## Testing Plan"])
+        self.assertIn("### Unit Tests", sections[2].body)
+
+    def test_hash_lines_in_fenced_code_are_not_headings(self):
+        document = ("## Setup\n```bash\n# install deps\npip install -r requirements.txt\n```\n\n"
+                    "~~~\n# comment\n~~~\n\n## Run\nStart the app.\n")
+        sections = split_sections(document)
+        self.assertEqual([s.heading for s in sections], ["## Setup", "## Run"])
+        self.assertIn("# install deps\npip install -r requirements.txt\n```", sections[0].body)
+
+    def test_unclosed_fence_runs_to_the_end(self):
+        sections = split_sections("## Setup\n```\n# not a heading\n## nor this\n")
+        self.assertEqual(len(sections), 1)
+
+    def test_fenced_code_in_responses_stays_in_one_excerpt(self):
+        excerpts = split_excerpts("----Next response: Setup steps.\n\n```bash\n# install deps\n\npip install x\n```\n\nDone.")
+        self.assertEqual(excerpts, ["Setup steps.", "```bash\n# install deps\n\npip install x\n```", "Done."])
+
+    def test_excerpts_are_routed_to_relevant_sections(self):
+        calls = []
+
+        def merge_fn(section, excerpts):
+            calls.append((section.splitlines()[0], excerpts))
+            return section + "\n" + excerpts
+
+        merged = SectionMerger(merge_fn, group_tokens=0).merge(DOCUMENT, RESPONSES)
+        routed = dict(calls)
+        self.assertIn("CSV files", routed["## Inputs"])
+        self.assertNotIn("pytest", routed["## Inputs"])
+        self.assertIn("pytest", routed["## Testing Plan"])
+        self.assertNotIn("# Technical Design", routed)
+        # Sections come back in document order, untouched ones unchanged
+        self.assertLess(merged.index("## Inputs"), merged.index("## Testing Plan"))
+        self.assertIn("Intro text.", merged)
+
+    def test_dropped_heading_is_restored(self):
+        merged = SectionMerger(lambda section, excerpts: "merged body", group_tokens=0).merge(DOCUMENT, RESPONSES)
+        self.assertIn("## Inputs\nmerged body", merged)
+
+    def test_every_excerpt_reaches_a_merge_call(self):
+        document = TECHNICAL_DESIGN.read_text(encoding='utf-8')
+        topics = ["inputs", "outputs", "testing plan", "interfaces dependencies", "security permissions", "purpose"]
+        # Many paragraphs per participant, far beyond max_excerpt_tokens in total
+        responses = "".join(
+            "----Next response: " + "\n\n".join(
+                f"Participant {p} point {i} on {topic}: " + "detail " * 40
+                for i, topic in enumerate(topics * 3))
+            for p in range(8))
+        excerpts = split_excerpts(responses)
+        self.assertGreater(sum(estimate_tokens(e) for e in excerpts), 3 * 3000)
+
+        calls, lock = [], threading.Lock()
+
+        def merge_fn(section, batch):
+            with lock:
+                calls.append(batch)
+            return section
+
+        SectionMerger(merge_fn).merge(document, responses)
+        sent = "\n\n".join(calls)
+        self.assertEqual([e for e in excerpts if e not in sent], [])
+        self.assertGreater(len(calls), 1)
+        self.assertTrue(all(estimate_tokens(batch) <= 3000 for batch in calls))
+
+    def test_overflowing_section_is_merged_in_passes(self):
+        excerpts = [f"Testing plan item {i}: " + " ".join(["pytest"] * 60) for i in range(6)]
+        responses = "----Next response: " + "\n\n".join(excerpts)
+        calls = []
+
+        def merge_fn(section, batch):
+            calls.append((section, batch))
+            return f"{section}\nmerged {len(calls)}"
+
+        merger = SectionMerger(merge_fn, group_tokens=0, max_excerpt_tokens=250)
+        merged = merger.merge("## Testing Plan\nDescribe the tests.\n", responses)
+        self.assertEqual(len(calls), 3)
+        # Each pass builds on the last and together they carry every excerpt
+        self.assertIn("merged 1", calls[1][0])
+        self.assertIn("merged 2", calls[2][0])
+        self.assertEqual("\n\n".join(batch for _, batch in calls), "\n\n".join(excerpts))
+        self.assertIn("merged 3", merged)
+
+if __name__ == '__main__':
+    unittest.main()
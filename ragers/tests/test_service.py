@@ -0,0 +1,52 @@
+import json
+import time
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from ragers.service import RagersService
+
+class TestRagersService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = RagersService(Path(self.tmp.name), workers=1, port=0).start()
+
+    def tearDown(self):
+        self.service.stop()
+        self.tmp.cleanup()
+
+    def call(self, path, method='GET', body=None):
+        request = urllib.request.Request(self.service.address + path, method=method,
+                                         data=json.dumps(body).encode() if body is not None else None)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_job_runs_on_a_worker_and_reports_its_result(self):
+        # An unknown project type fails fast inside the worker, without any model calls
+        status, job = self.call('/jobs', 'POST', {'goal': 'Build a tiny CLI', 'type': 'no_such_type', 'name': 'demo'})
+        self.assertEqual(status, 202)
+        self.assertEqual(job['project'], 'demo')
+
+        for _ in range(100):
+            status, job = self.call(f"/jobs/{job['id']}")
+            if job['status'] not in ('queued', 'running'):
+                break
+            time.sleep(0.05)
+        self.assertEqual(job['status'], 'failed')
+
+        status, result = self.call(f"/jobs/{job['id']}/result")
+        self.assertEqual(status, 200)
+        self.assertFalse(result['success'])
+        self.assertTrue(Path(result['log']).exists())
+        self.assertEqual(self.call('/health')[1]['running'], 0)
+
+    def test_goal_is_required(self):
+        self.assertEqual(self.call('/jobs', 'POST', {'type': 'code'})[0], 400)
+        self.assertEqual(self.call('/jobs/unknown')[0], 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+from ragers.utils.snapshot_store import SnapshotStore
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / ".snapshots"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical_content_is_stored_once(self):
+        store = SnapshotStore(self.root)
+        first = store.snapshot("charters/charter.md", "# Charter\nv1\n")
+        self.assertIs(store.snapshot("charters/charter.md", "# Charter\nv1\n"), first)
+        store.snapshot("charters/charter.md", "# Charter\nv2\n")
+        store.snapshot("charters/charter.md", "# Charter\nv1\n")
+        store.snapshot("deliverables/copy.md", "# Charter\nv1\n")
+
+        self.assertEqual(len(store.versions("charters/charter.md")), 3)
+        self.assertEqual(store.stats(), {"versions": 4, "blobs": 2, "bytes": store.stats()["bytes"]})
+
+    def test_read_and_diff_versions_after_reload(self):
+        store = SnapshotStore(self.root)
+        store.snapshot("design.md", "## API\nGET /items\n")
+        store.snapshot("design.md", "## API\nGET /items\nPOST /items\n", label="review")
+
+        reloaded = SnapshotStore(self.root)
+        self.assertEqual(reloaded.read("design.md", 0), "## API\nGET /items\n")
+        self.assertEqual(reloaded.versions("design.md")[-1]["label"], "review")
+        diff = reloaded.diff("design.md")
+        self.assertIn("+POST /items", diff)
+        self.assertEqual(reloaded.diff("design.md", -1, -1), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from ragers.utils.template_cache import FileCache, CompiledTemplate, load_prompts
+
+class TestTemplateCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "demo_prompts.yaml"
+        self.path.write_text(
+            "prompts:\n"
+            "  meeting_rules:\n"
+            "    structure:\n"
+            "      opening: [Welcome, Agenda]\n"
+            "      closing: [Wrap up]\n"
+            "  design:\n"
+            "    template: \"Goals: {goal_summary} {{literal}} {missing}\"\n"
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_file_is_parsed_once_until_it_changes(self):
+        cache = FileCache()
+        calls = []
+        build = lambda path: calls.append(path) or path.read_text()
+        self.assertEqual(cache.get("text", self.path, build), cache.get("text", self.path, build))
+        self.assertEqual(len(calls), 1)
+
+        stat = os.stat(self.path)
+        self.path.write_text("changed")
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(cache.get("text", self.path, build), "changed")
+        self.assertEqual(len(calls), 2)
+
+    def test_prompts_are_pre_split(self):
+        prompts = load_prompts(self.path)
+        self.assertIs(prompts, load_prompts(self.path))
+        self.assertEqual(prompts["opening"], "Welcome\nAgenda")
+        self.assertEqual(prompts["closing"], "Wrap up")
+        template = prompts["templates"]["design"]
+        self.assertEqual(template.fields, {"goal_summary", "missing"})
+        self.assertEqual(template.render({"goal_summary": "- ship"}), "Goals: - ship {literal} [MISSING]")
+
+    def test_render_matches_str_format(self):
+        template = CompiledTemplate("{a}-{b!r}-{c:>4}")
+        context = {"a": 1, "b": "x", "c": "y"}
+        self.assertEqual(template.render(context), "{a}-{b!r}-{c:>4}".format(**context))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,10 @@ import logging
 import json
 import requests
 from typing import List, Dict, Any, Optional
+from helpers.llm_pool import get_http_session
+from helpers.llm_cache import get_cache
+from helpers.usage import budget_model, check_budget, record_usage
+from helpers.model_router import route_model
 
 class ChatGPTClient:
     """Simple ChatGPT API client that doesn't depend on audio functionality"""
@@ -12,20 +16,23 @@ class ChatGPTClient:
         self.api_key = os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             self.logger.warning("OPENAI_API_KEY not found in environment variables")
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        self.model = "gpt-4"  # Default model
+        base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        self.api_url = f"{base_url}/chat/completions"
+        self.model = "gpt-4o"  # Requested model, routed per task, phase and role by helpers.model_router
+        self.session = get_http_session()  # Shared keep-alive connection pool
         
     def set_model(self, model: str):
         """Set the model to use for completions"""
         self.model = model
         
-    def get_chat_response(self, messages: List[Dict[str, str]]) -> str:
+    def get_chat_response(self, messages: List[Dict[str, str]], use_cache: bool = True) -> str:
         """Get a response from ChatGPT API
         
         Args:
             messages: List of message dictionaries with 'role' and 'content' keys
                      Example: [{"role": "system", "content": "You are a helpful assistant"},
                                {"role": "user", "content": "Hello, world!"}]
+            use_cache: Serve and store the response in the LLM response cache
         
         Returns:
             The response content as a string
@@ -44,15 +51,25 @@ class ChatGPTClient:
             "Authorization": f"Bearer {self.api_key}"
         }
         
+        model = budget_model(route_model(self.model, messages))
         data = {
-            "model": self.model,
+            "model": model,
             "messages": messages,
             "temperature": 0.7,
             "max_tokens": 2000
         }
+
+        cache = get_cache() if use_cache else None
+        if cache:
+            cache_key = cache.make_key(model, messages, data["temperature"], data["max_tokens"])
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"LLM cache hit for {model}")
+                return cached
         
+        check_budget()
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 headers=headers,
                 data=json.dumps(data)
@@ -60,8 +77,14 @@ class ChatGPTClient:
             response.raise_for_status()
             
             response_data = response.json()
+            usage = response_data.get("usage") or {}
+            if usage:
+                record_usage(model, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
             if "choices" in response_data and len(response_data["choices"]) > 0:
-                return response_data["choices"][0]["message"]["content"].strip()
+                content = response_data["choices"][0]["message"]["content"].strip()
+                if cache:
+                    cache.put(cache_key, content, model=model)
+                return content
             else:
                 self.logger.error(f"Unexpected API response format: {response_data}")
                 return "Error: Unexpected API response format"
@@ -0,0 +1,224 @@
+import re
+import fnmatch
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Context window per model family (prompt + completion)
+MODEL_CONTEXT_LIMITS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_LIMIT = 8192
+
+# Higher priority fields keep their content longest
+DEFAULT_PRIORITIES = {
+    "goal_summary": 100,
+    "agenda": 90,
+    "meeting_rules": 80,
+    "output_files": 70,
+    "input_files*": 60,
+    "history": 40,
+    "rag_data": 30,
+    "goals": 20,
+}
+
+# How each field is shortened: keep its head, keep its tail, or summarize it
+DEFAULT_STRATEGIES = {
+    "history": "tail",
+}
+
+TRUNCATION_MARKER = "\n[... {tokens} tokens trimmed to fit the context budget ...]\n"
+
+def context_limit_for(model: str) -> int:
+    """Return the context window for a model, matching the longest known prefix"""
+    for name in sorted(MODEL_CONTEXT_LIMITS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_CONTEXT_LIMITS[name]
+    return DEFAULT_CONTEXT_LIMIT
+
+@dataclass
+class FieldCut:
+    """What the planner did to one context field"""
+    field: str
+    original_tokens: int
+    kept_tokens: int
+    action: str  # trimmed, summarized or dropped
+
+@dataclass
+class BudgetReport:
+    """Outcome of fitting a prompt context into its token budget"""
+    model: str
+    budget: int
+    tokens_before: int
+    tokens_after: int
+    cuts: List[FieldCut] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens_after > self.budget
+
+    def summary(self) -> str:
+        """One line per cut field, for the project log"""
+        lines = [f"Prompt budget {self.budget} tokens for {self.model}: {self.tokens_before} -> {self.tokens_after}"]
+        for cut in self.cuts:
+            lines.append(f"  {cut.field}: {cut.action} {cut.original_tokens} -> {cut.kept_tokens} tokens")
+        return "\n".join(lines)
+
+
+class ContextBudgetPlanner:
+    """Fits meeting prompt context fields into a per-model token budget.
+
+    Only fields the template references are counted. When the formatted
+    prompt would exceed the budget, fields are shortened from the lowest
+    priority upwards: first down to min_field_tokens, then dropped entirely
+    if that is still not enough. Fields use the "head", "tail" or
+    "summarize" strategy; summarizing needs a summarizer callable and falls
+    back to keeping the head.
+    """
+
+    def __init__(self, model: str = "gpt-4o", max_prompt_tokens: Optional[int] = None,
+                 completion_reserve: int = 4000, min_field_tokens: int = 200,
+                 priorities: Optional[Dict[str, int]] = None, strategies: Optional[Dict[str, str]] = None,
+                 summarizer: Optional[Callable[[str, int], str]] = None):
+        """
+        Args:
+            model: Model the prompt is sent to
+            max_prompt_tokens: Optional cap below the model's own limit
+            completion_reserve: Tokens left free for the response
+            min_field_tokens: Size a field is trimmed to before anything is dropped
+            priorities: Field name or glob -> priority, higher is kept longer
+            strategies: Field name or glob -> "head", "tail" or "summarize"
+            summarizer: Callable(text, target_tokens) returning a shorter text
+        """
+        self.model = model
+        self.completion_reserve = completion_reserve
+        self.min_field_tokens = min_field_tokens
+        self.priorities = priorities if priorities is not None else dict(DEFAULT_PRIORITIES)
+        self.strategies = strategies if strategies is not None else dict(DEFAULT_STRATEGIES)
+        self.summarizer = summarizer
+
+        self.budget = context_limit_for(model) - completion_reserve
+        if max_prompt_tokens:
+            self.budget = min(self.budget, max_prompt_tokens)
+
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], model: str,
+                    summarizer: Optional[Callable[[str, int], str]] = None) -> "ContextBudgetPlanner":
+        """Build a planner from a mode YAML context_budget section"""
+        config = config or {}
+        return cls(
+            model=config.get('model', model),
+            max_prompt_tokens=config.get('max_prompt_tokens'),
+            completion_reserve=config.get('completion_reserve', 4000),
+            min_field_tokens=config.get('min_field_tokens', 200),
+            priorities=config.get('priorities'),
+            strategies=config.get('strategies'),
+            summarizer=summarizer if config.get('summarize') else None
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with tiktoken when available, else about four characters per token"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+    def _lookup(self, table: Dict[str, Any], name: str, default: Any) -> Any:
+        if name in table:
+            return table[name]
+        for pattern, value in table.items():
+            if fnmatch.fnmatch(name, pattern):
+                return value
+        return default
+
+    def _shorten(self, name: str, text: str, target: int) -> Tuple[str, str]:
+        """Shorten text to about target tokens; return (text, action)"""
+        if target <= 0:
+            return "", "dropped"
+        strategy = self._lookup(self.strategies, name, "head")
+        if strategy == "summarize" and self.summarizer is not None:
+            try:
+                summary = self.summarizer(text, target)
+                if summary and self.count_tokens(summary) <= target:
+                    return summary, "summarized"
+                text = summary or text
+            except Exception as e:
+                logger.warning(f"Summarizing {name} failed, trimming instead: {str(e)}")
+
+        original = self.count_tokens(text)
+        marker = TRUNCATION_MARKER.format(tokens=original - target)
+        keep = max(target - self.count_tokens(marker), 0)
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            head = self._encoding.decode(tokens[-keep:] if strategy == "tail" else tokens[:keep]) if keep else ""
+        else:
+            head = (text[-keep * 4:] if strategy == "tail" else text[:keep * 4]) if keep else ""
+        trimmed = marker + head if strategy == "tail" else head + marker
+        return trimmed, "trimmed"
+
+    def plan(self, template: str, context: Dict[str, Any]) -> Tuple[Dict[str, Any], BudgetReport]:
+        """Fit the template's context fields into the budget.
+
+        Args:
+            template: Prompt template with {field} placeholders
+            context: Values for the placeholders
+
+        Returns:
+            A copy of context with over-budget fields shortened, and the report
+        """
+        used_fields = set(re.findall(r"{([a-zA-Z0-9_]+)}", template))
+        fixed_tokens = self.count_tokens(re.sub(r"{[a-zA-Z0-9_]+}", "", template))
+        sizes = {name: self.count_tokens(str(context[name])) for name in used_fields if name in context}
+        tokens_before = fixed_tokens + sum(sizes.values())
+
+        planned = dict(context)
+        report = BudgetReport(self.model, self.budget, tokens_before, tokens_before)
+        excess = tokens_before - self.budget
+        if excess <= 0:
+            return planned, report
+
+        # Lowest priority first; each pass may shrink fields a little further
+        order = sorted(sizes, key=lambda name: (self._lookup(self.priorities, name, 50), -sizes[name]))
+        targets = dict(sizes)
+        for floor in (self.min_field_tokens, 0):
+            for name in order:
+                if excess <= 0:
+                    break
+                reducible = targets[name] - floor
+                if reducible <= 0:
+                    continue
+                cut = min(reducible, excess)
+                targets[name] -= cut
+                excess -= cut
+
+        for name in order:
+            if targets[name] >= sizes[name]:
+                continue
+            planned[name], action = self._shorten(name, str(context[name]), targets[name])
+            kept = self.count_tokens(planned[name])
+            report.cuts.append(FieldCut(name, sizes[name], kept, action))
+            report.tokens_after -= sizes[name] - kept
+
+        if report.over_budget:
+            logger.warning(f"Prompt still over budget after trimming: {report.tokens_after} > {self.budget}")
+        return planned, report
@@ -1,8 +1,8 @@
 import os
 import shutil
-from datetime import datetime
 import logging
 from pathlib import Path
+from ragers.utils.snapshot_store import SnapshotStore
 
 # dm = DocumentManager('/projects/project_xyz')
 # dm.initialize_project_docs()
@@ -24,6 +24,8 @@ class DocumentManager:
         self.charters_folder = os.path.join(project_folder, 'charters')
         self.deliverables_folder = os.path.join(project_folder, 'deliverables')
         self.meetings_folder = os.path.join(project_folder, 'meetings')
+        # Checkpoints are content-addressed blobs, shared across versions and runs
+        self.snapshots = SnapshotStore(Path(project_folder) / '.snapshots')
 
         self.project_type = project_type
 
@@ -61,19 +63,71 @@ class DocumentManager:
         return cleaned_file_content
 
     def save_document(self, doc_path, content):
-        """Saves content to a document."""
-        with open(doc_path, 'w', encoding='utf-8') as f:
+        """Saves content to a document, replacing it in one step so readers never see it half written."""
+        tmp_path = f"{doc_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(content)
-
-    def checkpoint_document(self, doc_path):
-        """Creates a checkpoint copy of a document with timestamp."""
-        base_folder, filename = os.path.split(doc_path)
-        name, ext = os.path.splitext(filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        checkpoint_name = f"{name}_checkpoint_{timestamp}{ext}"
-        checkpoint_path = os.path.join(base_folder, checkpoint_name)
-        shutil.copy(doc_path, checkpoint_path)
-        print(f"📝 Checkpoint created: {checkpoint_path}")
+        os.replace(tmp_path, doc_path)
+
+    def stream_document(self, doc_path, chunks, partial_path=None):
+        """Writes content to a document as it arrives and returns the full text.
+
+        Chunks are written to <doc_path>.tmp, which replaces the document only
+        once the stream completes with some text. If the chunks raise, the
+        document is left untouched, the text so far is kept at partial_path
+        (when given) and the error propagates.
+        """
+        tmp_path = f"{doc_path}.tmp"
+        pieces = []
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for chunk in chunks:
+                    pieces.append(chunk)
+                    f.write(chunk)
+                    f.flush()
+        except BaseException:
+            if partial_path and pieces:
+                os.replace(tmp_path, partial_path)
+            else:
+                os.remove(tmp_path)
+            raise
+        if not pieces:
+            os.remove(tmp_path)
+            return ''
+        os.replace(tmp_path, doc_path)
+        return ''.join(pieces)
+
+    def _checkpoint_key(self, doc_path):
+        """Snapshot key: the path relative to the project when inside it"""
+        path = Path(doc_path).resolve()
+        try:
+            return path.relative_to(Path(self.project_folder).resolve()).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def checkpoint_document(self, doc_path, label=None):
+        """Records the document's current content in the project's snapshot store.
+
+        Unchanged content records nothing; identical content is stored once.
+        Returns the snapshot index entry.
+        """
+        with open(doc_path, 'rb') as f:
+            content = f.read()
+        entry = self.snapshots.snapshot(self._checkpoint_key(doc_path), content, label)
+        self.logger.info(f"Checkpoint of {doc_path}: {entry['blob'][:12]} at {entry['timestamp']}")
+        return entry
+
+    def list_checkpoints(self, doc_path):
+        """Lists a document's checkpoints, oldest first."""
+        return self.snapshots.versions(self._checkpoint_key(doc_path))
+
+    def load_checkpoint(self, doc_path, version=-1):
+        """Loads a checkpointed version by index, timestamp or blob prefix."""
+        return self.snapshots.read(self._checkpoint_key(doc_path), version)
+
+    def diff_checkpoints(self, doc_path, old=-2, new=-1):
+        """Unified diff between two checkpoints of a document."""
+        return self.snapshots.diff(self._checkpoint_key(doc_path), old, new)
 
     def inject_document_into_prompt(self, doc_path):
         """Formats the document for injection into a meeting prompt."""
@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+class MeetingJournal:
+    """Append-only meeting transcripts, one markdown file per phase.
+
+    Each phase keeps one buffered handle open from begin() to end(); entries
+    are appended, never rewritten, and indexed in memory per phase. end()
+    flushes and fsyncs the transcript so a finished meeting is durable.
+    """
+
+    def __init__(self, meetings_dir: Path, buffer_size: int = 64 * 1024, flush_interval: float = 0.5):
+        """
+        Args:
+            meetings_dir: Directory holding <phase>.md transcripts
+            buffer_size: Write buffer per open transcript
+            flush_interval: Seconds between flushes while an entry streams in
+        """
+        self.meetings_dir = Path(meetings_dir)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._handles: Dict[str, IO[str]] = {}
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def path(self, phase: str) -> Path:
+        return self.meetings_dir / f"{phase}.md"
+
+    def _lock(self, phase: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(phase, threading.Lock())
+
+    def begin(self, phase: str) -> None:
+        """Start a fresh transcript for phase, replacing any earlier run's file"""
+        with self._lock(phase):
+            self._close(phase, sync=False)
+            self.meetings_dir.mkdir(parents=True, exist_ok=True)
+            handle = open(self.path(phase), 'w', encoding='utf-8', buffering=self.buffer_size)
+            handle.write(f"# {phase.title()} Meeting\n\n")
+            self._handles[phase] = handle
+            self._index[phase] = []
+
+    def _handle(self, phase: str) -> IO[str]:
+        if phase not in self._handles:
+            # Entries without begin() continue the phase's transcript
+            self.meetings_dir.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path(phase).exists()
+            self._handles[phase] = open(self.path(phase), 'a', encoding='utf-8', buffering=self.buffer_size)
+            if new_file:
+                self._handles[phase].write(f"# {phase.title()} Meeting\n\n")
+            self._index.setdefault(phase, [])
+        return self._handles[phase]
+
+    def stream(self, phase: str, role: str, chunks: Iterable[str]) -> Dict[str, Any]:
+        """Append an entry as it streams in and return it.
+
+        If the chunks raise part way, e.g. on a deadline, the text received so
+        far is still recorded, marked partial, before the error propagates.
+        """
+        pieces = []
+        with self._lock(phase):
+            handle = self._handle(phase)
+            handle.write(f"## {role}\n\n")
+            last_flush = time.monotonic()
+            partial = True
+            try:
+                for chunk in chunks:
+                    pieces.append(chunk)
+                    handle.write(chunk)
+                    # Flush periodically so the transcript can be followed live
+                    if time.monotonic() - last_flush >= self.flush_interval:
+                        handle.flush()
+                        last_flush = time.monotonic()
+                partial = False
+            finally:
+                handle.write("\n\n_[interrupted]_\n\n" if partial else "\n\n")
+                handle.flush()
+                entry = {"phase": phase, "role": role, "content": "".join(pieces)}
+                if partial:
+                    entry["partial"] = True
+                self._index[phase].append(entry)
+        return entry
+
+    def append(self, phase: str, role: str, content: str) -> Dict[str, Any]:
+        """Append a complete entry and return it"""
+        return self.stream(phase, role, [content])
+
+    def restore(self, phase: str, entries: List[Dict[str, Any]]) -> None:
+        """Index entries of a transcript written by an earlier run without rewriting it"""
+        with self._lock(phase):
+            self._index[phase] = list(entries)
+
+    def entries(self, phase: str) -> List[Dict[str, Any]]:
+        """Entries recorded for phase, in order"""
+        return list(self._index.get(phase, []))
+
+    def end(self, phase: str) -> None:
+        """Flush, fsync and close the phase's transcript"""
+        with self._lock(phase):
+            self._close(phase, sync=True)
+
+    def _close(self, phase: str, sync: bool) -> None:
+        handle = self._handles.pop(phase, None)
+        if handle is None:
+            return
+        try:
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+        finally:
+            handle.close()
+
+    def close(self) -> None:
+        """End every open transcript"""
+        for phase in list(self._handles):
+            self.end(phase)
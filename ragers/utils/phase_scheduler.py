@@ -0,0 +1,152 @@
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+from helpers.deadline import run_in_context
+
+logger = logging.getLogger(__name__)
+
+def split_files(value: Any) -> List[str]:
+    """Normalize a meeting's input_files/output_files entry into a list of file names"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [f.strip() for f in value.split(',') if f.strip()]
+    return [str(f).strip() for f in value if str(f).strip()]
+
+def meeting_files(meeting: Dict[str, Any], kind: str) -> Any:
+    """A meeting's input or output files: code mode declares input_files/output_files, automate mode input/output"""
+    return meeting.get(f'{kind}_files', meeting.get(kind))
+
+@dataclass
+class PhaseNode:
+    """A meeting phase with the files it reads and writes"""
+    name: str
+    order: int
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    depends_on: Set[str] = field(default_factory=set)
+
+
+class PhaseScheduler:
+    """Runs meeting phases as a dependency graph built from their declared files.
+
+    Edges always point from an earlier phase (in configured order) to a later
+    one, so the graph is acyclic. A later phase waits for an earlier one when
+    it reads the earlier phase's output (read after write), rewrites the same
+    output (write after write) or overwrites a file the earlier phase reads
+    (write after read). Phases that declare no files keep their place in the
+    sequence. Independent phases run concurrently, at most max_parallel at a
+    time.
+    """
+
+    def __init__(self, phases: Dict[str, Dict[str, Any]], meetings: Dict[str, Dict[str, Any]],
+                 max_parallel: int = 2):
+        """
+        Args:
+            phases: The mode YAML phases section
+            meetings: The mode YAML templates.meetings section
+            max_parallel: Maximum number of phases running at once
+        """
+        self.max_parallel = max(1, int(max_parallel))
+        names = list(phases)
+        ordered = sorted(names, key=lambda name: ((phases[name] or {}).get('order', names.index(name)), names.index(name)))
+        self.nodes: Dict[str, PhaseNode] = {}
+        for position, name in enumerate(ordered):
+            meeting = meetings.get(name, {}) or {}
+            self.nodes[name] = PhaseNode(
+                name=name,
+                order=position,
+                inputs=split_files(meeting_files(meeting, 'input')),
+                outputs=split_files(meeting_files(meeting, 'output'))
+            )
+        self._link()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PhaseScheduler":
+        """Build a scheduler from a loaded *_mode.yaml"""
+        scheduling = config.get('phase_scheduling') or {}
+        return cls(config['phases'], config['templates']['meetings'], scheduling.get('max_parallel_phases', 2))
+
+    def _link(self) -> None:
+        nodes = sorted(self.nodes.values(), key=lambda n: n.order)
+        for index, later in enumerate(nodes):
+            earlier_nodes = nodes[:index]
+            if not later.inputs and not later.outputs:
+                # Nothing declared: keep the phase's place in the sequence
+                if earlier_nodes:
+                    later.depends_on.add(earlier_nodes[-1].name)
+                continue
+            for earlier in earlier_nodes:
+                if not earlier.inputs and not earlier.outputs:
+                    later.depends_on.add(earlier.name)
+                elif (set(later.inputs) & set(earlier.outputs)          # read after write
+                        or set(later.outputs) & set(earlier.outputs)    # write after write
+                        or set(later.outputs) & set(earlier.inputs)):   # write after read
+                    later.depends_on.add(earlier.name)
+
+    def order(self) -> List[str]:
+        """Phase names in configured order"""
+        return [n.name for n in sorted(self.nodes.values(), key=lambda n: n.order)]
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Phase name -> names of the phases it waits for"""
+        return {name: set(node.depends_on) for name, node in self.nodes.items()}
+
+    def levels(self) -> List[List[str]]:
+        """Group phases into waves that could run together; the number of waves is the critical path"""
+        level: Dict[str, int] = {}
+        for name in self.order():
+            deps = self.nodes[name].depends_on
+            level[name] = 1 + max((level[d] for d in deps), default=-1)
+        waves: List[List[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for name in self.order():
+            waves[level[name]].append(name)
+        return waves
+
+    def run(self, run_phase: Callable[[str], bool], phases: Optional[List[str]] = None) -> bool:
+        """Run phases as their dependencies complete.
+
+        Args:
+            run_phase: Callable running one phase, returning True on success
+            phases: Optional subset to run; dependencies outside it count as done
+
+        Returns:
+            True if every phase succeeded. After a failure no new phases start,
+            running ones are allowed to finish. Phases run in a copy of the
+            caller's context, so a deadline set around run() bounds them.
+        """
+        selected = [name for name in self.order() if phases is None or name in phases]
+        pending = {name: self.nodes[name].depends_on & set(selected) for name in selected}
+        done: Set[str] = set()
+        failed: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            running = {}
+            while pending or running:
+                if not failed:
+                    ready = [name for name in selected if name in pending and pending[name] <= done]
+                    for name in ready[:self.max_parallel - len(running)]:
+                        del pending[name]
+                        logger.info(f"Scheduling phase {name}")
+                        running[pool.submit(run_in_context(run_phase), name)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        succeeded = future.result()
+                    except Exception as e:
+                        logger.error(f"Phase {name} raised: {str(e)}")
+                        succeeded = False
+                    if succeeded:
+                        done.add(name)
+                    else:
+                        failed.append(name)
+
+        if failed:
+            skipped = [name for name in selected if name not in done and name not in failed]
+            logger.error(f"Failed phases: {', '.join(failed)}; not run: {', '.join(skipped) or 'none'}")
+            return False
+        return True
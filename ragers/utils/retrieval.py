@@ -0,0 +1,336 @@
+import os
+import json
+import math
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from helpers.deadline import DeadlineExceeded, time_left
+from helpers.llm_pool import get_openai_client
+from helpers.rate_limiter import get_rate_limiter
+from helpers.usage import BudgetExceeded, check_budget, record_usage
+from ragers.utils.section_merge import keywords, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# embed_fn(texts) -> one vector per text
+Embedder = Callable[[List[str]], List[List[float]]]
+
+def chunk_text(text: str, chunk_tokens: int = 300) -> List[str]:
+    """Pack paragraphs into chunks of about chunk_tokens; longer paragraphs are split on lines, then hard"""
+    limit = chunk_tokens * 4
+    pieces: List[str] = []
+    for paragraph in (p.strip() for p in text.split("\n\n")):
+        if not paragraph:
+            continue
+        if len(paragraph) <= limit:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            pieces.extend(line[i:i + limit] for i in range(0, len(line), limit) if line[i:i + limit].strip())
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > limit:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _numpy():
+    """NumPy for dense scoring, imported on first use; None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def openai_embedder(model: str = "text-embedding-3-small") -> Embedder:
+    """Embed texts with the OpenAI embeddings API through the pooled client, paced and metered like chat calls"""
+    def embed(texts: List[str]) -> List[List[float]]:
+        limiter = get_rate_limiter()
+        check_budget()
+        limiter.acquire(model, sum(estimate_tokens(text) for text in texts), max_wait=time_left())
+        timeout = time_left()
+        raw_response = get_openai_client().embeddings.with_raw_response.create(
+            model=model, input=texts, **({'timeout': timeout} if timeout is not None else {}))
+        limiter.update_from_headers(model, raw_response.headers)
+        response = raw_response.parse()
+        if response.usage:
+            record_usage(model, response.usage.prompt_tokens, 0)
+        return [item.embedding for item in response.data]
+    return embed
+
+
+@dataclass
+class Hit:
+    """A retrieved chunk"""
+    source: str
+    text: str
+    score: float
+
+
+class RetrievalIndex:
+    """BM25 index over local documents, persisted to disk and refreshed on mtime.
+
+    Files are split into chunks of about chunk_tokens. refresh() re-chunks
+    only files whose mtime or size changed, drops files that disappeared and
+    saves the index as JSON under index_dir. When an embedder is given and
+    NumPy is installed (imported only then), chunk vectors are stored alongside and search()
+    blends cosine similarity into the BM25 score.
+    """
+
+    def __init__(self, index_dir: Path, sources: Sequence[Path], extensions: Iterable[str] = ('.txt', '.md'),
+                 chunk_tokens: int = 300, embedder: Optional[Embedder] = None, dense_weight: float = 0.5,
+                 k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            index_dir: Directory holding index.json (and vectors.npy when dense)
+            sources: Files or directories to index; directories are searched recursively
+            extensions: File suffixes to index
+            chunk_tokens: Target chunk size
+            embedder: Callable(texts) returning vectors; enables dense scoring
+            dense_weight: Share of the dense score in the blended score
+            k1, b: BM25 parameters
+        """
+        self.index_dir = Path(index_dir)
+        self.sources = [Path(source) for source in sources]
+        self.extensions = {ext.lower() for ext in extensions}
+        self.chunk_tokens = chunk_tokens
+        self.embedder = embedder if embedder is not None and _numpy() is not None else None
+        self.dense_weight = dense_weight
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._vectors: Dict[str, Any] = {}
+        self._chunks: List[Dict[str, Any]] = []
+        self._df: Counter = Counter()
+        self._avgdl = 0.0
+        if embedder is not None and self.embedder is None:
+            logger.warning("NumPy is not installed, retrieval uses BM25 only")
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], index_dir: Path, root: Path,
+                    extra_sources: Sequence[Path] = ()) -> "RetrievalIndex":
+        """Build an index from a mode YAML retrieval section; relative sources resolve against root"""
+        config = config or {}
+        embedder = openai_embedder(config.get('embedding_model', 'text-embedding-3-small')) if config.get('dense') else None
+        return cls(
+            index_dir=index_dir,
+            sources=[root / source for source in config.get('sources', [])] + list(extra_sources),
+            extensions=config.get('extensions', ['.txt', '.md']),
+            chunk_tokens=config.get('chunk_tokens', 300),
+            embedder=embedder,
+            dense_weight=config.get('dense_weight', 0.5)
+        )
+
+    @property
+    def index_path(self) -> Path:
+        return self.index_dir / "index.json"
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.index_dir / "vectors.npy"
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('chunk_tokens') != self.chunk_tokens:
+            return
+        self._files = data.get('files', {})
+        if self.embedder is not None and self.vectors_path.exists():
+            matrix = _numpy().load(self.vectors_path)
+            self._vectors = dict(zip(data.get('vector_ids', []), matrix))
+        self._rebuild()
+
+    def _save(self) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        vector_ids = list(self._vectors)
+        if self.embedder is not None and vector_ids:
+            np = _numpy()
+            with open(self.vectors_path, 'wb') as f:
+                np.save(f, np.stack([self._vectors[i] for i in vector_ids]))
+        # Unique temp file: processes sharing the index may save at the same time
+        fd, tmp = tempfile.mkstemp(dir=str(self.index_dir), prefix=".index.")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'chunk_tokens': self.chunk_tokens,
+                       'files': self._files, 'vector_ids': vector_ids}, f)
+        os.replace(tmp, self.index_path)
+
+    def add_sources(self, sources: Sequence[Path]) -> None:
+        """Also index sources, indexed from the next refresh()"""
+        with self._lock:
+            known = {source.resolve() for source in self.sources}
+            self.sources.extend(Path(source) for source in sources if Path(source).resolve() not in known)
+
+    def _source_files(self) -> List[Path]:
+        files = []
+        for source in self.sources:
+            if source.is_file():
+                files.append(source)
+            elif source.is_dir():
+                files.extend(path for path in sorted(source.rglob('*'))
+                             if path.is_file() and path.suffix.lower() in self.extensions)
+        return files
+
+    def refresh(self) -> int:
+        """Re-index new and changed files, drop removed ones; return the number of files re-indexed"""
+        with self._lock:
+            seen, changed = set(), 0
+            for path in self._source_files():
+                key = str(path.resolve())
+                seen.add(key)
+                try:
+                    stat = path.stat()
+                    stamp = [stat.st_mtime_ns, stat.st_size]
+                    entry = self._files.get(key)
+                    if entry and entry['stamp'] == stamp:
+                        continue
+                    text = path.read_text(encoding='utf-8', errors='replace')
+                except OSError as e:
+                    logger.warning(f"Could not index {path}: {str(e)}")
+                    continue
+                chunks = []
+                for chunk in chunk_text(text, self.chunk_tokens):
+                    terms = keywords(chunk)
+                    chunks.append({
+                        'id': hashlib.sha1(chunk.encode('utf-8')).hexdigest(),
+                        'text': chunk,
+                        'tf': dict(Counter(terms)),
+                        'length': len(terms)
+                    })
+                self._files[key] = {'stamp': stamp, 'source': path.name, 'chunks': chunks}
+                changed += 1
+            removed = [key for key in self._files if key not in seen]
+            for key in removed:
+                del self._files[key]
+            if changed or removed:
+                self._rebuild()
+            missing_vectors = self.embedder is not None and any(c['id'] not in self._vectors for c in self._chunks)
+            if changed or removed or missing_vectors:
+                self._embed_missing()
+                self._save()
+                logger.info(f"Retrieval index: {changed} files re-indexed, {len(removed)} removed, "
+                            f"{len(self._chunks)} chunks")
+            return changed
+
+    def version(self) -> str:
+        """Hash of the indexed content, unchanged until a file's text changes or files come and go"""
+        with self._lock:
+            digest = hashlib.sha256()
+            for entry in sorted(self._files.values(), key=lambda entry: (entry['source'], [c['id'] for c in entry['chunks']])):
+                digest.update(entry['source'].encode('utf-8'))
+                for chunk in entry['chunks']:
+                    digest.update(chunk['id'].encode('ascii'))
+            return digest.hexdigest()
+
+    def _rebuild(self) -> None:
+        self._chunks = [dict(chunk, source=entry['source'], path=key)
+                        for key, entry in self._files.items() for chunk in entry['chunks']]
+        self._df = Counter(term for chunk in self._chunks for term in chunk['tf'])
+        self._avgdl = (sum(chunk['length'] for chunk in self._chunks) / len(self._chunks)) if self._chunks else 0.0
+        live = {chunk['id'] for chunk in self._chunks}
+        self._vectors = {cid: vector for cid, vector in self._vectors.items() if cid in live}
+
+    def _embed_missing(self) -> None:
+        if self.embedder is None:
+            return
+        np = _numpy()
+        missing = [chunk for chunk in self._chunks if chunk['id'] not in self._vectors]
+        for start in range(0, len(missing), 64):
+            batch = missing[start:start + 64]
+            try:
+                vectors = self.embedder([chunk['text'] for chunk in batch])
+            except (DeadlineExceeded, BudgetExceeded):
+                raise
+            except Exception as e:
+                logger.warning(f"Embedding failed, continuing with BM25 only: {str(e)}")
+                return
+            for chunk, vector in zip(batch, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                self._vectors[chunk['id']] = vector / (np.linalg.norm(vector) or 1.0)
+
+    def _bm25(self, terms: List[str]) -> List[float]:
+        n = len(self._chunks)
+        idf = {term: math.log(1 + (n - self._df[term] + 0.5) / (self._df[term] + 0.5)) for term in set(terms)}
+        scores = []
+        for chunk in self._chunks:
+            tf, score = chunk['tf'], 0.0
+            norm = self.k1 * (1 - self.b + self.b * chunk['length'] / (self._avgdl or 1))
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    score += idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: int = 4, exclude: Sequence[Path] = ()) -> List[Hit]:
+        """Return the k chunks most relevant to query, best first, leaving out files under exclude"""
+        prefixes = tuple(str(Path(path).resolve()) + os.sep for path in exclude)
+        with self._lock:
+            if not self._chunks:
+                return []
+            scores = self._bm25(keywords(query))
+            if self.embedder is not None and self._vectors:
+                try:
+                    np = _numpy()
+                    q = np.asarray(self.embedder([query])[0], dtype=np.float32)
+                    q /= np.linalg.norm(q) or 1.0
+                    top = max(scores) or 1.0
+                    scores = [
+                        (1 - self.dense_weight) * score / top
+                        + self.dense_weight * float(self._vectors[chunk['id']] @ q if chunk['id'] in self._vectors else 0.0)
+                        for score, chunk in zip(scores, self._chunks)
+                    ]
+                except (DeadlineExceeded, BudgetExceeded):
+                    raise
+                except Exception as e:
+                    logger.warning(f"Dense query failed, using BM25 only: {str(e)}")
+            if prefixes:
+                scores = [0.0 if chunk['path'].startswith(prefixes) else score
+                          for score, chunk in zip(scores, self._chunks)]
+            ranked = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+            return [Hit(self._chunks[i]['source'], self._chunks[i]['text'], scores[i]) for i in ranked if scores[i] > 0]
+
+    def context(self, query: str, k: int = 4, max_tokens: int = 1500, exclude: Sequence[Path] = ()) -> str:
+        """Top-k chunks formatted for a prompt, capped at max_tokens"""
+        parts, used = [], 0
+        for hit in self.search(query, k, exclude):
+            block = f"[{hit.source}]\n{hit.text}"
+            size = estimate_tokens(block)
+            if parts and used + size > max_tokens:
+                break
+            parts.append(block)
+            used += size
+        return "\n\n".join(parts)
+
+
+_shared: Dict[Path, RetrievalIndex] = {}
+_shared_lock = threading.Lock()
+
+def shared_index(config: Optional[Dict[str, Any]], index_dir: Path, root: Path,
+                 extra_sources: Sequence[Path] = ()) -> RetrievalIndex:
+    """The process-wide index kept in index_dir, built on first use; later callers add their extra sources"""
+    key = Path(index_dir).resolve()
+    with _shared_lock:
+        index = _shared.get(key)
+        if index is None:
+            index = _shared[key] = RetrievalIndex.from_config(config, index_dir, root, extra_sources)
+            return index
+    index.add_sources(extra_sources)
+    return index
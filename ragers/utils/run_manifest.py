@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def hash_content(value: Any) -> str:
+    """sha256 of a string, or of the canonical JSON form of any other value"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+def hash_file(path: Path) -> Optional[str]:
+    """sha256 of a file's bytes, or None if it does not exist"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """Per-project record of completed meeting phases, for incremental re-runs.
+
+    Each phase is stored with the hashes of everything that shaped its prompts
+    (goals, agenda, input files, templates, models, prior history) and copies
+    of the artifacts it wrote. A phase whose input hashes match the record can
+    be skipped: its artifacts are copied back into place and its conversation
+    entries and charter are returned for the caller to restore.
+    """
+
+    def __init__(self, project_path: Path, filename: str = "run_manifest.json"):
+        self.project_path = Path(project_path)
+        self.path = self.project_path / filename
+        self.snapshot_dir = self.project_path / ".runs"
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.phases = json.load(f).get('phases', {})
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable run manifest {self.path}: {str(e)}")
+
+    @staticmethod
+    def fingerprint(inputs: Dict[str, Any]) -> Dict[str, str]:
+        """Hash each named input; the dict of hashes is what gets compared"""
+        return {name: hash_content(value) for name, value in sorted(inputs.items())}
+
+    def is_current(self, phase: str, input_hashes: Dict[str, str]) -> bool:
+        """True if phase ran with these inputs and all its artifact snapshots are still available"""
+        entry = self.phases.get(phase)
+        if not entry or entry.get('inputs') != input_hashes:
+            if entry:
+                changed = [name for name in input_hashes if entry.get('inputs', {}).get(name) != input_hashes[name]]
+                logger.info(f"{phase}: inputs changed ({', '.join(changed) or 'input set'}), phase will run")
+            return False
+        return all((self.snapshot_dir / artifact['snapshot']).exists() for artifact in entry.get('artifacts', []))
+
+    def restore(self, phase: str) -> Dict[str, Any]:
+        """Copy the phase's artifacts back into the project and return its manifest entry"""
+        entry = self.phases[phase]
+        for artifact in entry.get('artifacts', []):
+            target = self.project_path / artifact['path']
+            if hash_file(target) != artifact['sha256']:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self.snapshot_dir / artifact['snapshot'], target)
+        logger.info(f"{phase}: inputs unchanged, reused {len(entry.get('artifacts', []))} artifacts")
+        return entry
+
+    def record(self, phase: str, input_hashes: Dict[str, str], artifacts: List[Path],
+               conversation: List[Dict[str, Any]], charter: Optional[str] = None) -> None:
+        """Store a completed phase with snapshots of the files it wrote"""
+        stored = []
+        for path in artifacts:
+            path = Path(path)
+            digest = hash_file(path)
+            if digest is None:
+                continue
+            snapshot = self.snapshot_dir / digest
+            if not snapshot.exists():
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, snapshot)
+            stored.append({
+                'path': str(path.resolve().relative_to(self.project_path.resolve())),
+                'sha256': digest,
+                'snapshot': digest
+            })
+
+        with self._lock:
+            self.phases[phase] = {
+                'inputs': input_hashes,
+                'artifacts': stored,
+                'conversation': conversation,
+                'charter': charter,
+                'completed': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save()
+
+    def invalidate(self, phase: Optional[str] = None) -> None:
+        """Forget one phase, or every phase when none is given"""
+        with self._lock:
+            if phase is None:
+                self.phases.clear()
+            else:
+                self.phases.pop(phase, None)
+            self._save()
+
+    def _save(self) -> None:
+        """Write the manifest atomically so a crash never leaves it half written"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".run_manifest.")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'phases': self.phases}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,197 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from helpers.deadline import run_in_context
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "are", "from", "into", "each", "all", "any", "per",
+    "will", "should", "must", "can", "not", "its", "their", "has", "have", "was", "were", "been",
+    "what", "which", "when", "how", "who", "include", "including", "use", "used", "using", "e.g",
+}
+
+def keywords(text: str) -> List[str]:
+    """Lowercase content words of three or more letters"""
+    return [w for w in re.findall(r"[a-z][a-z0-9_]{2,}", text.lower()) if w not in STOPWORDS]
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+@dataclass
+class Section:
+    """A heading and the Markdown beneath it, up to the next heading of the same or higher level"""
+    heading: str
+    body: str
+    excerpts: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return f"{self.heading}\n{self.body}" if self.heading else self.body
+
+FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$", re.MULTILINE)
+
+def _scan_fences(markdown: str) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """Closed fenced code blocks as (start, end) offsets, and where an unclosed one starts"""
+    spans, opener, start = [], None, 0
+    for match in FENCE.finditer(markdown):
+        fence, rest = match.groups()
+        if opener is None:
+            opener, start = fence, match.start()
+        elif fence[0] == opener[0] and len(fence) >= len(opener) and not rest.strip():
+            # A closing fence uses the opener's character, at least as many times, and nothing else
+            spans.append((start, match.end()))
+            opener = None
+    return spans, (start if opener is not None else None)
+
+def fenced_spans(markdown: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of fenced code blocks; an unclosed fence runs to the end"""
+    spans, unclosed = _scan_fences(markdown)
+    return spans + [(unclosed, len(markdown))] if unclosed is not None else spans
+
+def split_sections(markdown: str, heading_level: int = 2) -> List[Section]:
+    """Split a Markdown document at headings of heading_level or higher (fewer #'s).
+
+    Text before the first heading becomes a section with an empty heading.
+    Deeper headings stay inside their parent section, and '#' lines inside
+    fenced code blocks are not headings.
+    """
+    pattern = re.compile(rf"^#{{1,{heading_level}}}\s+\S.*$", re.MULTILINE)
+    sections: List[Section] = []
+    fences = fenced_spans(markdown)
+    starts = [m.start() for m in pattern.finditer(markdown)
+              if not any(start <= m.start() < end for start, end in fences)]
+    if not starts or starts[0] > 0:
+        preamble = markdown[:starts[0]] if starts else markdown
+        if preamble.strip():
+            sections.append(Section("", preamble.strip("\n")))
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(markdown)
+        heading, _, body = markdown[start:end].partition("\n")
+        sections.append(Section(heading.rstrip(), body.strip("\n")))
+    return sections
+
+def split_excerpts(responses: str) -> List[str]:
+    """Split meeting responses into paragraph-sized excerpts, keeping fenced code blocks whole"""
+    excerpts = []
+    for response in re.split(r"----Next response:\s*", responses):
+        pending = ""
+        for part in re.split(r"\n\s*\n", response):
+            pending = f"{pending}\n\n{part}" if pending else part
+            if _scan_fences(pending)[1] is None:
+                excerpts.append(pending)
+                pending = ""
+        excerpts.append(pending)
+    return [excerpt.strip() for excerpt in excerpts if excerpt.strip()]
+
+
+class SectionMerger:
+    """Merges meeting responses into a large document section by section.
+
+    The document is split at Markdown headings and each response excerpt is
+    routed to the sections whose headings and text share the most keywords
+    with it. Neighbouring sections are grouped while their text fits in
+    group_tokens and their excerpts in max_excerpt_tokens, so the number of
+    merge calls follows the volume of the responses, not the size of the
+    document. A group given more than max_excerpt_tokens of excerpts is
+    merged in several passes, each on the result of the last, so every
+    excerpt reaches merge_fn(section_text, excerpts). Groups are merged
+    concurrently and reassembled in document order. Groups with no relevant
+    excerpts are kept as they are.
+    """
+
+    def __init__(self, merge_fn: Callable[[str, str], str], max_workers: int = 4, heading_level: int = 2,
+                 group_tokens: int = 1500, max_excerpt_tokens: int = 3000):
+        """
+        Args:
+            merge_fn: Callable(section_text, excerpts) returning the merged section
+            max_workers: Concurrent merge calls
+            heading_level: Deepest heading level that starts a new section
+            group_tokens: Neighbouring sections are grouped up to this much section text
+            max_excerpt_tokens: Excerpts sent in one merge call; more are merged in further passes
+        """
+        self.merge_fn = merge_fn
+        self.max_workers = max_workers
+        self.heading_level = heading_level
+        self.group_tokens = group_tokens
+        self.max_excerpt_tokens = max_excerpt_tokens
+
+    def route(self, sections: List[Section], excerpts: List[str]) -> None:
+        """Attach each excerpt, in response order, to the most relevant sections"""
+        vocab = [(set(keywords(section.heading)), set(keywords(section.body))) for section in sections]
+        for section in sections:
+            section.excerpts = []
+        for excerpt in excerpts:
+            words = set(keywords(excerpt))
+            scores = [3 * len(words & heading) + len(words & body) for heading, body in vocab]
+            best = max(scores, default=0)
+            if best == 0:
+                # Nothing matches: give it to the opening section
+                sections[0].excerpts.append(excerpt)
+                continue
+            for section, score in zip(sections, scores):
+                if score >= best * 0.6:
+                    section.excerpts.append(excerpt)
+
+    def group(self, sections: List[Section]) -> List[Section]:
+        """Combine neighbouring sections into merge units while their text and excerpts fit one call"""
+        groups: List[Section] = []
+        for section in sections:
+            if groups:
+                last = groups[-1]
+                excerpts = last.excerpts + [e for e in section.excerpts if e not in last.excerpts]
+                if (estimate_tokens(last.text) + estimate_tokens(section.text) <= self.group_tokens
+                        and sum(estimate_tokens(e) for e in excerpts) <= self.max_excerpt_tokens):
+                    body = f"{last.body}\n\n{section.text}" if last.body else section.text
+                    groups[-1] = Section(last.heading, body, excerpts)
+                    continue
+            groups.append(Section(section.heading, section.body, list(section.excerpts)))
+        return groups
+
+    def batches(self, excerpts: List[str]) -> List[List[str]]:
+        """Split excerpts into consecutive batches of at most max_excerpt_tokens; a larger excerpt goes alone"""
+        batches: List[List[str]] = []
+        used = 0
+        for excerpt in excerpts:
+            size = estimate_tokens(excerpt)
+            if not batches or used + size > self.max_excerpt_tokens:
+                batches.append([])
+                used = 0
+            batches[-1].append(excerpt)
+            used += size
+        return batches
+
+    def merge(self, document: str, responses: str) -> str:
+        """Merge responses into document and return the reassembled result"""
+        sections = split_sections(document, self.heading_level)
+        if not sections:
+            return self.merge_fn(document, responses)
+        self.route(sections, split_excerpts(responses))
+        groups = self.group(sections)
+
+        def merge_group(group: Section) -> str:
+            text = group.text
+            batches = self.batches(group.excerpts)
+            if len(batches) > 1:
+                logger.info(f"Merging section '{group.heading}' in {len(batches)} passes")
+            for batch in batches:
+                merged = self.merge_fn(text, "\n\n".join(batch))
+                if not merged or not merged.strip():
+                    logger.warning(f"Empty merge for section '{group.heading}', "
+                                   f"{len(batch)} excerpts not merged, keeping the section as it was")
+                    continue
+                merged = merged.strip("\n")
+                # Keep the section heading even if the model dropped it
+                if group.heading and not merged.lstrip().startswith("#"):
+                    merged = f"{group.heading}\n{merged}"
+                text = merged
+            return text
+
+        calls = sum(len(self.batches(g.excerpts)) for g in groups)
+        logger.info(f"Merging {sum(1 for g in groups if g.excerpts)} of {len(groups)} sections "
+                    f"in parallel, {calls} merge calls")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            merged_sections = list(pool.map(run_in_context(merge_group), groups))
+        return "\n\n".join(merged_sections) + "\n"
@@ -0,0 +1,151 @@
+import os
+import json
+import difflib
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Blobs are stored uncompressed
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+Version = Union[int, str]
+
+class SnapshotStore:
+    """Content-addressed, deduplicating store of document versions.
+
+    Each version's bytes are stored once as a blob named by their sha256
+    (zstd-compressed when the zstandard package is installed), and a JSON
+    index maps each document to its (timestamp, blob) history. A snapshot
+    identical to the document's latest version records nothing, and
+    identical content across documents or runs shares one blob.
+    """
+
+    def __init__(self, root: Path, compress: bool = True, level: int = 10):
+        """
+        Args:
+            root: Store directory holding objects/ and index.json
+            compress: Compress new blobs with zstd when available
+            level: zstd compression level
+        """
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.compress = compress and zstandard is not None
+        self.level = level
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+
+    def _blob_path(self, digest: str, compressed: bool) -> Path:
+        return self.objects / digest[:2] / (digest[2:] + (".zst" if compressed else ""))
+
+    def _write_blob(self, digest: str, data: bytes) -> None:
+        for compressed in (True, False):
+            if self._blob_path(digest, compressed).exists():
+                return  # Already stored
+        path = self._blob_path(digest, self.compress)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            data = zstandard.ZstdCompressor(level=self.level).compress(data)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read_blob(self, digest: str) -> bytes:
+        path = self._blob_path(digest, True)
+        if path.exists():
+            if zstandard is None:
+                raise RuntimeError(f"Snapshot {digest[:12]} is zstd-compressed; install zstandard to read it")
+            return zstandard.ZstdDecompressor().decompress(path.read_bytes())
+        return self._blob_path(digest, False).read_bytes()
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def snapshot(self, doc: str, content: Union[str, bytes], label: Optional[str] = None) -> Dict[str, Any]:
+        """Record a version of doc and return its index entry.
+
+        Args:
+            doc: Document key, e.g. its path relative to the project
+            content: Document content
+            label: Optional note stored with the version
+
+        Returns:
+            The new entry, or the latest one when content is unchanged
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            history = self._index.setdefault(doc, [])
+            if history and history[-1]['blob'] == digest:
+                return history[-1]
+            self._write_blob(digest, data)
+            entry = {
+                'timestamp': datetime.now().isoformat(timespec='microseconds'),
+                'blob': digest,
+                'size': len(data)
+            }
+            if label:
+                entry['label'] = label
+            history.append(entry)
+            self._save_index()
+        return entry
+
+    def documents(self) -> List[str]:
+        return sorted(self._index)
+
+    def versions(self, doc: str) -> List[Dict[str, Any]]:
+        """Index entries for doc, oldest first"""
+        return list(self._index.get(doc, []))
+
+    def _entry(self, doc: str, version: Version) -> Dict[str, Any]:
+        history = self._index.get(doc)
+        if not history:
+            raise KeyError(f"No snapshots of {doc}")
+        if isinstance(version, int):
+            return history[version]
+        for entry in history:
+            if entry['timestamp'] == version or entry['blob'].startswith(version):
+                return entry
+        raise KeyError(f"No snapshot {version} of {doc}")
+
+    def read(self, doc: str, version: Version = -1) -> str:
+        """Content of a version, by index (negative from the latest), timestamp or blob prefix"""
+        return self._read_blob(self._entry(doc, version)['blob']).decode('utf-8')
+
+    def diff(self, doc: str, old: Version = -2, new: Version = -1, context: int = 3) -> str:
+        """Unified diff between two versions of doc"""
+        old_entry, new_entry = self._entry(doc, old), self._entry(doc, new)
+        if old_entry['blob'] == new_entry['blob']:
+            return ""
+        return "".join(difflib.unified_diff(
+            self._read_blob(old_entry['blob']).decode('utf-8').splitlines(keepends=True),
+            self._read_blob(new_entry['blob']).decode('utf-8').splitlines(keepends=True),
+            fromfile=f"{doc}@{old_entry['timestamp']}",
+            tofile=f"{doc}@{new_entry['timestamp']}",
+            n=context
+        ))
+
+    def stats(self) -> Dict[str, int]:
+        """Versions recorded, distinct blobs and their bytes on disk"""
+        blobs = [path for path in self.objects.rglob('*') if path.is_file()] if self.objects.exists() else []
+        return {
+            'versions': sum(len(history) for history in self._index.values()),
+            'blobs': len(blobs),
+            'bytes': sum(path.stat().st_size for path in blobs)
+        }
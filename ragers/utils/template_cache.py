@@ -0,0 +1,145 @@
+import os
+import copy
+import string
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # LibYAML bindings, several times faster
+except ImportError:
+    from yaml import SafeLoader
+
+logger = logging.getLogger(__name__)
+
+_formatter = string.Formatter()
+
+class CompiledTemplate:
+    """A str.format template split into literal and field parts once, rendered many times"""
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: List[Tuple[str, Optional[str], str, Optional[str]]] = list(_formatter.parse(template))
+        self.fields = {name for _, name, _, _ in self.parts if name}
+
+    def render(self, context: Dict[str, Any], missing: str = '[MISSING]') -> str:
+        """Fill the fields from context; unknown fields render as missing"""
+        out = []
+        for literal, name, spec, conversion in self.parts:
+            out.append(literal)
+            if name is None:
+                continue
+            if name in context:
+                value = context[name]
+            else:
+                try:
+                    value = _formatter.get_field(name, (), context)[0]
+                except (KeyError, IndexError, AttributeError):
+                    value = missing
+            value = _formatter.convert_field(value, conversion)
+            out.append(_formatter.format_field(value, spec or ''))
+        return ''.join(out)
+
+
+class FileCache:
+    """Process-wide cache of values derived from files, keyed on path, mtime and size.
+
+    Editing a file changes its key, so the next lookup rebuilds the value; no
+    explicit invalidation is needed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, path, builder: Callable[[Path], Any]) -> Any:
+        """Return builder(path), reusing the cached value while the file is unchanged"""
+        path = Path(path)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (kind, str(path.resolve()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+        value = builder(path)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self.misses += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = FileCache()
+
+def get_file_cache() -> FileCache:
+    """Return the process-wide file cache"""
+    return _cache
+
+def _parse_yaml(path: Path) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def _read_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def load_yaml(path, copy_result: bool = True) -> Any:
+    """Parse a YAML file through the cache.
+
+    Args:
+        path: YAML file
+        copy_result: Return a deep copy callers may modify; pass False for read-only use
+
+    Returns:
+        The parsed document
+    """
+    data = _cache.get('yaml', path, _parse_yaml)
+    return copy.deepcopy(data) if copy_result else data
+
+def read_text(path) -> str:
+    """Read a text file through the cache"""
+    return _cache.get('text', path, _read_text)
+
+def compile_template(template: str) -> CompiledTemplate:
+    """Return a CompiledTemplate for template, shared across calls"""
+    with _compiled_lock:
+        compiled = _compiled.get(template)
+        if compiled is None:
+            compiled = _compiled[template] = CompiledTemplate(template)
+        return compiled
+
+_compiled: Dict[str, CompiledTemplate] = {}
+_compiled_lock = threading.Lock()
+
+def load_prompts(path) -> Dict[str, Any]:
+    """Parse a *_prompts.yaml and pre-build its static parts.
+
+    Returns a read-only dict with the parsed 'config', per-phase 'templates'
+    (CompiledTemplate), 'meeting_rules' and the joined 'opening'/'closing'.
+    """
+    def build(path: Path) -> Dict[str, Any]:
+        config = _parse_yaml(path)
+        prompts = config.get('prompts', {})
+        rules = prompts.get('meeting_rules', {}) or {}
+        structure = rules.get('structure', {}) if isinstance(rules, dict) else {}
+        return {
+            'config': config,
+            'templates': {
+                phase: compile_template(entry['template'])
+                for phase, entry in prompts.items()
+                if isinstance(entry, dict) and isinstance(entry.get('template'), str)
+            },
+            'meeting_rules': rules,
+            'opening': "\n".join(structure.get('opening', [])),
+            'closing': "\n".join(structure.get('closing', []))
+        }
+    return _cache.get('prompts', path, build)